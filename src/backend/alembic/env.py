@@ -0,0 +1,42 @@
+import asyncio
+
+from alembic import context
+from sqlalchemy.engine import Connection
+
+from backend.core.infra.database.connection import engine
+from backend.core.infra.database.metadata import metadata
+
+# Tables of domains are registered in metadata on import:
+from backend.core.infra.database import scheduler  # noqa: F401
+from backend.domains.licensing_service.infra.adapters import orm  # noqa: F401
+
+target_metadata = metadata
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=engine.url.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online() -> None:
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
@@ -0,0 +1,56 @@
+"""add counter of used requests to licenses
+
+Revision ID: 56f3aec39a48
+Revises: 9306bd4206a1
+Create Date: 2026-10-18 17:00:00.000000
+
+Counters of existing licenses are filled from statistic rows: requests
+made since activation of the license, till its expiration if it expired.
+Rows of dropped partitions are not needed here: partitions are dropped
+only by versions of the application, which already have the counters.
+Every license has a counter afterwards, so the column is NOT NULL.
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "56f3aec39a48"
+down_revision: Union[str, None] = "9306bd4206a1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("lisenses"):
+        return
+    columns = {column["name"] for column in inspector.get_columns("lisenses")}
+    if "used_requests" not in columns:
+        op.add_column(
+            "lisenses", sa.Column("used_requests", sa.Integer, nullable=True)
+        )
+    op.execute(
+        "UPDATE lisenses SET used_requests = ("
+        "SELECT coalesce(sum(statistic_rows.count_requests), 0) "
+        "FROM statistic_rows "
+        "WHERE statistic_rows.subdivision_id = lisenses.subdivision_id "
+        "AND statistic_rows.created > lisenses.activated "
+        "AND (lisenses.expirated IS NULL "
+        "OR statistic_rows.created <= lisenses.expirated)"
+        ") WHERE used_requests IS NULL AND activated IS NOT NULL"
+    )
+    op.execute("UPDATE lisenses SET used_requests = 0 WHERE used_requests IS NULL")
+    op.alter_column(
+        "lisenses",
+        "used_requests",
+        existing_type=sa.Integer,
+        nullable=False,
+        server_default="0",
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("lisenses", "used_requests")
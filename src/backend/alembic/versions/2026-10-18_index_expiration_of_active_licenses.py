@@ -0,0 +1,37 @@
+"""index expiration of active licenses by time
+
+Revision ID: 8e4b7c0d2f13
+Revises: 5c1d8e2f9a47
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8e4b7c0d2f13"
+down_revision: Union[str, None] = "5c1d8e2f9a47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("lisenses"):
+        return
+    op.create_index(
+        "ix_lisenses_expiration_active_by_time",
+        "lisenses",
+        ["expiration"],
+        postgresql_where=sa.text("status = 'active' AND type = 'by_time'"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_lisenses_expiration_active_by_time",
+        table_name="lisenses",
+        if_exists=True,
+    )
@@ -0,0 +1,33 @@
+"""index sent outbox messages
+
+Revision ID: b7d2e9c41f05
+Revises: 56f3aec39a48
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d2e9c41f05"
+down_revision: Union[str, None] = "56f3aec39a48"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("outbox"):
+        return
+    op.create_index(
+        "ix_outbox_sent",
+        "outbox",
+        ["sent"],
+        postgresql_where=sa.text("sent IS NOT NULL"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_outbox_sent", table_name="outbox", if_exists=True)
@@ -0,0 +1,165 @@
+"""partition statistic_rows by month, add rollups
+
+Revision ID: 5c1d8e2f9a47
+Revises:
+Create Date: 2026-10-18 12:00:00.000000
+
+Databases, which were created by the application before statistic rows
+were partitioned, are converted here. New databases get this schema
+from the application on start, for them only the revision is stored.
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1d8e2f9a47"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partitions of months from the current one till this number after it:
+PARTITIONS_AHEAD = 2
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def _statistic_rows_columns() -> list:
+    return [
+        sa.Column("id", sa.UUID, nullable=False),
+        sa.Column("created", sa.DateTime, nullable=False),
+        sa.Column("count_requests", sa.Integer, nullable=False),
+        sa.Column(
+            "subdivision_id",
+            sa.UUID,
+            sa.ForeignKey("subdivisions.id", onupdate="CASCADE", ondelete="CASCADE"),
+            nullable=False,
+        ),
+    ]
+
+
+def _create_rollups_table(name: str, period: str) -> None:
+    op.create_table(
+        name,
+        sa.Column(
+            "subdivision_id",
+            sa.UUID,
+            sa.ForeignKey("subdivisions.id", onupdate="CASCADE", ondelete="CASCADE"),
+            primary_key=True,
+            nullable=False,
+        ),
+        sa.Column(period, sa.Date, primary_key=True, nullable=False),
+        sa.Column("count_requests", sa.Integer, nullable=False),
+    )
+
+
+def _create_statistic_rows_index(table: str) -> None:
+    op.create_index(
+        f"ix_{table}_subdivision_id_created",
+        table,
+        ["subdivision_id", "created"],
+        postgresql_include=["count_requests"],
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table("subdivisions"):
+        return
+
+    for name, period in (
+        ("statistic_daily_rollups", "day"),
+        ("statistic_monthly_rollups", "month"),
+    ):
+        if not inspector.has_table(name):
+            _create_rollups_table(name, period)
+
+    relkind = bind.execute(
+        sa.text(
+            "SELECT relkind FROM pg_class WHERE oid = to_regclass('statistic_rows')"
+        )
+    ).scalar()
+    if relkind == "p":
+        return
+    if relkind is not None:
+        op.rename_table("statistic_rows", "statistic_rows_unpartitioned")
+        op.execute(
+            # The index was created only by create_all of the application:
+            "ALTER INDEX IF EXISTS ix_statistic_rows_subdivision_id_created "
+            "RENAME TO ix_statistic_rows_unpartitioned_subdivision_id_created"
+        )
+        op.execute(
+            "ALTER TABLE statistic_rows_unpartitioned "
+            "RENAME CONSTRAINT statistic_rows_pkey TO statistic_rows_unpartitioned_pkey"
+        )
+
+    op.create_table(
+        "statistic_rows",
+        *_statistic_rows_columns(),
+        sa.PrimaryKeyConstraint("id", "created", name="statistic_rows_pkey"),
+        postgresql_partition_by="RANGE (created)",
+    )
+    _create_statistic_rows_index("statistic_rows")
+    op.execute(
+        "CREATE TABLE statistic_rows_default PARTITION OF statistic_rows DEFAULT"
+    )
+
+    current = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    months = {_add_months(current, index) for index in range(PARTITIONS_AHEAD + 1)}
+    if relkind is not None:
+        months |= set(
+            bind.execute(
+                sa.text(
+                    "SELECT DISTINCT date_trunc('month', created) "
+                    "FROM statistic_rows_unpartitioned"
+                )
+            ).scalars()
+        )
+    for month in sorted(months):
+        op.execute(
+            f"CREATE TABLE statistic_rows_p{month:%Y_%m} PARTITION OF statistic_rows "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') "
+            f"TO ('{_add_months(month, 1):%Y-%m-%d}')"
+        )
+
+    if relkind is not None:
+        op.execute(
+            "INSERT INTO statistic_rows (id, created, count_requests, subdivision_id) "
+            "SELECT id, created, count_requests, subdivision_id "
+            "FROM statistic_rows_unpartitioned"
+        )
+        op.drop_table("statistic_rows_unpartitioned")
+
+
+def downgrade() -> None:
+    """
+    Requests of dropped partitions, which are kept only in rollups,
+    are lost.
+    """
+    op.create_table(
+        "statistic_rows_unpartitioned",
+        *_statistic_rows_columns(),
+        sa.PrimaryKeyConstraint("id", name="statistic_rows_unpartitioned_pkey"),
+        sa.UniqueConstraint("id", name="statistic_rows_id_key"),
+    )
+    op.execute(
+        "INSERT INTO statistic_rows_unpartitioned "
+        "(id, created, count_requests, subdivision_id) "
+        "SELECT id, created, count_requests, subdivision_id FROM statistic_rows"
+    )
+    op.drop_table("statistic_rows")
+    op.rename_table("statistic_rows_unpartitioned", "statistic_rows")
+    op.execute(
+        "ALTER TABLE statistic_rows "
+        "RENAME CONSTRAINT statistic_rows_unpartitioned_pkey TO statistic_rows_pkey"
+    )
+    _create_statistic_rows_index("statistic_rows")
+    op.drop_table("statistic_monthly_rollups")
+    op.drop_table("statistic_daily_rollups")
@@ -0,0 +1,30 @@
+"""schedule retries of outbox messages
+
+Revision ID: 9306bd4206a1
+Revises: 8e4b7c0d2f13
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9306bd4206a1"
+down_revision: Union[str, None] = "8e4b7c0d2f13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("outbox"):
+        return
+    columns = {column["name"] for column in inspector.get_columns("outbox")}
+    if "next_attempt" not in columns:
+        op.add_column("outbox", sa.Column("next_attempt", sa.DateTime, nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("outbox", "next_attempt")
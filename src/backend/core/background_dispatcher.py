@@ -0,0 +1,70 @@
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional
+
+from backend.core.infra.messages import Message
+
+
+class BackgroundDispatcher:
+    """
+    Bounded pool of asyncio workers, which handle messages
+    after the request, that raised them, has returned.
+    When the queue is full, submit() waits for a free place,
+    so a burst of events slows down requests instead of eating memory.
+    """
+
+    def __init__(
+        self, workers: int = 4, queue_size: int = 1000, drain_timeout: float = 30.0
+    ) -> None:
+        self._workers_count = workers
+        self._queue_size = queue_size
+        self._drain_timeout = drain_timeout
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._handle: Optional[Callable[[Message], Awaitable[Any]]] = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    async def start(self, handle: Callable[[Message], Awaitable[Any]]) -> None:
+        self._handle = handle
+        self._queue = asyncio.Queue(maxsize=self._queue_size)
+        self._workers = [
+            asyncio.create_task(self._work()) for _ in range(self._workers_count)
+        ]
+
+    async def submit(self, message: Message) -> None:
+        await self._queue.put(message)
+
+    async def stop(self) -> None:
+        """
+        Waits till queued messages are handled, but not longer
+        than drain timeout, then stops workers.
+        """
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), self._drain_timeout)
+        except asyncio.TimeoutError:
+            print(
+                f"Error: background dispatcher stopped with "
+                f"{self.pending} messages not handled"
+            )
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def _work(self) -> None:
+        while True:
+            message = await self._queue.get()
+            try:
+                await self._handle(message)
+            except Exception as err:
+                print(f"Error: background handling of {message}: {err!r}")
+            finally:
+                self._queue.task_done()
@@ -1,6 +1,6 @@
 import inspect
 from types import MappingProxyType
-from typing import Union, Type, Dict, Any, List, Optional
+from typing import Union, Type, Dict, Any, List, Optional, Tuple
 
 from backend.core.infra import (
     AbstractCommand,
@@ -8,6 +8,7 @@ from backend.core.infra import (
     AbstractEventHandler,
     AbstractCommandHandler
 )
+from .background_dispatcher import BackgroundDispatcher
 from .messagebus_handler import GlobalMessageBusHandler
 from .infra.eventbus import AbstractEventBus
 
@@ -28,7 +29,8 @@ class Bootstrap:
         commands_handlers_for_injection: Dict[
             Type[AbstractCommand], Type[AbstractCommandHandler]
         ] = None,
-        dependencies: Optional[Dict[str, Any]] = None
+        dependencies: Optional[Dict[str, Any]] = None,
+        background_dispatcher: Optional[BackgroundDispatcher] = None
     ) -> None:
 
         # self._uow: AbstractUnitOfWork = uow
@@ -49,13 +51,37 @@ class Bootstrap:
         if dependencies:
             self._dependencies.update(dependencies)
 
+        self._background_dispatcher = background_dispatcher
+        self._messagebus: Optional[GlobalMessageBusHandler] = None
+
     def get_messagebus(self) -> GlobalMessageBusHandler:
         """
         Makes necessary injections to commands handlers
         and events handlers for creating appropriate messagebus,
         after which returns messagebus instance.
+
+        Messagebus and handlers are created only once, on the first call,
+        and shared by all callers, so bootstrap should be created once
+        for the application with event buses, which are safe to share
+        (ContextEventBus).
         """
 
+        if self._messagebus is None:
+            event_handlers, command_handlers = self._inject_handlers()
+            # uow=self._uow,
+            self._messagebus = GlobalMessageBusHandler(
+                domain_event_bus=self.domain_event_bus,
+                infra_event_bus=self.infra_event_bus,
+                event_handlers=event_handlers,
+                command_handlers=command_handlers,
+                background=self._background_dispatcher,
+            )
+        return self._messagebus
+
+    def _inject_handlers(self) -> Tuple[
+        Dict[Type[AbstractEvent], List[AbstractEventHandler]],
+        Dict[Type[AbstractCommand], AbstractCommandHandler],
+    ]:
         injected_event_handlers: Dict[
             Type[AbstractEvent], List[AbstractEventHandler]
         ] = {
@@ -72,14 +98,7 @@ class Bootstrap:
             command_type: self._inject_dependencies(handler=handler)
             for command_type, handler in self._commands_handlers_for_injection.items()
         }
-
-        # uow=self._uow,
-        return GlobalMessageBusHandler(
-            domain_event_bus=self.domain_event_bus,
-            infra_event_bus=self.infra_event_bus,
-            event_handlers=injected_event_handlers,
-            command_handlers=injected_command_handlers,
-        )
+        return injected_event_handlers, injected_command_handlers
 
     # async 
     def _inject_dependencies(
@@ -0,0 +1,36 @@
+from typing import Literal
+
+from pydantic_settings import BaseSettings
+
+
+class MessageBusConfig(BaseSettings):
+    # "inline" - handle() returns after all raised events are handled,
+    # "deferred" - events of infra event bus are handled in background,
+    # except handlers, which are not deferrable (read model projectors
+    # and invalidators of cached license states), so reads stay consistent:
+    MESSAGEBUS_DISPATCH_MODE: Literal["inline", "deferred"] = "inline"
+    MESSAGEBUS_WORKERS: int = 4
+    MESSAGEBUS_QUEUE_SIZE: int = 1000
+    MESSAGEBUS_DRAIN_TIMEOUT: float = 30.0
+
+
+messagebus_config: MessageBusConfig = MessageBusConfig()
+
+
+class CacheConfig(BaseSettings):
+    # Entries are invalidated by events, ttl bounds staleness of the rest:
+    CACHE_TTL: float = 5.0
+    CACHE_MAXSIZE: int = 10000
+
+
+cache_config: CacheConfig = CacheConfig()
+
+
+class SchedulerConfig(BaseSettings):
+    # Jobs are run only if enabled, e.g. one deployment can run them:
+    SCHEDULER_ENABLED: bool = True
+    # Seconds, a job locked by another process is checked again after:
+    SCHEDULER_POLL_INTERVAL: float = 30.0
+
+
+scheduler_config: SchedulerConfig = SchedulerConfig()
@@ -6,4 +6,7 @@ class ErrorDetails:
     SERVER_ERROR: str = 'Server error'
     PERMISSION_DENIED: str = 'Permission denied'
     BAD_REQUEST: str = 'Bad Request'
+    INVALID_CURSOR: str = 'Invalid pagination cursor'
+    INVALID_SORT: str = 'Sorting by this field is not supported'
+    INVALID_INCLUDE: str = 'Including this relation is not supported'
     MESSAGEBUS_MESSAGE_ERROR: str = 'Message bus message should be eiter of Event type, or Command type'
\ No newline at end of file
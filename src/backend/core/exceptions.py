@@ -32,6 +32,18 @@ class BadRequestError(DetailedHTTPException):
     DETAIL = ErrorDetails.BAD_REQUEST
 
 
+class InvalidCursorError(BadRequestError):
+    DETAIL = ErrorDetails.INVALID_CURSOR
+
+
+class InvalidSortError(BadRequestError):
+    DETAIL = ErrorDetails.INVALID_SORT
+
+
+class InvalidIncludeError(BadRequestError):
+    DETAIL = ErrorDetails.INVALID_INCLUDE
+
+
 class PreconditionFailedError(DetailedHTTPException):
     STATUS_CODE = status.HTTP_412_PRECONDITION_FAILED
 
@@ -0,0 +1,35 @@
+from typing import Dict
+
+
+class HandlerMetrics:
+    """
+    Latency and outcomes of messagebus handlers in this process.
+    """
+
+    def __init__(self) -> None:
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def observe(self, handler_name: str, elapsed: float, status: str) -> None:
+        """
+        status: "ok", "error" or "timeout".
+        """
+        stats = self._stats.get(handler_name)
+        if stats is None:
+            stats = self._stats[handler_name] = dict(
+                count=0, ok=0, error=0, timeout=0, total_seconds=0.0, max_seconds=0.0
+            )
+        stats["count"] += 1
+        stats[status] += 1
+        stats["total_seconds"] += elapsed
+        stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {
+            handler_name: dict(
+                stats, avg_seconds=stats["total_seconds"] / stats["count"]
+            )
+            for handler_name, stats in self._stats.items()
+        }
+
+    def reset(self) -> None:
+        self._stats.clear()
@@ -0,0 +1,78 @@
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class TTLCache(Generic[T]):
+    """
+    In-process LRU cache with time to live of entries.
+    Not thread safe, it's meant for one event loop: get and set
+    do not await, so they are atomic for coroutines.
+
+    Entries are dropped by invalidate() on changes, ttl only bounds
+    staleness of changes, which are not invalidated, e.g. made by
+    other processes.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize: int = maxsize
+        self.ttl: float = ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, T]] = OrderedDict()
+        # Loads, which started before an invalidation, are not stored:
+        self._invalidations: int = 0
+        self._stats: Dict[str, int] = dict(hits=0, misses=0, invalidations=0)
+
+    def get(self, key: Hashable) -> Optional[T]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        expires, value = entry
+        if expires <= self._clock():
+            del self._entries[key]
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        return value
+
+    def set(self, key: Hashable, value: T) -> None:
+        self._entries[key] = (self._clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def get_or_load(
+        self, key: Hashable, load: Callable[[], Awaitable[Optional[T]]]
+    ) -> Optional[T]:
+        """
+        None returned by load is not cached.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        invalidations = self._invalidations
+        value = await load()
+        if value is not None and invalidations == self._invalidations:
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+        self._invalidations += 1
+        self._stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self._stats, size=len(self._entries), maxsize=self.maxsize)
@@ -0,0 +1,36 @@
+from typing import Any, Dict
+
+from sqlalchemy import Select, literal, tuple_
+
+from backend.core.exceptions import InvalidSortError
+from backend.core.infra.pagination import PageRequest, decode_cursor
+
+
+def paginate(
+    query: Select, page_request: PageRequest, sort_columns: Dict[str, Any]
+) -> Select:
+    """
+    Applies keyset pagination to the query: items after the cursor,
+    ordered by sort column and id. One extra row is selected
+    to know, if there is a next page (see make_page).
+
+    sort_columns: columns of the table by sort field, must contain "id".
+    Sort columns should not be nullable, NULLs break the comparison.
+    """
+    if page_request.sort not in sort_columns:
+        raise InvalidSortError
+    columns = [sort_columns[sort_field] for sort_field in page_request.sort_fields]
+    if page_request.cursor:
+        values = decode_cursor(
+            page_request, types=[column.type.python_type for column in columns]
+        )
+        position = tuple_(*columns)
+        after = tuple_(
+            *(literal(value, column.type) for value, column in zip(values, columns))
+        )
+        query = query.where(
+            position < after if page_request.descending else position > after
+        )
+    return query.order_by(
+        *(column.desc() if page_request.descending else column for column in columns)
+    ).limit(page_request.limit + 1)
@@ -0,0 +1,77 @@
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+
+def month_start(moment: datetime) -> datetime:
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month_start(month).replace(year=index // 12, month=index % 12 + 1)
+
+
+def monthly_partition_name(table: str, month: datetime) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def parse_monthly_partition_name(table: str, name: str) -> Optional[datetime]:
+    """
+    Returns month of the partition or None, if it's not a monthly
+    partition of the table, e.g. the default one.
+    """
+    prefix = f"{table}_p"
+    if not name.startswith(prefix):
+        return None
+    try:
+        return datetime.strptime(name[len(prefix) :], "%Y_%m")
+    except ValueError:
+        return None
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def create_monthly_partition_statements(table: str, month: datetime) -> List[str]:
+    """
+    Statements, which create partition of the table, range partitioned
+    by "created", for the month.
+    Rows of the month are moved into it from the default partition,
+    otherwise attaching would fail on them. The partition is attached
+    after, so indexes and constraints of the table are created on it.
+    """
+    partition = monthly_partition_name(table, month)
+    default = default_partition_name(table)
+    start, end = f"'{month:%Y-%m-%d}'", f"'{add_months(month, 1):%Y-%m-%d}'"
+    return [
+        f"CREATE TABLE {partition} (LIKE {table} INCLUDING DEFAULTS)",
+        f"WITH moved AS (DELETE FROM {default} "
+        f"WHERE created >= {start} AND created < {end} RETURNING *) "
+        f"INSERT INTO {partition} SELECT * FROM moved",
+        f"ALTER TABLE {table} ATTACH PARTITION {partition} "
+        f"FOR VALUES FROM ({start}) TO ({end})",
+    ]
+
+
+def months_to_create(
+    existing: Iterable[datetime], now: datetime, ahead: int
+) -> List[datetime]:
+    """
+    Months from the current one till `ahead` months after it,
+    which have no partition.
+    """
+    existing = set(existing)
+    current = month_start(now)
+    months = [add_months(current, index) for index in range(ahead + 1)]
+    return [month for month in months if month not in existing]
+
+
+def months_to_drop(
+    existing: Iterable[datetime], now: datetime, retention: int
+) -> List[datetime]:
+    """
+    Months ended before the last `retention` full months.
+    """
+    kept_since = add_months(month_start(now), -retention)
+    return sorted(month for month in existing if month < kept_since)
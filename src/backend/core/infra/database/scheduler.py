@@ -0,0 +1,183 @@
+import asyncio
+import random
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import uuid4
+
+from sqlalchemy import (
+    UUID,
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    String,
+    Table,
+    Text,
+    func,
+    insert,
+    select,
+)
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from backend.core.config import scheduler_config
+from backend.core.infra.database.connection import engine as default_engine
+from backend.core.infra.database.metadata import metadata
+from backend.core.infra.scheduling import (
+    Job,
+    advisory_lock_key,
+    due_run,
+    is_missed,
+    next_run,
+)
+
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_SKIPPED = "skipped"
+
+# Runs of periodic jobs: when they were due, took how long, processed what:
+job_runs_table = Table(
+    "job_runs",
+    metadata,
+    Column("id", UUID, primary_key=True, default=uuid4),
+    Column("job", String, nullable=False),
+    # Run of the schedule, the job was started for:
+    Column("scheduled", DateTime, nullable=False),
+    Column("started", DateTime, nullable=False),
+    Column("duration", Float, nullable=False),
+    # Rows processed by the job, if it counts them:
+    Column("rows", Integer, nullable=True),
+    Column("status", String, nullable=False),
+    Column("error", Text, nullable=True),
+    Index("ix_job_runs_job_scheduled", "job", "scheduled"),
+)
+
+
+class Scheduler:
+    """
+    Runs periodic jobs in every process, but each run only once
+    across all of them.
+
+    A job is run while its Postgres advisory lock is held, the others
+    skip it. Under the lock the last run is read from job_runs,
+    so a run, made by another process meanwhile, is not repeated.
+    A run is recorded after the job has finished: if the process dies
+    during it, the job is run again, so jobs must be idempotent.
+    """
+
+    def __init__(
+        self,
+        jobs: Sequence[Job],
+        engine: AsyncEngine = default_engine,
+        poll_interval: float = scheduler_config.SCHEDULER_POLL_INTERVAL,
+    ) -> None:
+        names = [job.name for job in jobs]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Names of scheduled jobs are not unique: {names}")
+        self._jobs = list(jobs)
+        self._engine = engine
+        self._poll_interval = poll_interval
+        self._started = datetime.now()
+        self._stopping = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        self._started = datetime.now()
+        self._stopping.clear()
+        self._tasks = [asyncio.create_task(self._run(job)) for job in self._jobs]
+
+    async def stop(self) -> None:
+        """
+        Waits till running jobs finish.
+        """
+        self._stopping.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def run_pending(self, now: Optional[datetime] = None) -> Dict[str, str]:
+        """
+        Runs jobs, which are due, one after another.
+        Returns statuses of runs by names of jobs.
+        """
+        statuses = {}
+        for job in self._jobs:
+            status, _ = await self.run_if_due(job, now or datetime.now())
+            if status:
+                statuses[job.name] = status
+        return statuses
+
+    async def run_if_due(
+        self, job: Job, now: datetime
+    ) -> Tuple[Optional[str], Optional[datetime]]:
+        """
+        Runs the job, if a run is due and no other process holds its lock.
+        Returns status of the run, None if not run, and the next run,
+        None if the job is locked by another process.
+        """
+        key = advisory_lock_key(job.name)
+        async with self._engine.connect() as connection:
+            # Statements are committed at once, so no transaction stays open
+            # while the job runs, the lock is held by the session:
+            connection = await connection.execution_options(
+                isolation_level="AUTOCOMMIT"
+            )
+            if not await connection.scalar(select(func.pg_try_advisory_lock(key))):
+                return None, None
+            try:
+                return await self._run_locked(connection, job, now)
+            finally:
+                await connection.scalar(select(func.pg_advisory_unlock(key)))
+
+    async def _run_locked(
+        self, connection: AsyncConnection, job: Job, now: datetime
+    ) -> Tuple[Optional[str], Optional[datetime]]:
+        last_run = await connection.scalar(
+            select(func.max(job_runs_table.c.scheduled)).where(
+                job_runs_table.c.job == job.name
+            )
+        )
+        run = due_run(job.schedule, last_run, self._started, now)
+        if run is None:
+            return None, next_run(job.schedule, last_run, self._started)
+
+        started, start_time = datetime.now(), time.monotonic()
+        rows, error = None, None
+        if is_missed(job.schedule, run, last_run) and not job.catch_up:
+            status = JOB_SKIPPED
+        else:
+            try:
+                rows = await job.func()
+                status = JOB_SUCCEEDED
+            except Exception as err:
+                status, error = JOB_FAILED, repr(err)
+                print(f"Error: scheduled job {job.name}: {error}")
+        await connection.execute(
+            insert(job_runs_table).values(
+                job=job.name,
+                scheduled=run,
+                started=started,
+                duration=time.monotonic() - start_time,
+                rows=rows,
+                status=status,
+                error=error,
+            )
+        )
+        return status, job.schedule.next_after(run)
+
+    async def _run(self, job: Job) -> None:
+        while not self._stopping.is_set():
+            try:
+                _, following = await self.run_if_due(job, datetime.now())
+            except Exception as err:
+                print(f"Error: scheduler of job {job.name}: {err!r}")
+                following = None
+            if following is None:
+                delay = self._poll_interval
+            else:
+                delay = (following - datetime.now()).total_seconds()
+                delay = max(delay, 0.0) + random.uniform(0, job.jitter)
+            try:
+                await asyncio.wait_for(self._stopping.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
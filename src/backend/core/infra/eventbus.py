@@ -1,5 +1,7 @@
 from abc import ABC
-from typing import List, Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Generator, Optional
 
 from .events import AbstractEvent
 
@@ -20,3 +22,36 @@ class AbstractEventBus(ABC):
 
         while self._events:
             yield self._events.pop(0)
+
+
+class ContextEventBus(AbstractEventBus):
+    """
+    Event bus, which keeps events in the current context (asyncio task),
+    instead of instance. So one instance and handlers, which got it
+    as dependency, can be shared by concurrent requests.
+    """
+
+    def __init__(self):
+        self._context_events: ContextVar[Optional[List[AbstractEvent]]] = ContextVar(
+            f"events_{id(self)}", default=None
+        )
+
+    @property
+    def _events(self) -> List[AbstractEvent]:
+        events = self._context_events.get()
+        if events is None:
+            events = []
+            self._context_events.set(events)
+        return events
+
+    @contextmanager
+    def scope(self) -> Iterator[None]:
+        """
+        Gives the current context its own list of events till exit,
+        events of the outer scope are not seen inside.
+        """
+        token = self._context_events.set([])
+        try:
+            yield
+        finally:
+            self._context_events.reset(token)
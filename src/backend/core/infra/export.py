@@ -0,0 +1,66 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, Literal, Mapping, Sequence
+
+# Batches of rows, which are read from a server-side cursor at once
+# and are sent as one chunk of the response:
+EXPORT_BATCH_SIZE = 1000
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_MEDIA_TYPES: Dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+async def ndjson_chunks(
+    batches: AsyncIterator[Sequence[Mapping[str, Any]]],
+) -> AsyncIterator[str]:
+    """
+    One JSON object per line, one chunk per batch of rows.
+    """
+    async for rows in batches:
+        yield "".join(json.dumps(dict(row), default=_to_json) + "\n" for row in rows)
+
+
+async def csv_chunks(
+    batches: AsyncIterator[Sequence[Mapping[str, Any]]],
+    columns: Sequence[str],
+) -> AsyncIterator[str]:
+    """
+    Header is sent even if there are no rows.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    yield buffer.getvalue()
+    async for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            {
+                key: value.isoformat() if isinstance(value, datetime) else value
+                for key, value in row.items()
+            }
+            for row in rows
+        )
+        yield buffer.getvalue()
+
+
+def export_chunks(
+    batches: AsyncIterator[Sequence[Mapping[str, Any]]],
+    export_format: ExportFormat,
+    columns: Sequence[str],
+) -> AsyncIterator[str]:
+    if export_format == "csv":
+        return csv_chunks(batches, columns=columns)
+    return ndjson_chunks(batches)
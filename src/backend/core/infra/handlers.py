@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Optional, Tuple, Type
 
 from backend.core.infra.units_of_work import AbstractUnitOfWork
 from backend.core.infra.commands import AbstractCommand
@@ -25,8 +25,22 @@ class AbstractHandler(ABC):
 class AbstractEventHandler(AbstractHandler, ABC):
     """
     Abstract event handler class, from which every event handler should be inherited from.
+
+    By default handlers of an event run one by one in order of registration
+    and errors are raised to the caller. Handler can change it:
+    - independent: runs concurrently with neighbouring independent handlers
+      of the same event, its errors are logged and do not stop others;
+    - depends_on: handlers of the same event, which must finish before it;
+    - timeout: seconds to wait for the handler, None - no limit;
+    - deferrable: False - runs before handle() returns also in deferred
+      dispatch mode, e.g. keeps queries consistent with the command.
     """
 
+    independent: bool = False
+    depends_on: Tuple[Type["AbstractEventHandler"], ...] = ()
+    timeout: Optional[float] = None
+    deferrable: bool = True
+
     @abstractmethod
     async def __call__(self, event: AbstractEvent) -> None:
         raise NotImplementedError
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -6,5 +8,26 @@ class BrokerConfig(BaseSettings):
     KAFKA_SERVERS: str
     DEFAULT_KAFKA_TOPIC: str
 
+    # Topics are created with this number of partitions, events
+    # are spread over them by id of their aggregate:
+    KAFKA_TOPIC_PARTITIONS: int = 6
+    KAFKA_TOPIC_REPLICATION_FACTOR: int = 1
+
+    # Producer batching, shared by all events sent from one process:
+    KAFKA_PRODUCER_LINGER_MS: int = 5
+    KAFKA_PRODUCER_BATCH_SIZE: int = 16384
+    KAFKA_PRODUCER_COMPRESSION_TYPE: Optional[str] = None
+
+    # Outbox relay, which delivers stored events to the broker:
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_POLL_INTERVAL: float = 1.0
+    OUTBOX_SEND_TIMEOUT: float = 30.0
+    # Failed messages are retried after a delay, which doubles with every
+    # attempt up to the max, they are never dropped:
+    OUTBOX_RETRY_BACKOFF: float = 1.0
+    OUTBOX_MAX_RETRY_BACKOFF: float = 300.0
+    # Messages failed this many times are reported as errors on every attempt:
+    OUTBOX_ALERT_ATTEMPTS: int = 10
+
 
 broker_config: BrokerConfig = BrokerConfig()
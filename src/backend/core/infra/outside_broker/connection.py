@@ -4,3 +4,16 @@ from .config import broker_config
 DEFAULT_KAFKA_TOPIC = broker_config.DEFAULT_KAFKA_TOPIC
 KAFKA_TOPICS = broker_config.KAFKA_TOPICS.replace(" ", "").split(",")
 KAFKA_SERVERS = broker_config.KAFKA_SERVERS.replace(" ", "").split(",")
+KAFKA_TOPIC_PARTITIONS = broker_config.KAFKA_TOPIC_PARTITIONS
+KAFKA_TOPIC_REPLICATION_FACTOR = broker_config.KAFKA_TOPIC_REPLICATION_FACTOR
+
+KAFKA_PRODUCER_LINGER_MS = broker_config.KAFKA_PRODUCER_LINGER_MS
+KAFKA_PRODUCER_BATCH_SIZE = broker_config.KAFKA_PRODUCER_BATCH_SIZE
+KAFKA_PRODUCER_COMPRESSION_TYPE = broker_config.KAFKA_PRODUCER_COMPRESSION_TYPE
+
+OUTBOX_BATCH_SIZE = broker_config.OUTBOX_BATCH_SIZE
+OUTBOX_POLL_INTERVAL = broker_config.OUTBOX_POLL_INTERVAL
+OUTBOX_SEND_TIMEOUT = broker_config.OUTBOX_SEND_TIMEOUT
+OUTBOX_RETRY_BACKOFF = broker_config.OUTBOX_RETRY_BACKOFF
+OUTBOX_MAX_RETRY_BACKOFF = broker_config.OUTBOX_MAX_RETRY_BACKOFF
+OUTBOX_ALERT_ATTEMPTS = broker_config.OUTBOX_ALERT_ATTEMPTS
@@ -0,0 +1,102 @@
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Generic, List, Optional, Sequence, TypeVar
+from uuid import UUID
+
+from backend.core.exceptions import InvalidCursorError
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+
+
+@dataclass(frozen=True)
+class PageRequest:
+    """
+    Request of one page of keyset (cursor) pagination.
+    Items are ordered by sort field and then by id, so the order is stable.
+    cursor: next_cursor of the previous page, None - first page.
+    """
+
+    limit: int = DEFAULT_PAGE_LIMIT
+    cursor: Optional[str] = None
+    sort: str = "id"
+    descending: bool = False
+
+    @property
+    def sort_fields(self) -> List[str]:
+        return ["id"] if self.sort == "id" else [self.sort, "id"]
+
+
+@dataclass(frozen=True)
+class Page(Generic[T]):
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(page_request: PageRequest, values: Sequence[Any]) -> str:
+    """
+    Cursor keeps sort values of the last item of the page.
+    It also keeps the order, so it can not be used with another one.
+    """
+    payload = {
+        "sort": page_request.sort,
+        "desc": page_request.descending,
+        "after": [_to_json(value) for value in values],
+    }
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode()
+
+
+def decode_cursor(page_request: PageRequest, types: Sequence[type]) -> List[Any]:
+    """
+    Returns sort values of the cursor converted to the given types.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(page_request.cursor.encode()))
+        if (
+            payload["sort"] != page_request.sort
+            or payload["desc"] != page_request.descending
+            or len(payload["after"]) != len(types)
+        ):
+            raise ValueError("Cursor does not match the page request")
+        return [
+            _from_json(value, value_type)
+            for value, value_type in zip(payload["after"], types)
+        ]
+    except (ValueError, KeyError, TypeError, AttributeError) as err:
+        raise InvalidCursorError from err
+
+
+def make_page(items: Sequence[T], page_request: PageRequest) -> Page[T]:
+    """
+    items: up to page_request.limit + 1 items, the extra one
+    only tells that there is a next page.
+    """
+    if len(items) <= page_request.limit:
+        return Page(items=list(items))
+    items = list(items[: page_request.limit])
+    last = items[-1]
+    values = [getattr(last, sort_field) for sort_field in page_request.sort_fields]
+    return Page(items=items, next_cursor=encode_cursor(page_request, values))
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _from_json(value: Any, value_type: type) -> Any:
+    if value_type is datetime:
+        return datetime.fromisoformat(value)
+    if value_type is UUID:
+        return UUID(value)
+    if not isinstance(value, value_type):
+        raise TypeError(f"Cursor value {value!r} is not {value_type.__name__}")
+    return value
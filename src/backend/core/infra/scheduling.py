@@ -0,0 +1,181 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, FrozenSet, Optional, Union
+
+# Runs of a schedule, which are searched at most, in a missed period:
+MAX_COALESCED_RUNS = 100000
+
+_CRON_FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 7),
+)
+
+
+def _parse_cron_field(value: str, first: int, last: int) -> FrozenSet[int]:
+    values = set()
+    for part in value.split(","):
+        part, _, step = part.partition("/")
+        if part == "*":
+            start, end = first, last
+        elif "-" in part:
+            start, end = (int(bound) for bound in part.split("-", 1))
+        else:
+            start = end = int(part)
+            if step:
+                end = last
+        if not first <= start <= end <= last:
+            raise ValueError(f"Cron value {value!r} is out of {first}-{last}")
+        values.update(range(start, end + 1, int(step) if step else 1))
+    return frozenset(values)
+
+
+class CronSchedule:
+    """
+    Five fields of cron: minute, hour, day of month, month, day of week
+    (0 or 7 is Sunday). A field is "*", a number, a range "a-b",
+    with optional step "/n", or a comma separated list of them.
+    As in cron, a day matches either field of days, if both are set.
+    """
+
+    def __init__(self, expression: str) -> None:
+        fields = expression.split()
+        if len(fields) != len(_CRON_FIELDS):
+            raise ValueError(f"Cron expression {expression!r} must have 5 fields")
+        try:
+            parsed = [
+                _parse_cron_field(value, first, last)
+                for value, (_, first, last) in zip(fields, _CRON_FIELDS)
+            ]
+        except ValueError as err:
+            raise ValueError(f"Invalid cron expression {expression!r}: {err}")
+        self.expression = expression
+        self._minutes, self._hours, self._days, self._months, weekdays = parsed
+        self._weekdays = frozenset(weekday % 7 for weekday in weekdays)
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def __repr__(self) -> str:
+        return f"CronSchedule({self.expression!r})"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day = moment.day in self._days
+        weekday = (moment.weekday() + 1) % 7 in self._weekdays
+        if self._any_day or self._any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, moment: datetime) -> datetime:
+        run = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # Days like 30 February never come, the search is bounded:
+        until = run + timedelta(days=5 * 366)
+        while run < until:
+            if run.month not in self._months:
+                run = (run.replace(day=1) + timedelta(days=32)).replace(
+                    day=1, hour=0, minute=0
+                )
+            elif not self._day_matches(run):
+                run = run.replace(hour=0, minute=0) + timedelta(days=1)
+            elif run.hour not in self._hours:
+                run = run.replace(minute=0) + timedelta(hours=1)
+            elif run.minute not in self._minutes:
+                run += timedelta(minutes=1)
+            else:
+                return run
+        raise ValueError(f"Cron expression {self.expression!r} never runs")
+
+    def first_run(self, now: datetime) -> datetime:
+        return self.next_after(now)
+
+
+class IntervalSchedule:
+    """
+    Runs every `seconds`, counted from the previous run.
+    A job without runs is run at once.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        if seconds <= 0:
+            raise ValueError("Interval of a schedule must be positive")
+        self.interval = timedelta(seconds=seconds)
+
+    def __repr__(self) -> str:
+        return f"IntervalSchedule({self.interval.total_seconds()})"
+
+    def next_after(self, moment: datetime) -> datetime:
+        return moment + self.interval
+
+    def first_run(self, now: datetime) -> datetime:
+        return now
+
+
+Schedule = Union[CronSchedule, IntervalSchedule]
+
+
+@dataclass(frozen=True)
+class Job:
+    """
+    Periodic job, which is run once across all processes.
+    func returns number of processed rows, if it counts them.
+
+    jitter - seconds, the run is delayed by at most, at random,
+    so jobs of the same time don't start together.
+    catch_up - if runs were missed, e.g. nothing was running,
+    the job is run once for all of them, otherwise they are skipped
+    till the next run.
+    """
+
+    name: str
+    func: Callable[[], Awaitable[Optional[int]]]
+    schedule: Schedule
+    jitter: float = 0.0
+    catch_up: bool = True
+
+
+def next_run(
+    schedule: Schedule, last_run: Optional[datetime], started: datetime
+) -> datetime:
+    """
+    Run of the schedule after the last run. Without runs it is
+    the first run since the scheduler started.
+    """
+    if last_run is None:
+        return schedule.first_run(started)
+    return schedule.next_after(last_run)
+
+
+def due_run(
+    schedule: Schedule, last_run: Optional[datetime], started: datetime, now: datetime
+) -> Optional[datetime]:
+    """
+    The latest run of the schedule, which is due after the last run,
+    None if none is due yet.
+    """
+    run = next_run(schedule, last_run, started)
+    if run > now:
+        return None
+    for _ in range(MAX_COALESCED_RUNS):
+        following = schedule.next_after(run)
+        if following > now:
+            return run
+        run = following
+    return run
+
+
+def is_missed(schedule: Schedule, run: datetime, last_run: Optional[datetime]) -> bool:
+    """
+    Whether runs before the due run were missed.
+    """
+    return last_run is not None and schedule.next_after(last_run) < run
+
+
+def advisory_lock_key(name: str) -> int:
+    """
+    Key of the advisory lock of a job, the same in all processes
+    (unlike hash(), which is salted per process).
+    """
+    digest = hashlib.blake2b(name.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
@@ -1,17 +1,105 @@
-from typing import Dict, List, Type, Any
-from queue import Queue
+import asyncio
+import time
+from collections import deque
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Awaitable, Deque, Dict, List, Optional, Tuple, Type, Any
 
+from .background_dispatcher import BackgroundDispatcher
 from .exceptions import MessageBusMessageError
+from .handler_metrics import HandlerMetrics
 from backend.core.infra.commands import AbstractCommand
 from backend.core.infra.events import AbstractEvent
-from backend.core.infra.eventbus import AbstractEventBus
+from backend.core.infra.eventbus import AbstractEventBus, ContextEventBus
 from backend.core.infra.handlers import AbstractEventHandler, AbstractCommandHandler
 from backend.core.infra.messages import Message
 
 # class MessageBus:
 
 
+def plan_event_handlers(
+    handlers: List[AbstractEventHandler],
+) -> List[List[AbstractEventHandler]]:
+    """
+    Splits handlers of one event into stages, which run one after another.
+    Handlers are ordered by their dependencies, otherwise order
+    of registration is kept. Handlers in one stage are independent
+    of each other and run concurrently.
+    Dependencies on handlers, which are not registered for the event,
+    are ignored.
+    """
+    registered = {type(handler) for handler in handlers}
+    remaining = list(handlers)
+    done: set = set()
+    ordered: List[AbstractEventHandler] = []
+    while remaining:
+        for handler in remaining:
+            if all(
+                dependency in done or dependency not in registered
+                for dependency in handler.depends_on
+            ):
+                break
+        else:
+            raise ValueError(f"Cyclic dependencies of event handlers: {remaining}")
+        remaining.remove(handler)
+        done.add(type(handler))
+        ordered.append(handler)
+
+    # Independent handlers between two sequential ones run in stages,
+    # each handler in the first stage after all its dependencies:
+    stages: List[List[AbstractEventHandler]] = []
+    levels: Dict[Type[AbstractEventHandler], int] = {}
+    first_concurrent_stage = 0
+    for handler in ordered:
+        if not handler.independent:
+            stages.append([handler])
+            first_concurrent_stage = len(stages)
+            continue
+        level = max(
+            (
+                levels[dependency] + 1
+                for dependency in handler.depends_on
+                if levels.get(dependency, -1) >= first_concurrent_stage
+            ),
+            default=first_concurrent_stage,
+        )
+        if level == len(stages):
+            stages.append([])
+        stages[level].append(handler)
+        levels[type(handler)] = level
+    return stages
+
+
+# Stages of handlers by type of event:
+EventStages = Dict[Type[AbstractEvent], List[List[AbstractEventHandler]]]
+
+
+@dataclass
+class DispatchContext:
+    """
+    State of one handle() call: messages to handle, each with stages
+    of handlers to run for it, and result of the command.
+    deferred: events of infra event bus are passed to background dispatcher.
+    """
+
+    queue: Deque[Tuple[Message, EventStages]] = field(default_factory=deque)
+    command_result: Any = None
+    deferred: bool = False
+
+
 class GlobalMessageBusHandler:
+    """
+    Handles command and all events, which were raised by it.
+    State of handling is kept in DispatchContext of every handle() call,
+    so one instance can serve concurrent requests, if event buses
+    keep events per context (ContextEventBus).
+
+    With background dispatcher started, handle() returns right after
+    the command and events of domain event bus are handled,
+    events of infra event bus are handled by the dispatcher workers.
+    Handlers, which are not deferrable, still run before handle() returns,
+    the rest of handlers of infra events run in background.
+    """
 
     def __init__(
         self,
@@ -19,6 +107,8 @@ class GlobalMessageBusHandler:
         infra_event_bus: AbstractEventBus,
         event_handlers: Dict[Type[AbstractEvent], List[AbstractEventHandler]],
         command_handlers: Dict[Type[AbstractCommand], AbstractCommandHandler],
+        metrics: Optional[HandlerMetrics] = None,
+        background: Optional[BackgroundDispatcher] = None,
     ) -> None:
 
         self._domain_event_bus = domain_event_bus
@@ -29,37 +119,149 @@ class GlobalMessageBusHandler:
         self._command_handlers: Dict[
             Type[AbstractCommand], AbstractCommandHandler
         ] = command_handlers
-        self._queue: Queue = Queue()
-        self._command_result: Any = None
-
-    async def handle(self, message: Message) -> None:
-        self._queue.put(message)
-        while not self._queue.empty():
-            message = self._queue.get()
-            if isinstance(message, AbstractEvent):
-                await self._handle_event(event=message)
-            elif isinstance(message, AbstractCommand):
-                await self._handle_command(command=message)
-            else:
-                raise MessageBusMessageError
-
-    async def _handle_event(self, event: AbstractEvent) -> None:
-        handler: AbstractEventHandler
-        for handler in self._event_handlers[type(event)]:
-            await handler(event)
-            for event in self._domain_event_bus.get_events():
-                self._queue.put_nowait(event)
-            for event in self._infra_event_bus.get_events():
-                self._queue.put_nowait(event)
+        self._event_stages: EventStages = self._plan(event_handlers)
+        self._inline_stages: EventStages = self._plan(
+            event_handlers, lambda handler: not handler.deferrable
+        )
+        self._deferred_stages: EventStages = self._plan(
+            event_handlers, lambda handler: handler.deferrable
+        )
+        self.metrics: HandlerMetrics = metrics or HandlerMetrics()
+        self.background: Optional[BackgroundDispatcher] = background
 
-    async def _handle_command(self, command: AbstractCommand) -> None:
-        handler: AbstractCommandHandler = self._command_handlers[type(command)]
-        self._command_result = await handler(command)
+    @staticmethod
+    def _plan(
+        event_handlers: Dict[Type[AbstractEvent], List[AbstractEventHandler]],
+        selected=lambda handler: True,
+    ) -> EventStages:
+        return {
+            event_type: plan_event_handlers(
+                [handler for handler in handlers if selected(handler)]
+            )
+            for event_type, handlers in event_handlers.items()
+        }
+
+    async def start(self) -> None:
+        if self.background:
+            await self.background.start(self._handle_in_background)
+
+    async def stop(self) -> None:
+        """
+        Handles events, which are left in background dispatcher.
+        """
+        if self.background:
+            await self.background.stop()
+
+    async def handle(self, message: Message) -> Any:
+        """
+        Returns result of the command handler.
+        """
+        return await self._dispatch(
+            message, deferred=bool(self.background and self.background.running)
+        )
+
+    async def _handle_in_background(self, message: Message) -> Any:
+        # Not deferrable handlers of the event have already run.
+        # Events raised by background handlers are handled by the same worker,
+        # waiting for a place in the full queue here could block all workers:
+        return await self._dispatch(
+            message, deferred=False, event_stages=self._deferred_stages
+        )
+
+    async def _dispatch(
+        self,
+        message: Message,
+        deferred: bool,
+        event_stages: Optional[EventStages] = None,
+    ) -> Any:
+        context = DispatchContext(deferred=deferred)
+        if event_stages is None:
+            event_stages = self._event_stages
+        context.queue.append((message, event_stages))
+        with ExitStack() as stack:
+            for event_bus in (self._domain_event_bus, self._infra_event_bus):
+                if isinstance(event_bus, ContextEventBus):
+                    stack.enter_context(event_bus.scope())
+            while context.queue:
+                message, event_stages = context.queue.popleft()
+                if isinstance(message, AbstractEvent):
+                    await self._handle_event(
+                        event=message,
+                        stages=event_stages[type(message)],
+                        context=context,
+                    )
+                elif isinstance(message, AbstractCommand):
+                    await self._handle_command(command=message, context=context)
+                else:
+                    raise MessageBusMessageError
+        return context.command_result
+
+    async def _collect_events(self, context: DispatchContext) -> None:
         for event in self._domain_event_bus.get_events():
-            self._queue.put_nowait(event)
+            context.queue.append((event, self._event_stages))
+        if not context.deferred:
+            for event in self._infra_event_bus.get_events():
+                context.queue.append((event, self._event_stages))
+            return
         for event in self._infra_event_bus.get_events():
-            self._queue.put_nowait(event)
+            context.queue.append((event, self._inline_stages))
+            if self._deferred_stages[type(event)]:
+                await self.background.submit(event)
 
-    @property
-    def command_result(self) -> Any:
-        return self._command_result
+    async def _handle_event(
+        self,
+        event: AbstractEvent,
+        stages: List[List[AbstractEventHandler]],
+        context: DispatchContext,
+    ) -> None:
+        for stage in stages:
+            if len(stage) == 1 and not stage[0].independent:
+                await self._run_handler(stage[0], event)
+            else:
+                results = await asyncio.gather(
+                    *(self._run_handler(handler, event) for handler in stage),
+                    return_exceptions=True,
+                )
+                for handler, result in zip(stage, results):
+                    if isinstance(result, BaseException):
+                        print(
+                            f"Error: {type(handler).__name__} "
+                            f"failed on {type(event).__name__}: {result!r}"
+                        )
+            await self._collect_events(context)
+
+    async def _handle_command(
+        self, command: AbstractCommand, context: DispatchContext
+    ) -> None:
+        handler: AbstractCommandHandler = self._command_handlers[type(command)]
+        context.command_result = await self._run_handler(handler, command)
+        await self._collect_events(context)
+
+    async def _run_handler(
+        self,
+        handler: AbstractEventHandler | AbstractCommandHandler,
+        message: Message,
+    ) -> Any:
+        """
+        Runs handler with its timeout and records its latency.
+        """
+        timeout: Optional[float] = getattr(handler, "timeout", None)
+        awaitable: Awaitable = handler(message)
+        status = "error"
+        start = time.perf_counter()
+        try:
+            if timeout is None:
+                result = await awaitable
+            else:
+                result = await asyncio.wait_for(awaitable, timeout)
+            status = "ok"
+            return result
+        except asyncio.TimeoutError:
+            status = "timeout"
+            raise
+        finally:
+            self.metrics.observe(
+                handler_name=type(handler).__name__,
+                elapsed=time.perf_counter() - start,
+                status=status,
+            )
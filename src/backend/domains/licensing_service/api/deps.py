@@ -1,24 +1,127 @@
+from typing import Callable, FrozenSet, List, Literal, Optional, Tuple
+
+from fastapi import Query
+
+from backend.core.background_dispatcher import BackgroundDispatcher
 from backend.core.bootstrap import Bootstrap
+from backend.core.config import messagebus_config
+from backend.core.exceptions import InvalidIncludeError
+from backend.core.infra.pagination import (
+    DEFAULT_PAGE_LIMIT,
+    MAX_PAGE_LIMIT,
+    PageRequest,
+)
+from backend.core.infra.scheduling import Job
 from backend.core.messagebus_handler import GlobalMessageBusHandler
 
 from ..app import DomainEventBus
+from ..app.commands.license_expiration_sweeper import LicenseExpirationSweeper
+from ..app.commands.usage_accumulator import UsageAccumulator
+from ..app.jobs.schedule import make_scheduled_jobs
 from ..infra.handlers import (
     COMMANDS_HANDLERS_FOR_INJECTION,
     EVENTS_HANDLERS_FOR_INJECTION,
 )
 
 
+# Messagebus and handlers are created once for the application, event buses
+# keep events per request context, so they can be shared by all requests:
+bootstrap: Bootstrap = Bootstrap(
+    domain_event_bus=DomainEventBus(),
+    infra_event_bus=DomainEventBus(),
+    events_handlers_for_injection=EVENTS_HANDLERS_FOR_INJECTION,
+    commands_handlers_for_injection=COMMANDS_HANDLERS_FOR_INJECTION,
+    background_dispatcher=(
+        BackgroundDispatcher(
+            workers=messagebus_config.MESSAGEBUS_WORKERS,
+            queue_size=messagebus_config.MESSAGEBUS_QUEUE_SIZE,
+            drain_timeout=messagebus_config.MESSAGEBUS_DRAIN_TIMEOUT,
+        )
+        if messagebus_config.MESSAGEBUS_DISPATCH_MODE == "deferred"
+        else None
+    ),
+)
+
+
 def get_messagebus_handler():
-    bootstrap: Bootstrap = Bootstrap(
-        domain_event_bus=DomainEventBus(),
-        infra_event_bus=DomainEventBus(),
-        events_handlers_for_injection=EVENTS_HANDLERS_FOR_INJECTION,
-        commands_handlers_for_injection=COMMANDS_HANDLERS_FOR_INJECTION,
-    )
     messagebus_handler: GlobalMessageBusHandler = bootstrap.get_messagebus()
     return messagebus_handler
 
 
+# Write-behind buffer of usage reports, flushed by the task started
+# with the application:
+usage_accumulator: UsageAccumulator = UsageAccumulator(
+    messagebus_factory=bootstrap.get_messagebus
+)
+
+
+def get_usage_accumulator() -> UsageAccumulator:
+    return usage_accumulator
+
+
+# Deactivates expired licenses of type by time, run by the scheduler:
+license_expiration_sweeper: LicenseExpirationSweeper = LicenseExpirationSweeper(
+    messagebus_factory=bootstrap.get_messagebus
+)
+
+# Periodic jobs, run once across all processes by the scheduler started
+# with the application:
+scheduled_jobs: List[Job] = make_scheduled_jobs(license_expiration_sweeper)
+
+
+# Cursor of the next page of list endpoints:
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def get_page_request(*sort_fields: str) -> Callable[..., PageRequest]:
+    """
+    Makes dependency, which reads pagination parameters of list endpoint.
+    The first of sort_fields is the default sorting.
+    """
+
+    def page_request(
+        limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+        cursor: Optional[str] = Query(
+            None, description="X-Next-Cursor header of the previous page"
+        ),
+        sort: Literal[sort_fields] = sort_fields[0],
+        order: Literal["asc", "desc"] = "asc",
+    ) -> PageRequest:
+        return PageRequest(
+            limit=limit, cursor=cursor, sort=sort, descending=order == "desc"
+        )
+
+    return page_request
+
+
+def get_include(
+    *relations: str, default: Tuple[str, ...] = ()
+) -> Callable[..., FrozenSet[str]]:
+    """
+    Makes dependency, which reads relations to load with the aggregate:
+    comma separated include parameter, empty value - no relations.
+    Not included relations are not loaded and are returned empty.
+    """
+
+    def include_relations(
+        include: Optional[str] = Query(
+            None,
+            description=(
+                f"Comma separated: {', '.join(relations)}. "
+                f"Default: {', '.join(default) or 'none'}"
+            ),
+        ),
+    ) -> FrozenSet[str]:
+        if include is None:
+            return frozenset(default)
+        values = frozenset(value.strip() for value in include.split(",")) - {""}
+        if not values <= set(relations):
+            raise InvalidIncludeError
+        return values
+
+    return include_relations
+
+
 # def get_message_bus() -> MessageBus:
 #     bootstrap: Bootstrap = Bootstrap(
 #         domain_event_bus=,
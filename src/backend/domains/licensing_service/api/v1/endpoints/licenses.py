@@ -1,19 +1,36 @@
-from typing import List, MutableSequence
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
+
+from backend.core.infra.pagination import Page, PageRequest
 
 # --- API Imports ---
-from ..schemas.license import License
+from ...deps import NEXT_CURSOR_HEADER, get_page_request
+from ..schemas.license import License, LicenseStatus, LicenseType
 from ..services.license import get_all_licenses, get_license
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[License])
-async def get_all_licenses_route():
-    licenses: MutableSequence[License] = await get_all_licenses()
-    return licenses
+async def get_all_licenses_route(
+    response: Response,
+    page: PageRequest = Depends(get_page_request("id", "created", "name")),
+    subdivision_id: Optional[UUID] = None,
+    status: Optional[LicenseStatus] = None,
+    type: Optional[LicenseType] = None,
+):
+    """
+    Returns one page of licenses, cursor of the next page
+    is in X-Next-Cursor header.
+    """
+    licenses: Page[License] = await get_all_licenses(
+        page=page, subdivision_id=subdivision_id, status=status, type=type
+    )
+    if licenses.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = licenses.next_cursor
+    return licenses.items
 
 
 @router.get("/{id}", response_model=License)
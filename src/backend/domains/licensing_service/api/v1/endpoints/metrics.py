@@ -0,0 +1,28 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
+
+from ....app.queries.subdivision_queries import license_state_cache
+
+# --- API Imports ---
+from ...deps import get_messagebus_handler
+
+router = APIRouter()
+
+
+@router.get(
+    "/handlers", name="Handlers Metrics", response_model=Dict[str, Dict[str, float]]
+)
+async def handlers_metrics_route(messagebus_handler=Depends(get_messagebus_handler)):
+    """
+    Latency and outcomes of messagebus handlers since start of the process.
+    """
+    return messagebus_handler.metrics.snapshot()
+
+
+@router.get("/caches", name="Caches Metrics", response_model=Dict[str, Dict[str, Any]])
+async def caches_metrics_route():
+    """
+    Hits, misses and size of in-process caches.
+    """
+    return {"license_state": license_state_cache.stats()}
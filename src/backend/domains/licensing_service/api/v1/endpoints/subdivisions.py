@@ -1,28 +1,63 @@
-from typing import List, MutableSequence
+from datetime import datetime
+from typing import FrozenSet, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import StreamingResponse
+
+from backend.core.infra.export import EXPORT_MEDIA_TYPES, ExportFormat
+from backend.core.infra.pagination import Page, PageRequest
 
 # --- API Imports ---
-from ...deps import get_messagebus_handler
-from ..schemas.license import LicenseCreate, LicenseUpdate
-from ..schemas.subdivision import Subdivision, SubdivisionCreate, SubdivisionUpdate
+from ...deps import (
+    NEXT_CURSOR_HEADER,
+    get_include,
+    get_messagebus_handler,
+    get_page_request,
+    get_usage_accumulator,
+)
+from ..schemas.license import LicenseCreate, LicenseStatus, LicenseUpdate
+from ..schemas.license_usage import (
+    LicenseState,
+    LicenseUsage,
+    LicenseUsageBatch,
+    UsageBatchCreate,
+)
+from ..schemas.statictic_row import UsageBucket, UsagePoint
+from ..schemas.subdivision import (
+    Subdivision,
+    SubdivisionCreate,
+    SubdivisionSummary,
+    SubdivisionUpdate,
+    WorkStatus,
+)
 from ..services.subdivision import (
+    export_subdivision_statistics,
     active_subdivision_license,
     create_subdivision,
     deactive_subdivision_license,
     delete_subdivision,
+    get_all_subdivision_summaries,
     get_all_subdivisions,
+    get_license_state,
     get_subdivision,
+    get_subdivision_summary,
+    get_subdivision_usage,
     subdivision_add_statistic_row,
+    subdivision_add_statistic_rows_batch,
+    subdivision_buffer_usage,
     subdivision_create_license,
     subdivision_delete_license,
+    subdivision_record_usage,
     subdivision_update_license,
     update_subdivision,
 )
 
 router = APIRouter()
 
+# Statistics are the whole usage history, they are returned only on request:
+get_subdivision_include = get_include("licenses", "statistics", default=("licenses",))
+
 
 @router.post("/", name="Create a new Subdivision", response_model=Subdivision)
 async def create_subdivision_route(
@@ -38,14 +73,109 @@ async def create_subdivision_route(
 
 
 @router.get("/", name="Get All Subdivisions", response_model=List[Subdivision])
-async def get_all_subdivisions_route():
-    subdivisions: MutableSequence[Subdivision] = await get_all_subdivisions()
-    return subdivisions
+async def get_all_subdivisions_route(
+    response: Response,
+    page: PageRequest = Depends(get_page_request("id", "name")),
+    tenant_id: Optional[UUID] = None,
+    work_status: Optional[WorkStatus] = None,
+    license_status: Optional[LicenseStatus] = None,
+    include: FrozenSet[str] = Depends(get_subdivision_include),
+):
+    """
+    Returns one page of subdivisions, cursor of the next page
+    is in X-Next-Cursor header.
+    """
+    subdivisions: Page[Subdivision] = await get_all_subdivisions(
+        page=page,
+        tenant_id=tenant_id,
+        work_status=work_status,
+        license_status=license_status,
+        include=include,
+    )
+    if subdivisions.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = subdivisions.next_cursor
+    return subdivisions.items
+
+
+@router.get(
+    "/summaries",
+    name="Get All Subdivision Summaries",
+    response_model=List[SubdivisionSummary],
+)
+async def get_all_subdivision_summaries_route(tenant_id: Optional[UUID] = None):
+    """
+    Reads read models only, without licenses and statistic rows.
+    """
+    summaries: List[SubdivisionSummary] = await get_all_subdivision_summaries(
+        tenant_id=tenant_id
+    )
+    return summaries
+
+
+@router.get(
+    "/{id}/license-status", name="Get License Status", response_model=LicenseState
+)
+async def get_license_state_route(id: UUID):
+    """
+    Whether subdivision is licensed now and how many requests are left,
+    served from in-process cache, used requests can be behind by CACHE_TTL.
+    """
+    state: LicenseState = await get_license_state(id=id)
+    return state
+
+
+@router.get(
+    "/{id}/summary", name="Get Subdivision Summary", response_model=SubdivisionSummary
+)
+async def get_subdivision_summary_route(id: UUID):
+    summary: SubdivisionSummary = await get_subdivision_summary(id=id)
+    return summary
+
+
+@router.get("/{id}/statistics/export", name="Export Subdivision Statistics")
+async def export_subdivision_statistics_route(
+    id: UUID, export_format: ExportFormat = Query("ndjson", alias="format")
+):
+    """
+    Streams statistic rows as NDJSON or CSV,
+    memory does not depend on the number of rows.
+    """
+    chunks = await export_subdivision_statistics(id=id, export_format=export_format)
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="statistics-{id}.{export_format}"'
+            )
+        },
+    )
+
+
+@router.get(
+    "/{id}/usage", name="Get Subdivision Usage", response_model=List[UsagePoint]
+)
+async def get_subdivision_usage_route(
+    id: UUID,
+    bucket: UsageBucket = UsageBucket.DAY,
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+):
+    """
+    Requests summed by hour, day or month in [from, to)
+    by the database, buckets without requests are not returned.
+    """
+    usage: List[UsagePoint] = await get_subdivision_usage(
+        id=id, bucket=bucket, start=start, end=end
+    )
+    return usage
 
 
 @router.get("/{id}", name="Get Subdivision", response_model=Subdivision)
-async def get_subdivision_route(id: UUID):
-    subdivision: Subdivision = await get_subdivision(id=id)
+async def get_subdivision_route(
+    id: UUID, include: FrozenSet[str] = Depends(get_subdivision_include)
+):
+    subdivision: Subdivision = await get_subdivision(id=id, include=include)
     return subdivision
 
 
@@ -114,6 +244,62 @@ async def statictic_row_add_route(
     return subdivision
 
 
+@router.post(path="/{id}/usage", name="Record Usage", response_model=LicenseUsage)
+async def record_usage_route(
+    id: UUID,
+    count_requests: int = Query(gt=0),
+    messagebus_handler=Depends(get_messagebus_handler),
+) -> LicenseUsage:
+    """
+    Records requests made by subdivision and checks the license limit
+    atomically, without loading the subdivision. Use it for frequent reports.
+    """
+    usage = await subdivision_record_usage(
+        subdivision_id=id,
+        count_requests=count_requests,
+        messagebus_handler=messagebus_handler,
+    )
+    return usage
+
+
+@router.post(
+    path="/{id}/usage/buffered",
+    name="Record Buffered Usage",
+    response_model=LicenseState,
+)
+async def record_buffered_usage_route(
+    id: UUID,
+    count_requests: int = Query(gt=0),
+    usage_accumulator=Depends(get_usage_accumulator),
+) -> LicenseState:
+    """
+    Checks the license limit in memory and returns at once, requests
+    are recorded by the periodic flush. Use it for per-request metering.
+    """
+    state = await subdivision_buffer_usage(
+        subdivision_id=id,
+        count_requests=count_requests,
+        usage_accumulator=usage_accumulator,
+    )
+    return state
+
+
+@router.post(
+    path="/usage_batch", name="Record Usage Batch", response_model=LicenseUsageBatch
+)
+async def record_usage_batch_route(
+    *, item_in: UsageBatchCreate, messagebus_handler=Depends(get_messagebus_handler)
+) -> LicenseUsageBatch:
+    """
+    Records usage of many subdivisions in one transaction.
+    Returns recorded and rejected items and licenses which reached the limit.
+    """
+    usage_batch = await subdivision_add_statistic_rows_batch(
+        batch_data=item_in, messagebus_handler=messagebus_handler
+    )
+    return usage_batch
+
+
 @router.post(
     path="/{id}/create_license", name="Create a new License", response_model=Subdivision
 )
@@ -1,21 +1,46 @@
-from typing import List, MutableSequence
+from datetime import datetime
+from typing import FrozenSet, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import StreamingResponse
+
+from backend.core.infra.export import EXPORT_MEDIA_TYPES, ExportFormat
+from backend.core.infra.pagination import Page, PageRequest
 
 # --- API Imports ---
-from ...deps import get_messagebus_handler
-from ..schemas.tenant import Tenant, TenantCreate, TenantUpdate
+from ...deps import (
+    NEXT_CURSOR_HEADER,
+    get_include,
+    get_messagebus_handler,
+    get_page_request,
+)
+from ..schemas.license import LicenseStatus
+from ..schemas.statictic_row import UsageBucket, UsagePoint
+from ..schemas.tenant import Tenant, TenantCreate, TenantSummary, TenantUpdate
 from ..services.tenant import (
+    export_tenant_statistics,
     create_tenant,
     delete_tenant,
+    get_all_tenant_summaries,
     get_all_tenants,
     get_tenant,
+    get_tenant_summary,
+    get_tenant_usage,
     update_tenant,
 )
 
 router = APIRouter()
 
+# Statistics of subdivisions are returned only on request:
+get_tenant_include = get_include(
+    "users",
+    "subdivisions",
+    "subdivisions.licenses",
+    "subdivisions.statistics",
+    default=("users", "subdivisions", "subdivisions.licenses"),
+)
+
 
 @router.post("/", name="Create a new Tenant", response_model=Tenant)
 async def create_tenant_route(
@@ -31,14 +56,84 @@ async def create_tenant_route(
 
 
 @router.get("/", name="Get All Tenants", response_model=List[Tenant])
-async def get_all_tenants_route():
-    tenants: MutableSequence[Tenant] = await get_all_tenants()
-    return tenants
+async def get_all_tenants_route(
+    response: Response,
+    page: PageRequest = Depends(get_page_request("id", "name")),
+    name: Optional[str] = None,
+    license_status: Optional[LicenseStatus] = None,
+    include: FrozenSet[str] = Depends(get_tenant_include),
+):
+    """
+    Returns one page of tenants, cursor of the next page
+    is in X-Next-Cursor header.
+    """
+    tenants: Page[Tenant] = await get_all_tenants(
+        page=page, name=name, license_status=license_status, include=include
+    )
+    if tenants.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = tenants.next_cursor
+    return tenants.items
+
+
+@router.get(
+    "/summaries", name="Get All Tenant Summaries", response_model=List[TenantSummary]
+)
+async def get_all_tenant_summaries_route():
+    """
+    Reads read models only, without users and subdivisions.
+    """
+    summaries: List[TenantSummary] = await get_all_tenant_summaries()
+    return summaries
+
+
+@router.get("/{id}/summary", name="Get Tenant Summary", response_model=TenantSummary)
+async def get_tenant_summary_route(id: UUID):
+    summary: TenantSummary = await get_tenant_summary(id=id)
+    return summary
+
+
+@router.get("/{id}/statistics/export", name="Export Tenant Statistics")
+async def export_tenant_statistics_route(
+    id: UUID, export_format: ExportFormat = Query("ndjson", alias="format")
+):
+    """
+    Streams statistic rows of all subdivisions as NDJSON or CSV,
+    memory does not depend on the number of rows.
+    """
+    chunks = await export_tenant_statistics(id=id, export_format=export_format)
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="statistics-{id}.{export_format}"'
+            )
+        },
+    )
+
+
+@router.get("/{id}/usage", name="Get Tenant Usage", response_model=List[UsagePoint])
+async def get_tenant_usage_route(
+    id: UUID,
+    bucket: UsageBucket = UsageBucket.DAY,
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+):
+    """
+    Requests of all subdivisions summed by hour, day or month in [from, to)
+    by the database, buckets without requests are not returned.
+    """
+    usage: List[UsagePoint] = await get_tenant_usage(
+        id=id, bucket=bucket, start=start, end=end
+    )
+    return usage
 
 
 @router.get("/{id}", name="Get Tenant", response_model=Tenant)
-async def get_tenant_route(id: UUID):
-    tenant: Tenant = await get_tenant(id=id)
+async def get_tenant_route(
+    id: UUID, include: FrozenSet[str] = Depends(get_tenant_include)
+):
+    tenant: Tenant = await get_tenant(id=id, include=include)
     return tenant
 
 
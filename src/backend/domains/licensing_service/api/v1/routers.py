@@ -1,7 +1,7 @@
 from fastapi import APIRouter
 
 from ..config import rest_api_config
-from .endpoints import licenses, subdivisions, tenants, users
+from .endpoints import licenses, metrics, subdivisions, tenants, users
 
 prefix = f"/{rest_api_config.API_PREFIX}/api/v1"
 
@@ -14,3 +14,4 @@ api_router.include_router(tenants.router, prefix=f"{prefix}/tenants", tags=["Ten
 api_router.include_router(
     licenses.router, prefix=f"{prefix}/licenses", tags=["Licenses"]
 )
+api_router.include_router(metrics.router, prefix=f"{prefix}/metrics", tags=["Metrics"])
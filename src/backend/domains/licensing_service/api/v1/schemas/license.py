@@ -24,6 +24,7 @@ class LicenseBase(BaseModel):
     subdivision_id: Optional[UUID] = None
     status: Optional[LicenseStatus] = None
     count_requests: Optional[int] = None
+    used_requests: Optional[int] = None
     activated: Optional[datetime] = None
     expirated: Optional[datetime] = None
     created: Optional[datetime] = None
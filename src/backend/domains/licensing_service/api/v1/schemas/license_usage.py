@@ -0,0 +1,61 @@
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from .license import LicenseType
+from .subdivision import WorkStatus
+
+
+class LicenseUsage(BaseModel):
+    subdivision_id: UUID
+    license_id: UUID
+    statistic_row_id: UUID
+    count_requests: int
+    used_requests: int
+    limit_requests: int
+    remaining_requests: int
+    license_active: bool
+
+    class Config:
+        from_attributes = True
+
+
+class UsageBatchItem(BaseModel):
+    subdivision_id: UUID
+    count_requests: int = Field(gt=0)
+
+
+class UsageBatchCreate(BaseModel):
+    items: List[UsageBatchItem]
+
+
+class RejectedUsage(BaseModel):
+    subdivision_id: UUID
+    count_requests: int
+    reason: str
+
+
+class LicenseUsageBatch(BaseModel):
+    accepted: List[LicenseUsage]
+    rejected: List[RejectedUsage]
+    expired_license_ids: List[UUID]
+
+    class Config:
+        from_attributes = True
+
+
+class LicenseState(BaseModel):
+    subdivision_id: UUID
+    licensed: bool
+    work_status: WorkStatus
+    license_id: Optional[UUID] = None
+    license_type: Optional[LicenseType] = None
+    expiration: Optional[datetime] = None
+    limit_requests: Optional[int] = None
+    used_requests: Optional[int] = None
+    remaining_requests: Optional[int] = None
+
+    class Config:
+        from_attributes = True
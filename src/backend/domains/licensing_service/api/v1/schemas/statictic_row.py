@@ -1,4 +1,5 @@
 from datetime import datetime
+from enum import StrEnum
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -16,3 +17,32 @@ class StatisticRowCreate(BaseModel):
 
 class StatisticRow(StatisticRowBase):
     pass
+
+
+class StatisticRowExport(BaseModel):
+    """
+    Row of statistics export, fields are the columns of CSV.
+    """
+
+    id: UUID
+    subdivision_id: UUID
+    created: datetime
+    count_requests: int
+
+
+class UsageBucket(StrEnum):
+    HOUR = "hour"
+    DAY = "day"
+    MONTH = "month"
+
+
+class UsagePoint(BaseModel):
+    """
+    Requests made in the bucket, which begins at start.
+    """
+
+    start: datetime
+    count_requests: int
+
+    class Config:
+        from_attributes = True
@@ -1,3 +1,4 @@
+from datetime import datetime
 from enum import StrEnum
 from typing import List, Optional
 from uuid import UUID
@@ -40,3 +41,24 @@ class SubdivisionUpdate(BaseModel):
 
 class Subdivision(SubdivisionBase):
     pass
+
+
+class SubdivisionSummary(BaseModel):
+    id: UUID
+    tenant_id: UUID
+    name: str
+    location: str
+    link_to_subdivision_processing_domain: Optional[str] = None
+    work_status: WorkStatus
+    licenses_count: int
+    active_license_id: Optional[UUID] = None
+    active_license_name: Optional[str] = None
+    active_license_type: Optional[str] = None
+    active_license_activated: Optional[datetime] = None
+    active_license_expiration: Optional[datetime] = None
+    limit_requests: Optional[int] = None
+    used_requests: Optional[int] = None
+    refreshed: datetime
+
+    class Config:
+        from_attributes = True
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
@@ -41,3 +42,18 @@ class TenantStored(TenantBase):
 
 class Tenant(TenantStored):
     pass
+
+
+class TenantSummary(BaseModel):
+    id: UUID
+    name: str
+    address: str
+    email: str
+    phone: str
+    subdivisions_count: int
+    active_subdivisions_count: int
+    active_licenses_count: int
+    refreshed: datetime
+
+    class Config:
+        from_attributes = True
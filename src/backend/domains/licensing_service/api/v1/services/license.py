@@ -1,6 +1,8 @@
-from typing import List
+from typing import Optional
 from uuid import UUID
 
+from backend.core.infra.pagination import Page, PageRequest
+
 # --- Application Imports ---
 from ....app.queries.license_queries import LicenseQuery
 
@@ -16,10 +18,17 @@ so its defined in each dependency body.
 # -----Views-----
 
 
-async def get_all_licenses() -> List[License]:
+async def get_all_licenses(
+    page: PageRequest,
+    subdivision_id: Optional[UUID] = None,
+    status: Optional[str] = None,
+    type: Optional[str] = None,
+) -> Page[License]:
     query: LicenseQuery = LicenseQuery()
-    query_results = await query.get_all_licenses()
-    return BaseMapper.list_to_schema(License, query_results)
+    query_result = await query.get_all_licenses(
+        page=page, subdivision_id=subdivision_id, status=status, type=type
+    )
+    return BaseMapper.page_to_schema(License, query_result)
 
 
 async def get_license(id: UUID) -> License:
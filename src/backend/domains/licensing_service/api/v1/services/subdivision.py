@@ -1,34 +1,116 @@
 from datetime import datetime
-from typing import List
+from typing import AsyncIterator, Collection, List, Optional
 from uuid import UUID
 
 # --- Core Imports ---
+from backend.core.infra.export import ExportFormat, export_chunks
+from backend.core.infra.pagination import Page, PageRequest
 from backend.core.messagebus_handler import GlobalMessageBusHandler
 
 from ....app.commands.subdivision_commands import SubdivisionCommandUseCase
+from ....app.commands.usage_accumulator import UsageAccumulator
 
 # --- Application Imports ---
 # from ....app import Subdivision
 from ....app.queries.subdivision_queries import SubdivisionQuery
 from ..schemas.license import LicenseCreate, LicenseUpdate
+from ..schemas.license_usage import (
+    LicenseState,
+    LicenseUsage,
+    LicenseUsageBatch,
+    UsageBatchCreate,
+)
+
+from ..schemas.statictic_row import StatisticRowExport, UsageBucket, UsagePoint
 
 # --- API Imports ---
-from ..schemas.subdivision import Subdivision, SubdivisionCreate, SubdivisionUpdate
+from ..schemas.subdivision import (
+    Subdivision,
+    SubdivisionCreate,
+    SubdivisionSummary,
+    SubdivisionUpdate,
+)
 from ..services.utils import BaseMapper
 
 # ----Views----
 
 
-async def get_subdivision(id: UUID) -> Subdivision:
+async def get_subdivision(
+    id: UUID, include: Optional[Collection[str]] = None
+) -> Subdivision:
     subdivisions_query = SubdivisionQuery()
-    query_result = await subdivisions_query.get_subdivision_by_id(id=id)
+    query_result = await subdivisions_query.get_subdivision_by_id(
+        id=id, include=include
+    )
     return BaseMapper.to_schema(Subdivision, query_result)
 
 
-async def get_all_subdivisions() -> List[Subdivision]:
+async def get_all_subdivisions(
+    page: PageRequest,
+    tenant_id: Optional[UUID] = None,
+    work_status: Optional[str] = None,
+    license_status: Optional[str] = None,
+    include: Optional[Collection[str]] = None,
+) -> Page[Subdivision]:
     subdivisions_views: SubdivisionQuery = SubdivisionQuery()
-    query_results = await subdivisions_views.get_all_subdivisions()
-    return BaseMapper.list_to_schema(Subdivision, query_results)
+    query_result = await subdivisions_views.get_all_subdivisions(
+        page=page,
+        tenant_id=tenant_id,
+        work_status=work_status,
+        license_status=license_status,
+        include=include,
+    )
+    return BaseMapper.page_to_schema(Subdivision, query_result)
+
+
+async def get_license_state(id: UUID) -> LicenseState:
+    subdivisions_query = SubdivisionQuery()
+    query_result = await subdivisions_query.get_license_state(subdivision_id=id)
+    return LicenseState.model_validate(query_result)
+
+
+async def get_subdivision_summary(id: UUID) -> SubdivisionSummary:
+    subdivisions_query = SubdivisionQuery()
+    query_result = await subdivisions_query.get_subdivision_summary(id=id)
+    return SubdivisionSummary.model_validate(query_result)
+
+
+async def get_all_subdivision_summaries(
+    tenant_id: Optional[UUID] = None,
+) -> List[SubdivisionSummary]:
+    subdivisions_query = SubdivisionQuery()
+    query_results = await subdivisions_query.get_all_subdivision_summaries(
+        tenant_id=tenant_id
+    )
+    return [SubdivisionSummary.model_validate(row) for row in query_results]
+
+
+async def export_subdivision_statistics(
+    id: UUID, export_format: ExportFormat
+) -> AsyncIterator[str]:
+    """
+    Returns chunks of the export, 404 is raised here, before they are sent.
+    """
+    subdivisions_query = SubdivisionQuery()
+    batches = await subdivisions_query.export_statistic_rows(subdivision_id=id)
+    return export_chunks(
+        batches,
+        export_format=export_format,
+        columns=list(StatisticRowExport.model_fields),
+    )
+
+
+async def get_subdivision_usage(
+    id: UUID,
+    bucket: UsageBucket,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> List[UsagePoint]:
+    subdivisions_query = SubdivisionQuery()
+    query_results = await subdivisions_query.get_usage(
+        subdivision_id=id, bucket=bucket, start=start, end=end
+    )
+    return [UsagePoint.model_validate(row) for row in query_results]
 
 
 # ----Actions(Commands)
@@ -68,6 +150,40 @@ async def subdivision_add_statistic_row(
     return BaseMapper.to_schema(Subdivision, command_result)
 
 
+async def subdivision_record_usage(
+    subdivision_id: UUID,
+    count_requests: int,
+    messagebus_handler: GlobalMessageBusHandler,
+) -> LicenseUsage:
+    command = SubdivisionCommandUseCase(messagebus_handler=messagebus_handler)
+    command_result = await command.record_usage(
+        subdivision_id=subdivision_id,
+        count_requests=count_requests,
+    )
+    return BaseMapper.to_schema(LicenseUsage, command_result)
+
+
+async def subdivision_buffer_usage(
+    subdivision_id: UUID, count_requests: int, usage_accumulator: UsageAccumulator
+) -> LicenseState:
+    command_result = await usage_accumulator.add(
+        subdivision_id=subdivision_id, count_requests=count_requests
+    )
+    return LicenseState.model_validate(command_result)
+
+
+async def subdivision_add_statistic_rows_batch(
+    batch_data: UsageBatchCreate,
+    messagebus_handler: GlobalMessageBusHandler,
+) -> LicenseUsageBatch:
+    command = SubdivisionCommandUseCase(messagebus_handler=messagebus_handler)
+    command_result = await command.add_statistic_rows_batch(
+        items=[(item.subdivision_id, item.count_requests) for item in batch_data.items],
+        created=datetime.now(),
+    )
+    return BaseMapper.to_schema(LicenseUsageBatch, command_result)
+
+
 async def create_subdivision(
     subdivision_data: SubdivisionCreate, messagebus_handler: GlobalMessageBusHandler
 ) -> Subdivision:
@@ -1,7 +1,10 @@
-from typing import List
+from datetime import datetime
+from typing import AsyncIterator, Collection, List, Optional
 from uuid import UUID
 
 # --- Core Imports ---
+from backend.core.infra.export import ExportFormat, export_chunks
+from backend.core.infra.pagination import Page, PageRequest
 from backend.core.messagebus_handler import GlobalMessageBusHandler
 
 from ....app.commands.tenant_commands import TenantCommandUseCase
@@ -12,7 +15,8 @@ from ....app.queries.tenant_queries import TenantQuery
 from ..schemas.subdivision import Subdivision
 
 # --- API Imports ---
-from ..schemas.tenant import Tenant, TenantCreate, TenantUpdate
+from ..schemas.statictic_row import StatisticRowExport, UsageBucket, UsagePoint
+from ..schemas.tenant import Tenant, TenantCreate, TenantSummary, TenantUpdate
 from ..services.utils import BaseMapper
 
 """
@@ -23,16 +27,63 @@ so its defined in each dependency body.
 # ----Views----
 
 
-async def get_tenant(id: UUID) -> Tenant:
+async def get_tenant(id: UUID, include: Optional[Collection[str]] = None) -> Tenant:
     tenants_views: TenantQuery = TenantQuery()
-    query_result = await tenants_views.get_tenant(tenant_id=id)
+    query_result = await tenants_views.get_tenant(tenant_id=id, include=include)
     return BaseMapper.to_schema(Tenant, query_result)
 
 
-async def get_all_tenants() -> List[Tenant]:
+async def get_all_tenants(
+    page: PageRequest,
+    name: Optional[str] = None,
+    license_status: Optional[str] = None,
+    include: Optional[Collection[str]] = None,
+) -> Page[Tenant]:
     tenants_views: TenantQuery = TenantQuery()
-    query_results = await tenants_views.get_all_tenants()
-    return BaseMapper.list_to_schema(Tenant, query_results)
+    query_result = await tenants_views.get_all_tenants(
+        page=page, name=name, license_status=license_status, include=include
+    )
+    return BaseMapper.page_to_schema(Tenant, query_result)
+
+
+async def get_tenant_summary(id: UUID) -> TenantSummary:
+    tenants_views: TenantQuery = TenantQuery()
+    query_result = await tenants_views.get_tenant_summary(id=id)
+    return TenantSummary.model_validate(query_result)
+
+
+async def get_all_tenant_summaries() -> List[TenantSummary]:
+    tenants_views: TenantQuery = TenantQuery()
+    query_results = await tenants_views.get_all_tenant_summaries()
+    return [TenantSummary.model_validate(row) for row in query_results]
+
+
+async def export_tenant_statistics(
+    id: UUID, export_format: ExportFormat
+) -> AsyncIterator[str]:
+    """
+    Returns chunks of the export, 404 is raised here, before they are sent.
+    """
+    tenants_views: TenantQuery = TenantQuery()
+    batches = await tenants_views.export_statistic_rows(tenant_id=id)
+    return export_chunks(
+        batches,
+        export_format=export_format,
+        columns=list(StatisticRowExport.model_fields),
+    )
+
+
+async def get_tenant_usage(
+    id: UUID,
+    bucket: UsageBucket,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> List[UsagePoint]:
+    tenants_views: TenantQuery = TenantQuery()
+    query_results = await tenants_views.get_usage(
+        tenant_id=id, bucket=bucket, start=start, end=end
+    )
+    return [UsagePoint.model_validate(row) for row in query_results]
 
 
 # ----Actions(Commands)
@@ -1,8 +1,10 @@
 from dataclasses import asdict, fields, is_dataclass
-from typing import Any, List, Type, TypeVar
+from typing import Any, List, Mapping, Type, TypeVar
 
 from pydantic import BaseModel
 
+from backend.core.infra.pagination import Page
+
 T = TypeVar("T", bound=BaseModel)
 
 
@@ -11,8 +13,10 @@ class BaseMapper:
     def to_schema(schema_cls: Type[T], domain_obj: Any) -> T:
         """
         Convert a domain object (dataclass or regular class)
-        into a Pydantic schema.
+        or a read model (mapping) into a Pydantic schema.
         """
+        if isinstance(domain_obj, Mapping):
+            return schema_cls.model_validate(dict(domain_obj))
         if is_dataclass(domain_obj):
             data = {}
             for f in fields(domain_obj):
@@ -57,3 +61,13 @@ class BaseMapper:
         Convert a list of domain objects into a list of Pydantic schemas.
         """
         return [BaseMapper.to_schema(schema_cls, obj) for obj in domain_objs]
+
+    @staticmethod
+    def page_to_schema(schema_cls: Type[T], page: Page[Any]) -> Page[T]:
+        """
+        Convert domain objects of the page into Pydantic schemas.
+        """
+        return Page(
+            items=BaseMapper.list_to_schema(schema_cls, page.items),
+            next_cursor=page.next_cursor,
+        )
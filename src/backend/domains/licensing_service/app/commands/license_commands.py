@@ -19,13 +19,10 @@ class LicenseCommandUseCase:
         self.messagebus_handler = messagebus_handler
 
     async def create_license(self, **kwargs) -> Optional[License]:
-        await self.messagebus_handler.handle(CreateLicenseCommand(**kwargs))
-        return self.messagebus_handler.command_result
+        return await self.messagebus_handler.handle(CreateLicenseCommand(**kwargs))
 
     async def update_license(self, **kwargs) -> License:
-        await self.messagebus_handler.handle(UpdateLicenseCommand(**kwargs))
-        return self.messagebus_handler.command_result
+        return await self.messagebus_handler.handle(UpdateLicenseCommand(**kwargs))
 
     async def delete_license(self, id: UUID) -> License:
-        await self.messagebus_handler.handle(DeleteLicenseCommand(id=id))
-        return self.messagebus_handler.command_result
+        return await self.messagebus_handler.handle(DeleteLicenseCommand(id=id))
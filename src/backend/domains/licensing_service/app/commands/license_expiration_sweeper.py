@@ -0,0 +1,50 @@
+from datetime import datetime
+from typing import Callable, List, Optional
+from uuid import UUID
+
+# ---Core imports---
+from backend.core.messagebus_handler import GlobalMessageBusHandler
+
+# ---Application imports---
+from ..config import license_expiration_config
+from .subdivision_commands import SubdivisionCommandUseCase
+
+
+class LicenseExpirationSweeper:
+    """
+    Deactivates licenses of type by time after their expiration,
+    so they don't stay active till their subdivision is loaded.
+
+    Each sweep, run by the scheduler, finds expired active licenses
+    by the partial index of expiration and deactivates them together
+    with their subdivisions by ExpireLicensesCommand, batch_size
+    licenses per transaction, till no expired license is left.
+    """
+
+    def __init__(
+        self,
+        messagebus_factory: Callable[[], GlobalMessageBusHandler],
+        batch_size: int = license_expiration_config.LICENSE_EXPIRATION_BATCH_SIZE,
+    ) -> None:
+        self._messagebus_factory = messagebus_factory
+        self._batch_size = batch_size
+
+    async def sweep(self, now: Optional[datetime] = None) -> List[UUID]:
+        """
+        Returns ids of deactivated licenses.
+        """
+        now = now or datetime.now()
+        command = SubdivisionCommandUseCase(
+            messagebus_handler=self._messagebus_factory()
+        )
+        expired: List[UUID] = []
+        while True:
+            license_ids = await command.expire_licenses(
+                now=now, batch_size=self._batch_size
+            )
+            expired.extend(license_ids)
+            if len(license_ids) < self._batch_size:
+                break
+        if expired:
+            print(f"Expired licenses deactivated: {len(expired)}")
+        return expired
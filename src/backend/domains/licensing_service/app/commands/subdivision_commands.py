@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Iterable, List, Tuple
 from uuid import UUID
 
 # ---Core imports---
@@ -14,11 +15,16 @@ from ...domain.services.commands.license_commands import (
 from ...domain.services.commands.subdivision_commands import (
     ActivateSubdivisionLicenseCommand,
     AddStatisticRowCommand,
+    AddStatisticRowsBatchCommand,
     CreateSubdivisionCommand,
     DeactivateSubdivisionLicenseCommand,
     DeleteSubdivisionCommand,
+    ExpireLicensesCommand,
+    RecordUsageCommand,
+    StatisticRowsBatchItem,
     UpdateSubdivisionCommand,
 )
+from ...domain.value_objects.license_usage import LicenseUsage, LicenseUsageBatch
 
 
 class SubdivisionCommandUseCase:
@@ -34,45 +40,63 @@ class SubdivisionCommandUseCase:
             subdivision_id=subdivision_id,
             count_requests=count_requests,
         )
-        await self.messagebus_handler.handle(message=command)
-        return self.messagebus_handler.command_result
+        return await self.messagebus_handler.handle(message=command)
+
+    async def record_usage(
+        self, subdivision_id: UUID, count_requests: int
+    ) -> LicenseUsage:
+        command = RecordUsageCommand(
+            subdivision_id=subdivision_id,
+            count_requests=count_requests,
+        )
+        return await self.messagebus_handler.handle(message=command)
+
+    async def add_statistic_rows_batch(
+        self, items: Iterable[Tuple[UUID, int]], created: datetime
+    ) -> LicenseUsageBatch:
+        command = AddStatisticRowsBatchCommand(
+            items=tuple(
+                StatisticRowsBatchItem(
+                    subdivision_id=subdivision_id, count_requests=count_requests
+                )
+                for subdivision_id, count_requests in items
+            ),
+            created=created,
+        )
+        return await self.messagebus_handler.handle(message=command)
+
+    async def expire_licenses(self, now: datetime, batch_size: int) -> List[UUID]:
+        command = ExpireLicensesCommand(now=now, batch_size=batch_size)
+        return await self.messagebus_handler.handle(message=command)
 
     async def active_subdivision_license(self, **kwargs) -> Subdivision:
-        await self.messagebus_handler.handle(
+        return await self.messagebus_handler.handle(
             ActivateSubdivisionLicenseCommand(**kwargs)
         )
-        return self.messagebus_handler.command_result
 
     async def deactive_subdivision_license(self, **kwargs) -> Subdivision:
-        await self.messagebus_handler.handle(
+        return await self.messagebus_handler.handle(
             DeactivateSubdivisionLicenseCommand(**kwargs)
         )
-        return self.messagebus_handler.command_result
 
     async def create_subdivision(self, **kwargs) -> Subdivision:
-        await self.messagebus_handler.handle(CreateSubdivisionCommand(**kwargs))
-        return self.messagebus_handler.command_result
+        return await self.messagebus_handler.handle(CreateSubdivisionCommand(**kwargs))
 
     async def update_subdivision(self, **kwargs) -> Subdivision:
-        await self.messagebus_handler.handle(UpdateSubdivisionCommand(**kwargs))
-        return self.messagebus_handler.command_result
+        return await self.messagebus_handler.handle(UpdateSubdivisionCommand(**kwargs))
 
     async def delete_subdivision(self, id: UUID) -> Subdivision:
-        await self.messagebus_handler.handle(DeleteSubdivisionCommand(id=id))
-        return self.messagebus_handler.command_result
+        return await self.messagebus_handler.handle(DeleteSubdivisionCommand(id=id))
 
     async def subdivision_create_license(self, **kwargs) -> Subdivision:
-        await self.messagebus_handler.handle(CreateLicenseCommand(**kwargs))
-        return self.messagebus_handler.command_result
+        return await self.messagebus_handler.handle(CreateLicenseCommand(**kwargs))
 
     async def subdivision_update_license(self, **kwargs) -> Subdivision:
-        await self.messagebus_handler.handle(UpdateLicenseCommand(**kwargs))
-        return self.messagebus_handler.command_result
+        return await self.messagebus_handler.handle(UpdateLicenseCommand(**kwargs))
 
     async def subdivision_delete_license(
         self, id: UUID, subdivision_id: UUID
     ) -> Subdivision:
-        await self.messagebus_handler.handle(
+        return await self.messagebus_handler.handle(
             DeleteLicenseCommand(id=id, subdivision_id=subdivision_id)
         )
-        return self.messagebus_handler.command_result
@@ -18,15 +18,12 @@ class TenantCommandUseCase:
         self.messagebus_handler = messagebus_handler
 
     async def create_tenant(self, **kwargs) -> Tenant:
-        await self.messagebus_handler.handle(CreateTenantCommand(**kwargs))
-        return self.messagebus_handler.command_result
+        return await self.messagebus_handler.handle(CreateTenantCommand(**kwargs))
 
     async def update_tenant(self, **kwargs) -> Tenant:
         del kwargs["users"]
         del kwargs["subdivisions"]
-        await self.messagebus_handler.handle(UpdateTenantCommand(**kwargs))
-        return self.messagebus_handler.command_result
+        return await self.messagebus_handler.handle(UpdateTenantCommand(**kwargs))
 
     async def delete_tenant(self, id: UUID) -> Tenant:
-        await self.messagebus_handler.handle(DeleteTenantCommand(id=id))
-        return self.messagebus_handler.command_result
+        return await self.messagebus_handler.handle(DeleteTenantCommand(id=id))
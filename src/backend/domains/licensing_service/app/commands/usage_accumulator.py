@@ -0,0 +1,204 @@
+import asyncio
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional
+from uuid import UUID
+
+# ---Core imports---
+from backend.core.messagebus_handler import GlobalMessageBusHandler
+
+# ---Domain imports---
+from ...domain.exceptions.license import LicenseInactiveError
+from ...domain.exceptions.subdivision import SubdivisionInactiveError
+from ...domain.value_objects.license_usage import LicenseState, LicenseUsageBatch
+from ...domain.value_objects.work_status import WorkStatus
+
+# ---Application imports---
+from ..config import usage_accumulator_config
+from .subdivision_commands import SubdivisionCommandUseCase
+
+
+@dataclass
+class _Counter:
+    state: LicenseState
+    # Requests recorded in the database, sent by the running flush
+    # and buffered since it:
+    recorded: int
+    flushing: int = 0
+    pending: int = 0
+
+    @property
+    def used(self) -> int:
+        return self.recorded + self.flushing + self.pending
+
+
+class UsageAccumulator:
+    """
+    Write-behind buffer of usage reports of this process.
+
+    Requests are summed per subdivision and checked against the limit
+    of the active license locally, they are recorded by one
+    AddStatisticRowsBatchCommand every flush_interval seconds or when
+    flush_requests are buffered, one statistic row per subdivision.
+
+    At most max_unrecorded requests are not recorded at any moment,
+    more reports wait for a flush, so a crash loses no more than that.
+    A report, which reaches the limit, is flushed at once, so the license
+    is deactivated and its expiration events are raised immediately.
+    """
+
+    def __init__(
+        self,
+        messagebus_factory: Callable[[], GlobalMessageBusHandler],
+        load_state: Optional[Callable[[UUID], Awaitable[LicenseState]]] = None,
+        flush_interval: float = usage_accumulator_config.USAGE_FLUSH_INTERVAL,
+        flush_requests: int = usage_accumulator_config.USAGE_FLUSH_REQUESTS,
+        max_unrecorded: int = usage_accumulator_config.USAGE_MAX_UNRECORDED_REQUESTS,
+    ) -> None:
+        self._messagebus_factory = messagebus_factory
+        self._load_state = load_state or self._load_license_state
+        self._flush_interval = flush_interval
+        self._flush_requests = flush_requests
+        self._max_unrecorded = max_unrecorded
+        self._counters: Dict[UUID, _Counter] = {}
+        self._pending = 0
+        self._flushing = 0
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    async def _load_license_state(subdivision_id: UUID) -> LicenseState:
+        # Import here, commands do not depend on infrastructure of queries:
+        from ..queries.subdivision_queries import SubdivisionQuery
+
+        return await SubdivisionQuery().get_license_state(subdivision_id=subdivision_id)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    @property
+    def unrecorded(self) -> int:
+        return self._pending + self._flushing
+
+    async def start(self) -> None:
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Records everything, what is buffered.
+        """
+        self._stopping = True
+        self._wakeup.set()
+        if self._task:
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def add(self, subdivision_id: UUID, count_requests: int) -> LicenseState:
+        """
+        Returns state of the license with buffered requests counted.
+        Without started flushing task requests are recorded at once.
+        """
+        while self.unrecorded and self.unrecorded + count_requests > (
+            self._max_unrecorded
+        ):
+            await self.flush()
+
+        counter = self._counters.get(subdivision_id)
+        if counter is None:
+            state = await self._load_state(subdivision_id)
+            # Other report could load it meanwhile:
+            counter = self._counters.get(subdivision_id) or _Counter(
+                state=state, recorded=state.used_requests or 0
+            )
+        state = replace(counter.state, used_requests=counter.used)
+        if not state.licensed:
+            if state.work_status != WorkStatus.ACTIVE:
+                raise SubdivisionInactiveError
+            raise LicenseInactiveError
+        self._counters[subdivision_id] = counter
+        counter.pending += count_requests
+        self._pending += count_requests
+
+        state = replace(counter.state, used_requests=counter.used)
+        if not self.running or not state.licensed:
+            await self.flush()
+        elif self._pending >= self._flush_requests:
+            self._wakeup.set()
+        return state
+
+    async def flush(self) -> Optional[LicenseUsageBatch]:
+        """
+        Records buffered requests. Requests of failed flush stay
+        in the buffer and are sent by the next one.
+        """
+        async with self._flush_lock:
+            items = []
+            for subdivision_id, counter in list(self._counters.items()):
+                if not counter.pending:
+                    # Idle since the last flush, state is reloaded on next report:
+                    if not counter.flushing:
+                        del self._counters[subdivision_id]
+                    continue
+                counter.flushing, counter.pending = counter.pending, 0
+                items.append((subdivision_id, counter.flushing))
+            if not items:
+                return None
+            self._flushing, self._pending = self._pending, 0
+
+            command = SubdivisionCommandUseCase(
+                messagebus_handler=self._messagebus_factory()
+            )
+            try:
+                result: LicenseUsageBatch = await command.add_statistic_rows_batch(
+                    items=items, created=datetime.now()
+                )
+            except Exception:
+                for subdivision_id, _ in items:
+                    counter = self._counters[subdivision_id]
+                    counter.pending += counter.flushing
+                    counter.flushing = 0
+                self._pending += self._flushing
+                self._flushing = 0
+                raise
+
+            self._flushing = 0
+            for usage in result.accepted:
+                counter = self._counters[usage.subdivision_id]
+                counter.recorded = usage.used_requests
+                counter.flushing = 0
+                if not usage.license_active:
+                    self._deactivate(usage.subdivision_id)
+            for usage in result.rejected:
+                print(
+                    f"Error: buffered usage of subdivision {usage.subdivision_id} "
+                    f"is rejected: {usage.reason}"
+                )
+                self._counters[usage.subdivision_id].flushing = 0
+                self._deactivate(usage.subdivision_id)
+            return result
+
+    def _deactivate(self, subdivision_id: UUID) -> None:
+        """
+        Next reports of the subdivision are rejected, till it's idle
+        and its state is reloaded. Requests buffered meanwhile are still
+        sent, the database rejects or records them.
+        """
+        counter = self._counters[subdivision_id]
+        counter.state = replace(counter.state, license_id=None)
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as err:
+                print(f"Error: usage accumulator flush: {err!r}")
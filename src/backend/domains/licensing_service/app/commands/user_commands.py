@@ -12,5 +12,4 @@ class UserCommandUseCase:
         self.messagebus_handler = messagebus_handler
 
     async def create_user(self, **kwargs) -> User:
-        await self.messagebus_handler.handle(CreateUserCommand(**kwargs))
-        return self.messagebus_handler.command_result
+        return await self.messagebus_handler.handle(CreateUserCommand(**kwargs))
@@ -0,0 +1,57 @@
+from pydantic_settings import BaseSettings
+
+
+class UsageAccumulatorConfig(BaseSettings):
+    # Buffered usage is flushed every interval or when this number
+    # of requests is buffered:
+    USAGE_FLUSH_INTERVAL: float = 1.0
+    USAGE_FLUSH_REQUESTS: int = 1000
+    # Not recorded requests, which can be lost on crash, at most:
+    USAGE_MAX_UNRECORDED_REQUESTS: int = 10000
+
+
+usage_accumulator_config: UsageAccumulatorConfig = UsageAccumulatorConfig()
+
+
+class StatisticPartitionConfig(BaseSettings):
+    # Monthly partitions of statistic rows are created this number
+    # of months ahead:
+    STATISTIC_PARTITIONS_AHEAD: int = 2
+    # Full months of statistic rows kept besides the current one,
+    # older ones are rolled up and dropped:
+    STATISTIC_RETENTION_MONTHS: int = 12
+    # Cron schedule of the partition maintenance:
+    STATISTIC_PARTITIONS_SCHEDULE: str = "15 2 * * *"
+
+
+statistic_partition_config: StatisticPartitionConfig = StatisticPartitionConfig()
+
+
+class LicenseCountersConfig(BaseSettings):
+    # Cron schedule of the reconciliation of license counters:
+    LICENSE_COUNTERS_SCHEDULE: str = "45 2 * * *"
+
+
+license_counters_config: LicenseCountersConfig = LicenseCountersConfig()
+
+
+class LicenseExpirationConfig(BaseSettings):
+    # Expired licenses are looked for every interval, seconds:
+    LICENSE_EXPIRATION_INTERVAL: float = 60.0
+    # Licenses deactivated by one transaction at most:
+    LICENSE_EXPIRATION_BATCH_SIZE: int = 500
+
+
+license_expiration_config: LicenseExpirationConfig = LicenseExpirationConfig()
+
+
+class OutboxPurgeConfig(BaseSettings):
+    # Sent outbox messages are kept this number of days, then deleted:
+    OUTBOX_RETENTION_DAYS: float = 7.0
+    # Messages deleted by one transaction at most:
+    OUTBOX_PURGE_BATCH_SIZE: int = 5000
+    # Cron schedule of the purge of sent messages:
+    OUTBOX_PURGE_SCHEDULE: str = "30 * * * *"
+
+
+outbox_purge_config: OutboxPurgeConfig = OutboxPurgeConfig()
@@ -0,0 +1,22 @@
+import asyncio
+from typing import Dict, List
+
+from ..services.subdivision_services import SubdivisionService
+
+
+async def reconcile_license_counters(fix: bool = True) -> List[Dict]:
+    """
+    Compares request counters of active licenses with statistic rows
+    and reports drift. Fixes counters, if fix is True.
+    """
+    subdivision_service = SubdivisionService()
+    drifts = await subdivision_service.reconcile_license_counters(fix=fix)
+    print(f"Licenses with counter drift: {len(drifts)}")
+    return drifts
+
+
+if __name__ == "__main__":
+    from ...infra.adapters.orm import start_mappers
+
+    start_mappers()
+    asyncio.run(reconcile_license_counters())
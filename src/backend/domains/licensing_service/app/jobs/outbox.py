@@ -0,0 +1,18 @@
+import asyncio
+
+from ..services.outbox_services import OutboxService
+
+
+async def purge_outbox() -> int:
+    """
+    Deletes messages, which were sent to the broker
+    more than OUTBOX_RETENTION_DAYS ago.
+    """
+    outbox_service = OutboxService()
+    purged = await outbox_service.purge_sent()
+    print(f"Sent outbox messages purged: {purged}")
+    return purged
+
+
+if __name__ == "__main__":
+    asyncio.run(purge_outbox())
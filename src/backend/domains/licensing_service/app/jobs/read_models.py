@@ -0,0 +1,17 @@
+import asyncio
+
+from ..services.read_model_services import ReadModelService
+
+
+async def rebuild_read_models() -> None:
+    """
+    Fills read models of subdivisions and tenants from the aggregates.
+    Needed once for data, which was stored before read models existed.
+    """
+    read_model_service = ReadModelService()
+    await read_model_service.rebuild()
+    print("Read models are rebuilt")
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_read_models())
@@ -0,0 +1,65 @@
+from typing import List
+
+from backend.core.infra.scheduling import CronSchedule, IntervalSchedule, Job
+
+from ..commands.license_expiration_sweeper import LicenseExpirationSweeper
+from ..config import (
+    license_counters_config,
+    license_expiration_config,
+    outbox_purge_config,
+    statistic_partition_config,
+)
+from .license_counters import reconcile_license_counters
+from .outbox import purge_outbox
+from .statistic_partitions import maintain_statistic_partitions
+
+# Seconds, by which daily jobs are spread at random:
+DAILY_JOBS_JITTER = 300.0
+
+
+def make_scheduled_jobs(
+    license_expiration_sweeper: LicenseExpirationSweeper,
+) -> List[Job]:
+    """
+    Periodic jobs of the domain. They return numbers of processed rows,
+    which are recorded with their runs.
+    """
+
+    async def sweep_expired_licenses() -> int:
+        return len(await license_expiration_sweeper.sweep())
+
+    async def maintain_partitions() -> int:
+        result = await maintain_statistic_partitions()
+        return len(result["created"]) + len(result["dropped"])
+
+    async def reconcile_counters() -> int:
+        return len(await reconcile_license_counters())
+
+    return [
+        Job(
+            name="licensing_service.expire_licenses",
+            func=sweep_expired_licenses,
+            schedule=IntervalSchedule(
+                license_expiration_config.LICENSE_EXPIRATION_INTERVAL
+            ),
+        ),
+        Job(
+            name="licensing_service.maintain_statistic_partitions",
+            func=maintain_partitions,
+            schedule=CronSchedule(
+                statistic_partition_config.STATISTIC_PARTITIONS_SCHEDULE
+            ),
+            jitter=DAILY_JOBS_JITTER,
+        ),
+        Job(
+            name="licensing_service.reconcile_license_counters",
+            func=reconcile_counters,
+            schedule=CronSchedule(license_counters_config.LICENSE_COUNTERS_SCHEDULE),
+            jitter=DAILY_JOBS_JITTER,
+        ),
+        Job(
+            name="licensing_service.purge_outbox",
+            func=purge_outbox,
+            schedule=CronSchedule(outbox_purge_config.OUTBOX_PURGE_SCHEDULE),
+        ),
+    ]
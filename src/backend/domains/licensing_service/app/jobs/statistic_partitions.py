@@ -0,0 +1,23 @@
+import asyncio
+from typing import Dict, List
+
+from ..services.statistic_partition_services import StatisticPartitionService
+
+
+async def maintain_statistic_partitions() -> Dict[str, List]:
+    """
+    Creates partitions of statistic rows for the next months,
+    rolls up and drops partitions older than the retention.
+    Should be run at least monthly.
+    """
+    statistic_partition_service = StatisticPartitionService()
+    result = await statistic_partition_service.maintain()
+    print(
+        f"Statistic partitions created: {len(result['created'])}, "
+        f"dropped: {len(result['dropped'])}"
+    )
+    return result
+
+
+if __name__ == "__main__":
+    asyncio.run(maintain_statistic_partitions())
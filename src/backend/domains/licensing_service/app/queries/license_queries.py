@@ -1,6 +1,8 @@
 from typing import List, Optional
 from uuid import UUID
 
+from backend.core.infra.pagination import Page, PageRequest, make_page
+
 # ---Domain imports---
 from ...domain.aggregates.entities.license import License
 from ...domain.exceptions.license import LicenseNotFoundError
@@ -25,10 +27,18 @@ class LicenseQuery:
                 raise LicenseNotFoundError
         return license
 
-    async def get_all_licenses(self) -> List[License]:
+    async def get_all_licenses(
+        self,
+        page: PageRequest,
+        subdivision_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        type: Optional[str] = None,
+    ) -> Page[License]:
         async with self._uow as uow:
-            licenses: List[License] = await uow.licenses.list()
-            return licenses
+            licenses: List[License] = await uow.licenses.list(
+                page=page, subdivision_id=subdivision_id, status=status, type=type
+            )
+            return make_page(licenses, page)
 
     async def get_license_by_status(self, status: str) -> License:
         async with self._uow as uow:
@@ -1,18 +1,75 @@
-from typing import List, Optional
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, AsyncIterator, Collection, Dict, List, Optional, Sequence
 from uuid import UUID
 
+from sqlalchemy import Row, RowMapping
+
+from backend.core.config import cache_config
+from backend.core.infra.cache import TTLCache
+from backend.core.infra.pagination import Page, PageRequest, make_page
+
 from ...domain.aggregates.subdivision import Subdivision
 from ...domain.exceptions.subdivision import SubdivisionNotFoundError
 
 # ---Domain imports---
 from ...domain.services.uow.subdivision_uow import SubdivisionUnitOfWork
+from ...domain.value_objects.license_usage import LicenseState
+from ...domain.value_objects.usage_bucket import UsageBucket
 
 # ---Infrastructure imports---
+from ...infra.repos.sqlalchemy.read_model_repo import SQLAlchemyReadModelRepository
+from ...infra.uow.sqlalchemy.read_model_uow import SQLAlchemyReadModelUnitOfWork
 from ...infra.uow.sqlalchemy.subdivision_uow import SQLAlchemySubdivisionUnitOfWork
 
 # ---Application imports---
 from ..services.subdivision_services import SubdivisionService
 
+# License states of subdivisions, entries are invalidated by handlers
+# of license and subdivision events (license_status_cache_handlers):
+license_state_cache: TTLCache[LicenseState] = TTLCache(
+    maxsize=cache_config.CACHE_MAXSIZE, ttl=cache_config.CACHE_TTL
+)
+
+# Fields of subdivision, which are read from its summary:
+SUBDIVISION_FIELDS = (
+    "id",
+    "tenant_id",
+    "name",
+    "location",
+    "link_to_subdivision_processing_domain",
+    "work_status",
+)
+
+
+async def read_subdivisions(
+    read_models: SQLAlchemyReadModelRepository,
+    summaries: Sequence[Row],
+    include: Optional[Collection[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Subdivisions made from their summaries, relations in include
+    are read with one query each for all subdivisions, None - all.
+    Not included relations are empty, as if they were not loaded.
+    """
+    relations: Dict[str, Dict[UUID, List[Dict[str, Any]]]] = {}
+    subdivision_ids = [summary.id for summary in summaries]
+    for relation, read in (
+        ("licenses", read_models.list_licenses),
+        ("statistics", read_models.list_statistic_rows),
+    ):
+        relations[relation] = defaultdict(list)
+        if subdivision_ids and (include is None or relation in include):
+            for row in await read(subdivision_ids=subdivision_ids):
+                relations[relation][row.subdivision_id].append(dict(row._mapping))
+    return [
+        {
+            **{field: summary._mapping[field] for field in SUBDIVISION_FIELDS},
+            **{relation: rows[summary.id] for relation, rows in relations.items()},
+        }
+        for summary in summaries
+    ]
+
 
 class SubdivisionQuery:
     """
@@ -20,15 +77,38 @@ class SubdivisionQuery:
     It's in CQRS paradigme
     """
 
-    def __init__(self) -> None:
-        self._uow: SubdivisionUnitOfWork = SQLAlchemySubdivisionUnitOfWork()
+    def __init__(self, db_session_factory: Any | None = None) -> None:
+        if db_session_factory:
+            self._uow: SubdivisionUnitOfWork = SQLAlchemySubdivisionUnitOfWork(
+                session_factory=db_session_factory
+            )
+            self._read_model_uow: SQLAlchemyReadModelUnitOfWork = (
+                SQLAlchemyReadModelUnitOfWork(session_factory=db_session_factory)
+            )
+        else:
+            self._uow: SubdivisionUnitOfWork = SQLAlchemySubdivisionUnitOfWork()
+            self._read_model_uow: SQLAlchemyReadModelUnitOfWork = (
+                SQLAlchemyReadModelUnitOfWork()
+            )
 
-    async def get_subdivision_by_id(self, id: UUID) -> Subdivision:
-        async with self._uow as uow:
-            subdivision: Optional[Subdivision] = await uow.subdivisions.get(id=id)
-            if not subdivision:
+    async def get_subdivision_by_id(
+        self, id: UUID, include: Optional[Collection[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Reads the read model and rows of included relations,
+        the aggregate is not loaded.
+        include: relations of subdivision to read, None - all.
+        """
+        async with self._read_model_uow as uow:
+            summary: Optional[Row] = await uow.read_models.get_subdivision_summary(
+                subdivision_id=id
+            )
+            if not summary:
                 raise SubdivisionNotFoundError
-        return subdivision
+            subdivisions = await read_subdivisions(
+                uow.read_models, [summary], include=include
+            )
+        return subdivisions[0]
 
     async def get_subdivision(self, subdivision_id: UUID) -> Subdivision:
         subdivisions_service: SubdivisionService = SubdivisionService()
@@ -37,9 +117,106 @@ class SubdivisionQuery:
         )
         return subdivision
 
-    async def get_all_subdivisions(self) -> List[Subdivision]:
-        subdivisions_service: SubdivisionService = SubdivisionService()
-        subdivisions: List[Subdivision] = (
-            await subdivisions_service.get_all_subdivisions()
+    async def get_all_subdivisions(
+        self,
+        page: PageRequest,
+        tenant_id: Optional[UUID] = None,
+        work_status: Optional[str] = None,
+        license_status: Optional[str] = None,
+        include: Optional[Collection[str]] = None,
+    ) -> Page[Dict[str, Any]]:
+        """
+        Reads one page of read models and rows of included relations.
+        """
+        async with self._read_model_uow as uow:
+            summaries = await uow.read_models.list_subdivision_summaries(
+                page=page,
+                tenant_id=tenant_id,
+                work_status=work_status,
+                license_status=license_status,
+            )
+            summaries_page: Page[Row] = make_page(summaries, page)
+            subdivisions = await read_subdivisions(
+                uow.read_models, summaries_page.items, include=include
+            )
+        return Page(items=subdivisions, next_cursor=summaries_page.next_cursor)
+
+    async def get_subdivision_summary(self, id: UUID) -> Row:
+        """
+        Reads one row of the read model, the aggregate is not loaded.
+        """
+        async with self._read_model_uow as uow:
+            summary: Optional[Row] = await uow.read_models.get_subdivision_summary(
+                subdivision_id=id
+            )
+            if not summary:
+                raise SubdivisionNotFoundError
+        return summary
+
+    async def get_all_subdivision_summaries(
+        self, tenant_id: Optional[UUID] = None
+    ) -> Sequence[Row]:
+        async with self._read_model_uow as uow:
+            return await uow.read_models.list_subdivision_summaries(
+                tenant_id=tenant_id
+            )
+
+    async def export_statistic_rows(
+        self, subdivision_id: UUID
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        """
+        Subdivision is checked here, before the response is started,
+        rows are read only when the returned iterator is consumed.
+        """
+        await self.get_subdivision_by_id(id=subdivision_id, include=())
+        return self._stream_statistic_rows(subdivision_id=subdivision_id)
+
+    async def _stream_statistic_rows(
+        self, subdivision_id: UUID
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        async with self._read_model_uow as uow:
+            async for rows in uow.statistic_rows.stream(subdivision_id=subdivision_id):
+                yield rows
+
+    async def get_usage(
+        self,
+        subdivision_id: UUID,
+        bucket: UsageBucket,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Sequence[Row]:
+        """
+        Requests of the subdivision summed by buckets in the database.
+        """
+        await self.get_subdivision_by_id(id=subdivision_id, include=())
+        async with self._read_model_uow as uow:
+            return await uow.usage.get_usage(
+                bucket=UsageBucket(bucket),
+                subdivision_id=subdivision_id,
+                start=start,
+                end=end,
+            )
+
+    async def get_license_state(self, subdivision_id: UUID) -> LicenseState:
+        """
+        Served from license_state_cache, the database is read on a miss only.
+        Used requests of a cached state can be behind by ttl,
+        the limit itself is checked when usage is recorded.
+        """
+        state: Optional[LicenseState] = await license_state_cache.get_or_load(
+            subdivision_id, lambda: self._load_license_state(subdivision_id)
         )
-        return subdivisions
+        if not state:
+            raise SubdivisionNotFoundError
+        return state
+
+    async def _load_license_state(self, subdivision_id: UUID) -> Optional[LicenseState]:
+        async with self._read_model_uow as uow:
+            row: Optional[Row] = await uow.read_models.get_license_state(
+                subdivision_id=subdivision_id
+            )
+        return LicenseState(**row._mapping) if row else None
+
+    @staticmethod
+    def invalidate_license_state(subdivision_id: UUID) -> None:
+        license_state_cache.invalidate(subdivision_id)
@@ -1,17 +1,79 @@
-from typing import List, Optional
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, AsyncIterator, Collection, Dict, List, Optional, Sequence
 from uuid import UUID
 
+from sqlalchemy import Row, RowMapping
+
+from backend.core.infra.pagination import Page, PageRequest, make_page
+
 from ...domain.aggregates.tenant import Tenant
 from ...domain.exceptions.tenant import TenantNotFoundError
 
 # ---Domain imports---
 from ...domain.services.uow.tenant_uow import TenantUnitOfWork
+from ...domain.value_objects.usage_bucket import UsageBucket
 
 # ---Infrastructure imports---
+from ...infra.repos.sqlalchemy.read_model_repo import SQLAlchemyReadModelRepository
+from ...infra.uow.sqlalchemy.read_model_uow import SQLAlchemyReadModelUnitOfWork
 from ...infra.uow.sqlalchemy.tenant_uow import SQLAlchemyTenantUnitOfWork as UOW
 
 # ---Application imports---
-from ..services.tenant_services import TenantService
+from .subdivision_queries import read_subdivisions
+
+# Fields of tenant, which are read from its summary:
+TENANT_FIELDS = ("id", "name", "address", "email", "phone")
+# Relations of tenant, None in include means all of them:
+TENANT_RELATIONS = (
+    "users",
+    "subdivisions",
+    "subdivisions.licenses",
+    "subdivisions.statistics",
+)
+
+
+async def read_tenants(
+    read_models: SQLAlchemyReadModelRepository,
+    summaries: Sequence[Row],
+    include: Optional[Collection[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Tenants made from their summaries, relations in include
+    are read with one query each for all tenants.
+    Not included relations are empty, as if they were not loaded.
+    """
+    if include is None:
+        include = TENANT_RELATIONS
+    tenant_ids = [summary.id for summary in summaries]
+    users: Dict[UUID, List[Dict[str, Any]]] = defaultdict(list)
+    if tenant_ids and "users" in include:
+        for row in await read_models.list_users(tenant_ids=tenant_ids):
+            users[row.tenant_id].append(dict(row._mapping))
+    subdivisions: Dict[UUID, List[Dict[str, Any]]] = defaultdict(list)
+    if tenant_ids and "subdivisions" in include:
+        subdivision_summaries = (
+            await read_models.list_subdivision_summaries_of_tenants(
+                tenant_ids=tenant_ids
+            )
+        )
+        subdivision_include = {
+            relation.removeprefix("subdivisions.")
+            for relation in include
+            if relation.startswith("subdivisions.")
+        }
+        for subdivision in await read_subdivisions(
+            read_models, subdivision_summaries, include=subdivision_include
+        ):
+            subdivisions[subdivision["tenant_id"]].append(subdivision)
+    return [
+        {
+            **{field: summary._mapping[field] for field in TENANT_FIELDS},
+            "users": users[summary.id],
+            "subdivisions": subdivisions[summary.id],
+        }
+        for summary in summaries
+    ]
 
 
 class TenantQuery:
@@ -20,8 +82,17 @@ class TenantQuery:
     It's in CQRS paradigme
     """
 
-    def __init__(self) -> None:
-        self._uow: TenantUnitOfWork = UOW()
+    def __init__(self, db_session_factory: Any | None = None) -> None:
+        if db_session_factory:
+            self._uow: TenantUnitOfWork = UOW(session_factory=db_session_factory)
+            self._read_model_uow: SQLAlchemyReadModelUnitOfWork = (
+                SQLAlchemyReadModelUnitOfWork(session_factory=db_session_factory)
+            )
+        else:
+            self._uow: TenantUnitOfWork = UOW()
+            self._read_model_uow: SQLAlchemyReadModelUnitOfWork = (
+                SQLAlchemyReadModelUnitOfWork()
+            )
 
     async def get_tenant_by_id(self, id: UUID) -> Tenant:
         async with self._uow as uow:
@@ -32,12 +103,89 @@ class TenantQuery:
             tenant = Tenant(tenant=tenant, users=users)
             return tenant
 
-    async def get_tenant(self, tenant_id: UUID) -> Tenant:
-        tenants_service: TenantService = TenantService()
-        tenant: Tenant = await tenants_service.get_tenant_by_id(id=tenant_id)
-        return tenant
+    async def get_tenant(
+        self, tenant_id: UUID, include: Optional[Collection[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Reads the read models and rows of included relations,
+        the aggregate is not loaded.
+        include: relations of tenant to read, None - all.
+        """
+        async with self._read_model_uow as uow:
+            summary: Optional[Row] = await uow.read_models.get_tenant_summary(
+                tenant_id=tenant_id
+            )
+            if not summary:
+                raise TenantNotFoundError
+            tenants = await read_tenants(uow.read_models, [summary], include=include)
+        return tenants[0]
+
+    async def get_all_tenants(
+        self,
+        page: PageRequest,
+        name: Optional[str] = None,
+        license_status: Optional[str] = None,
+        include: Optional[Collection[str]] = None,
+    ) -> Page[Dict[str, Any]]:
+        """
+        Reads one page of read models and rows of included relations.
+        """
+        async with self._read_model_uow as uow:
+            summaries = await uow.read_models.list_tenant_summaries(
+                page=page, name=name, license_status=license_status
+            )
+            summaries_page: Page[Row] = make_page(summaries, page)
+            tenants = await read_tenants(
+                uow.read_models, summaries_page.items, include=include
+            )
+        return Page(items=tenants, next_cursor=summaries_page.next_cursor)
+
+    async def get_tenant_summary(self, id: UUID) -> Row:
+        """
+        Reads one row of the read model, the aggregate is not loaded.
+        """
+        async with self._read_model_uow as uow:
+            summary: Optional[Row] = await uow.read_models.get_tenant_summary(
+                tenant_id=id
+            )
+            if not summary:
+                raise TenantNotFoundError
+        return summary
+
+    async def get_all_tenant_summaries(self) -> Sequence[Row]:
+        async with self._read_model_uow as uow:
+            return await uow.read_models.list_tenant_summaries()
+
+    async def export_statistic_rows(
+        self, tenant_id: UUID
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        """
+        Statistic rows of all subdivisions of the tenant,
+        tenant is checked before the response is started.
+        """
+        await self.get_tenant(tenant_id=tenant_id, include=())
+        return self._stream_statistic_rows(tenant_id=tenant_id)
+
+    async def _stream_statistic_rows(
+        self, tenant_id: UUID
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        async with self._read_model_uow as uow:
+            async for rows in uow.statistic_rows.stream(tenant_id=tenant_id):
+                yield rows
 
-    async def get_all_tenants(self) -> List[Tenant]:
-        tenants_service: TenantService = TenantService()
-        tenants: List[Tenant] = await tenants_service.get_all_tenants()
-        return tenants
+    async def get_usage(
+        self,
+        tenant_id: UUID,
+        bucket: UsageBucket,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Sequence[Row]:
+        """
+        Requests of all subdivisions of the tenant summed by buckets
+        with one query.
+        """
+        await self.get_tenant(tenant_id=tenant_id, include=())
+        async with self._read_model_uow as uow:
+            return await uow.usage.get_usage(
+                bucket=UsageBucket(bucket), tenant_id=tenant_id, start=start, end=end
+            )
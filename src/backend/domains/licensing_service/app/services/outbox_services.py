@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+# ---Infrastructure imports---
+from ...infra.uow.sqlalchemy.outbox_uow import SQLAlchemyOutboxUnitOfWork as UOW
+
+# ---Application imports---
+from ..config import outbox_purge_config
+
+
+class OutboxService:
+    """
+    Keeps the outbox table small: messages, which were sent
+    to the broker, are deleted after the retention.
+    """
+
+    def __init__(
+        self,
+        db_session_factory: Any | None = None,
+        retention_days: float = outbox_purge_config.OUTBOX_RETENTION_DAYS,
+        batch_size: int = outbox_purge_config.OUTBOX_PURGE_BATCH_SIZE,
+    ) -> None:
+        if db_session_factory:
+            self._uow: UOW = UOW(session_factory=db_session_factory)
+        else:
+            self._uow: UOW = UOW()
+        self._retention = timedelta(days=retention_days)
+        self._batch_size = batch_size
+
+    async def purge_sent(self, now: Optional[datetime] = None) -> int:
+        """
+        Deletes sent messages older than the retention by batches,
+        each in its own transaction, so locks and WAL of one
+        transaction stay bounded. Returns number of deleted messages.
+        """
+        sent_before = (now or datetime.now()) - self._retention
+        purged = 0
+        while True:
+            async with self._uow as uow:
+                deleted = await uow.outbox.purge_sent(
+                    sent_before=sent_before, limit=self._batch_size
+                )
+                await uow.commit()
+            purged += deleted
+            if deleted < self._batch_size:
+                return purged
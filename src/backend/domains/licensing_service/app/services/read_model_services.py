@@ -0,0 +1,45 @@
+from typing import Any, Optional
+from uuid import UUID
+
+# ---Infrastructure imports---
+from ...infra.uow.sqlalchemy.read_model_uow import (
+    SQLAlchemyReadModelUnitOfWork as UOW,
+)
+
+
+class ReadModelService:
+    """
+    Keeps read models of subdivisions and tenants (CQRS)
+    up to date with the aggregates.
+    Read models are refreshed from the stored aggregates and not from
+    the event data, so handling the same event twice is harmless.
+    """
+
+    def __init__(self, db_session_factory: Any | None = None) -> None:
+        if db_session_factory:
+            self._uow: UOW = UOW(session_factory=db_session_factory)
+        else:
+            self._uow: UOW = UOW()
+
+    async def refresh_subdivision(self, subdivision_id: UUID) -> None:
+        """
+        Also refreshes the tenant, which counts
+        subdivisions and their active licenses.
+        """
+        async with self._uow as uow:
+            tenant_id: Optional[UUID] = await uow.read_models.refresh_subdivision(
+                subdivision_id=subdivision_id
+            )
+            if tenant_id:
+                await uow.read_models.refresh_tenant(tenant_id=tenant_id)
+            await uow.commit()
+
+    async def refresh_tenant(self, tenant_id: UUID) -> None:
+        async with self._uow as uow:
+            await uow.read_models.refresh_tenant(tenant_id=tenant_id)
+            await uow.commit()
+
+    async def rebuild(self) -> None:
+        async with self._uow as uow:
+            await uow.read_models.rebuild()
+            await uow.commit()
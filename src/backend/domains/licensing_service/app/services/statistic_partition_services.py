@@ -0,0 +1,62 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# ---Core imports---
+from backend.core.infra.database.partitions import months_to_create, months_to_drop
+
+# ---Infrastructure imports---
+from ...infra.uow.sqlalchemy.statistic_partition_uow import (
+    SQLAlchemyStatisticPartitionUnitOfWork as UOW,
+)
+
+# ---Application imports---
+from ..config import statistic_partition_config
+
+
+class StatisticPartitionService:
+    """
+    Keeps monthly partitions of statistic rows: creates them ahead
+    and replaces months older than the retention with daily and monthly
+    rollups, so requests since a moment are still counted
+    (see statistic_usage_source).
+    """
+
+    def __init__(
+        self,
+        db_session_factory: Any | None = None,
+        ahead: int = statistic_partition_config.STATISTIC_PARTITIONS_AHEAD,
+        retention: int = statistic_partition_config.STATISTIC_RETENTION_MONTHS,
+    ) -> None:
+        if db_session_factory:
+            self._uow: UOW = UOW(session_factory=db_session_factory)
+        else:
+            self._uow: UOW = UOW()
+        self._ahead = ahead
+        self._retention = retention
+
+    async def maintain(self, now: Optional[datetime] = None) -> Dict[str, List]:
+        """
+        Returns months of created and dropped partitions.
+        """
+        now = now or datetime.now()
+        async with self._uow as uow:
+            partitions = uow.statistic_partitions
+            existing = await partitions.get_partition_months()
+            # Rows of months without partition are moved to their partitions:
+            created = sorted(
+                set(await partitions.get_default_partition_months())
+                | set(months_to_create(existing, now=now, ahead=self._ahead))
+            )
+            for month in created:
+                await partitions.create_partition(month)
+            await uow.commit()
+
+        dropped = months_to_drop(existing + created, now=now, retention=self._retention)
+        if dropped:
+            async with self._uow as uow:
+                partitions = uow.statistic_partitions
+                for month in dropped:
+                    await partitions.roll_up_partition(month)
+                    await partitions.drop_partition(month)
+                await uow.commit()
+        return {"created": created, "dropped": dropped}
@@ -1,12 +1,19 @@
-from typing import Any, List, Optional
-from uuid import UUID
+from datetime import datetime
+from typing import Any, Collection, Dict, List, Optional
+from uuid import UUID, uuid4
+
+from backend.core.infra.pagination import PageRequest
 
 from ...domain.aggregates.entities.license import License
 from ...domain.aggregates.entities.stat_row import StatisticRow
 
 # ---Domain imports---
 from ...domain.aggregates.subdivision import Subdivision
-from ...domain.exceptions.subdivision import SubdivisionNotFoundError
+from ...domain.exceptions.license import LicenseInactiveError
+from ...domain.exceptions.subdivision import (
+    SubdivisionInactiveError,
+    SubdivisionNotFoundError,
+)
 from ...domain.services.commands.license_commands import (
     CreateLicenseCommand,
     DeleteLicenseCommand,
@@ -14,7 +21,10 @@ from ...domain.services.commands.license_commands import (
 )
 from ...domain.services.commands.subdivision_commands import (
     AddStatisticRowCommand,
+    AddStatisticRowsBatchCommand,
     CreateSubdivisionCommand,
+    ExpireLicensesCommand,
+    RecordUsageCommand,
     UpdateSubdivisionCommand,
 )
 from ...domain.services.domain_event_bus import DomainEventBus
@@ -32,6 +42,13 @@ from ...domain.services.events.subdivision_events import (
     SubdivisionUpdatedEvent,
 )
 from ...domain.services.uow.subdivision_uow import SubdivisionUnitOfWork
+from ...domain.value_objects.license_status import LicenseStatus
+from ...domain.value_objects.license_usage import (
+    LicenseUsage,
+    LicenseUsageBatch,
+    RejectedUsage,
+)
+from ...domain.value_objects.work_status import WorkStatus
 
 # ---Infrastructure imports---
 from ...infra.uow.sqlalchemy.subdivision_uow import (
@@ -70,12 +87,12 @@ class SubdivisionService:
                 license = list(
                     filter(lambda x: x.id == license_id, subdivision.licenses)
                 )[0]
+            event = LicenseActivatedEvent(**await license.to_dict())
+            await uow.add_event(event)
             await uow.commit()
 
             if self._infra_event_bus:
-                self._infra_event_bus.add_event(
-                    LicenseActivatedEvent(**await license.to_dict())
-                )
+                self._infra_event_bus.add_event(event)
             return subdivision
 
     async def deactivate_subdivision_license(
@@ -89,39 +106,40 @@ class SubdivisionService:
                 license = list(
                     filter(lambda x: x.id == license_id, subdivision.licenses)
                 )[0]
+            event = LicenseDeactivatedEvent(**await license.to_dict())
+            await uow.add_event(event)
             await uow.commit()
             if self._infra_event_bus:
-                self._infra_event_bus.add_event(
-                    LicenseDeactivatedEvent(**await license.to_dict())
-                )
+                self._infra_event_bus.add_event(event)
             return subdivision
 
+    # Changes are made on the aggregate loaded once in the unit of work,
+    # the session flushes only what was changed and the aggregate
+    # is returned as it was commited, without reload.
+
     async def add_license(
         self, add_license_command: CreateLicenseCommand
     ) -> Optional[Subdivision]:
         async with self._uow as uow:
-            subdivision = await self.get_subdivision_by_id(
+            subdivision = await uow.subdivisions.get(
                 id=add_license_command.subdivision_id
             )
             if not subdivision:
                 raise SubdivisionNotFoundError
             license = subdivision.add_license(**await add_license_command.to_dict())
             await uow.subdivisions.save(subdivision)
+            event = LicenseCreatedEvent(**await license.to_dict())
+            await uow.add_event(event)
             await uow.commit()
-            subdivision = await self.get_subdivision_by_id(
-                id=add_license_command.subdivision_id
-            )
             if self._infra_event_bus:
-                self._infra_event_bus.add_event(
-                    LicenseCreatedEvent(**await license.to_dict())
-                )
+                self._infra_event_bus.add_event(event)
             return subdivision
 
     async def update_license(
         self, update_license_command: UpdateLicenseCommand
     ) -> Optional[Subdivision]:
         async with self._uow as uow:
-            subdivision = await self.get_subdivision_by_id(
+            subdivision = await uow.subdivisions.get(
                 id=update_license_command.subdivision_id
             )
             if not subdivision:
@@ -131,19 +149,15 @@ class SubdivisionService:
                 name=update_license_command.name,
                 description=update_license_command.description,
             )
-            new_sub = await uow.subdivisions.save(subdivision)
+            await uow.subdivisions.save(subdivision)
             await uow.commit()
-            print(f"new_sub: {new_sub}")
-            subdivision = await self.get_subdivision_by_id(
-                id=update_license_command.subdivision_id
-            )
             return subdivision
 
     async def delete_license(
         self, delete_license_command: DeleteLicenseCommand
     ) -> Optional[Subdivision]:
         async with self._uow as uow:
-            subdivision = await self.get_subdivision_by_id(
+            subdivision = await uow.subdivisions.get(
                 id=delete_license_command.subdivision_id
             )
             if not subdivision:
@@ -151,20 +165,26 @@ class SubdivisionService:
             subdivision.delete_license(id=delete_license_command.id)
             await uow.subdivisions.save(subdivision)
             await uow.commit()
-            subdivision = await self.get_subdivision_by_id(
-                id=delete_license_command.subdivision_id
-            )
             return subdivision
 
     async def add_subdivision_statistic_row(
         self, new_stats_command: AddStatisticRowCommand
     ) -> Subdivision:
+        """
+        Returns the aggregate as it was commited, without reload:
+        its statistics hold only the added row.
+        """
         subdivision_id = new_stats_command.subdivision_id
         async with self._uow as uow:
             print(f"new_stats_command: {new_stats_command}")
             license_expired = False
-            # build subdivision aggregate from DB
-            subdivision = await uow.subdivisions.get(id=subdivision_id)
+            # build subdivision aggregate from DB,
+            # rows of subdivision and its licenses are locked to keep
+            # license request counter consistent with the fast paths,
+            # statistics are not needed for the check, so they are not loaded
+            subdivision = await uow.subdivisions.get(
+                id=subdivision_id, for_update=True, with_statistics=False
+            )
             if not subdivision:
                 raise SubdivisionNotFoundError
             new_stats_row = StatisticRow.make(
@@ -175,33 +195,291 @@ class SubdivisionService:
             await subdivision.save_day_statistic(
                 stat_row=new_stats_row, eventbus=self._domain_event_bus
             )
-            # Saving subdivision aggregate to DB
+            # Saving subdivision aggregate to DB: the new row is inserted
+            # by the session, which tracks the aggregate
             await uow.subdivisions.save(subdivision)
             if not subdivision.is_active:
                 license_expired = True
 
+            events = [StatisticRowAddedEvent(**await new_stats_row.to_dict())]
+            if license_expired:
+                events.append(
+                    SubdivisionLicenseExpiredEvent(
+                        **await subdivision.to_dict(exclude={"licenses", "statistics"})
+                    )
+                )
+            for event in events:
+                await uow.add_event(event)
             await uow.commit()
             if self._infra_event_bus:
-                self._infra_event_bus.add_event(
-                    StatisticRowAddedEvent(**await new_stats_row.to_dict())
+                for event in events:
+                    self._infra_event_bus.add_event(event)
+            return subdivision
+
+    async def record_usage(self, usage_command: RecordUsageCommand) -> LicenseUsage:
+        """
+        Fast path for usage reports: records statistic row and checks
+        the license limit in one statement, without building the aggregate.
+        """
+        subdivision_id = usage_command.subdivision_id
+        created = datetime.now()
+        async with self._uow as uow:
+            usage = await uow.subdivisions.add_usage(
+                subdivision_id=subdivision_id,
+                count_requests=usage_command.count_requests,
+                statistic_row_id=uuid4(),
+                created=created,
+            )
+            if not usage:
+                state = await uow.subdivisions.get_usage_state(
+                    subdivision_id=subdivision_id
                 )
-            if license_expired:
-                if self._infra_event_bus:
-                    self._infra_event_bus.add_event(
-                        SubdivisionLicenseExpiredEvent(
-                            **await subdivision.to_dict(
-                                exclude={"licenses", "statistics"}
-                            )
+                if not state:
+                    raise SubdivisionNotFoundError
+                if state.work_status != WorkStatus.ACTIVE:
+                    raise SubdivisionInactiveError
+                raise LicenseInactiveError
+
+            license_active = usage.status == LicenseStatus.ACTIVE
+            stat_row_event = StatisticRowAddedEvent(
+                id=usage.statistic_row_id,
+                created=created,
+                count_requests=usage_command.count_requests,
+                subdivision_id=subdivision_id,
+            )
+            domain_events = []
+            events = [stat_row_event]
+            if not license_active:
+                license_event, subdivision_event = self._make_expiration_events(usage)
+                domain_events.append(license_event)
+                events.append(subdivision_event)
+            for event in events:
+                await uow.add_event(event)
+            await uow.commit()
+            if self._domain_event_bus:
+                for event in domain_events:
+                    self._domain_event_bus.add_event(event)
+            if self._infra_event_bus:
+                for event in events:
+                    self._infra_event_bus.add_event(event)
+            return LicenseUsage.make(
+                subdivision_id=subdivision_id,
+                license_id=usage.id,
+                statistic_row_id=usage.statistic_row_id,
+                count_requests=usage_command.count_requests,
+                used_requests=usage.used_requests,
+                limit_requests=usage.count_requests,
+                license_active=license_active,
+            )
+
+    @staticmethod
+    def _make_expiration_events(usage: Any) -> tuple:
+        """
+        Events of license and subdivision deactivated by usage
+        or by expiration.
+        """
+        license_event = LicenseDeactivatedEvent(
+            name=usage.name,
+            description=usage.description,
+            type=usage.type,
+            subdivision_id=usage.subdivision_id,
+            status=usage.status,
+            count_requests=usage.count_requests,
+            used_requests=usage.used_requests,
+            activated=usage.activated,
+            expirated=usage.expirated,
+            created=usage.created,
+            expiration=usage.expiration,
+            id=usage.id,
+        )
+        subdivision_event = SubdivisionLicenseExpiredEvent(
+            name=usage.subdivision_name,
+            location=usage.subdivision_location,
+            tenant_id=usage.subdivision_tenant_id,
+            link_to_subdivision_processing_domain=(
+                usage.subdivision_link_to_subdivision_processing_domain
+            ),
+            work_status=usage.subdivision_work_status,
+            id=usage.subdivision_id,
+        )
+        return license_event, subdivision_event
+
+    async def expire_licenses(
+        self, expire_command: ExpireLicensesCommand
+    ) -> List[UUID]:
+        """
+        Deactivates one batch of expired licenses of type by time and
+        their subdivisions in one transaction, without loading aggregates.
+        Events of all of them are stored and published together.
+        Returns ids of deactivated licenses, a full batch means
+        there can be more.
+        """
+        async with self._uow as uow:
+            rows = await uow.subdivisions.expire_licenses(
+                now=expire_command.now, limit=expire_command.batch_size
+            )
+            domain_events, events = [], []
+            for row in rows:
+                license_event, subdivision_event = self._make_expiration_events(row)
+                domain_events.append(license_event)
+                events.append(subdivision_event)
+            for event in events:
+                await uow.add_event(event)
+            await uow.commit()
+            if self._domain_event_bus:
+                for event in domain_events:
+                    self._domain_event_bus.add_event(event)
+            if self._infra_event_bus:
+                for event in events:
+                    self._infra_event_bus.add_event(event)
+            return [row.id for row in rows]
+
+    async def add_statistic_rows_batch(
+        self, batch_command: AddStatisticRowsBatchCommand
+    ) -> LicenseUsageBatch:
+        """
+        Records usage of many subdivisions in one transaction:
+        counters and limits of all licenses are updated by one statement,
+        statistic rows are inserted by one executemany.
+        All items of a subdivision with active license are recorded,
+        even if the limit is reached in the middle of the batch.
+        """
+        created = batch_command.created
+        requests_by_subdivision: Dict[UUID, int] = {}
+        for item in batch_command.items:
+            requests_by_subdivision[item.subdivision_id] = (
+                requests_by_subdivision.get(item.subdivision_id, 0)
+                + item.count_requests
+            )
+
+        async with self._uow as uow:
+            licenses = {
+                row.subdivision_id: row
+                for row in await uow.subdivisions.add_usage_batch(
+                    requests_by_subdivision=requests_by_subdivision, created=created
+                )
+            }
+            rejected_ids = [id for id in requests_by_subdivision if id not in licenses]
+            states = {}
+            if rejected_ids:
+                states = {
+                    row.id: row
+                    for row in await uow.subdivisions.get_usage_states(
+                        subdivision_ids=rejected_ids
+                    )
+                }
+
+            # Counter before the batch, items are applied in order of the batch:
+            used_requests = {
+                id: row.used_requests - requests_by_subdivision[id]
+                for id, row in licenses.items()
+            }
+            accepted, rejected, rows = [], [], []
+            domain_events, events = [], []
+            for item in batch_command.items:
+                license = licenses.get(item.subdivision_id)
+                if license is None:
+                    state = states.get(item.subdivision_id)
+                    if not state:
+                        reason = SubdivisionNotFoundError.DETAIL
+                    elif state.work_status != WorkStatus.ACTIVE:
+                        reason = SubdivisionInactiveError.DETAIL
+                    else:
+                        reason = LicenseInactiveError.DETAIL
+                    rejected.append(
+                        RejectedUsage(
+                            subdivision_id=item.subdivision_id,
+                            count_requests=item.count_requests,
+                            reason=reason,
                         )
                     )
-            return subdivision
+                    continue
+                used_requests[item.subdivision_id] += item.count_requests
+                used = used_requests[item.subdivision_id]
+                row = dict(
+                    id=uuid4(),
+                    created=created,
+                    count_requests=item.count_requests,
+                    subdivision_id=item.subdivision_id,
+                )
+                rows.append(row)
+                events.append(StatisticRowAddedEvent(**row))
+                accepted.append(
+                    LicenseUsage.make(
+                        subdivision_id=item.subdivision_id,
+                        license_id=license.id,
+                        statistic_row_id=row["id"],
+                        count_requests=item.count_requests,
+                        used_requests=used,
+                        limit_requests=license.count_requests,
+                        license_active=(
+                            license.count_requests is None
+                            or used < license.count_requests
+                        ),
+                    )
+                )
+            await uow.subdivisions.add_statistic_rows(rows)
+
+            expired_license_ids = []
+            for license in licenses.values():
+                if license.status == LicenseStatus.ACTIVE:
+                    continue
+                expired_license_ids.append(license.id)
+                license_event, subdivision_event = self._make_expiration_events(
+                    license
+                )
+                domain_events.append(license_event)
+                events.append(subdivision_event)
+
+            for event in events:
+                await uow.add_event(event)
+            await uow.commit()
+            if self._domain_event_bus:
+                for event in domain_events:
+                    self._domain_event_bus.add_event(event)
+            if self._infra_event_bus:
+                for event in events:
+                    self._infra_event_bus.add_event(event)
+            return LicenseUsageBatch(
+                accepted=accepted,
+                rejected=rejected,
+                expired_license_ids=expired_license_ids,
+            )
+
+    async def reconcile_license_counters(self, fix: bool = True) -> List[Dict]:
+        """
+        Recomputes request counters of active licenses from statistic rows.
+        Returns found drifts, and fixes them if fix is True.
+        """
+        drifts: List[Dict] = []
+        async with self._uow as uow:
+            for counter in await uow.subdivisions.get_license_counters():
+                if counter.used_requests == counter.actual_requests:
+                    continue
+                drift = {
+                    "license_id": counter.id,
+                    "subdivision_id": counter.subdivision_id,
+                    "used_requests": counter.used_requests,
+                    "actual_requests": counter.actual_requests,
+                    "drift": counter.used_requests - counter.actual_requests,
+                    "fixed": False,
+                }
+                if fix:
+                    drift["fixed"] = await uow.subdivisions.set_license_used_requests(
+                        license_id=counter.id,
+                        used_requests=counter.actual_requests,
+                        expected_used_requests=counter.used_requests,
+                    )
+                print(f"License counter drift: {drift}")
+                drifts.append(drift)
+            await uow.commit()
+        return drifts
 
     async def update_subdivision(
         self, update_command: UpdateSubdivisionCommand
     ) -> Subdivision:
         async with self._uow as uow:
-            print(f"update_command: {update_command}")
-            subdivision = await self.get_subdivision_by_id(id=update_command.id)
+            subdivision = await uow.subdivisions.get(id=update_command.id)
             if not subdivision:
                 raise SubdivisionNotFoundError
             subdivision.update(
@@ -212,47 +490,43 @@ class SubdivisionService:
                     update_command.link_to_subdivision_processing_domain
                 ),
             )
-            print(f"subdivision: {subdivision}")
-            subdivision = await uow.subdivisions.update(
-                id=subdivision.id, model=subdivision
+            await uow.subdivisions.save(subdivision)
+            event = SubdivisionUpdatedEvent(
+                id=subdivision.id,
+                name=subdivision.name,
+                location=subdivision.location,
+                work_status=subdivision.work_status,
+                tenant_id=subdivision.tenant_id,
+                link_to_subdivision_processing_domain=(
+                    subdivision.link_to_subdivision_processing_domain
+                ),
             )
+            await uow.add_event(event)
             await uow.commit()
-            print(f"Updated subdivision: {subdivision}")
-            subdivision = await self.get_subdivision_by_id(id=subdivision.id)
-            print(f"Last subdivision: {subdivision}")
             if self._infra_event_bus:
-                self._infra_event_bus.add_event(
-                    SubdivisionUpdatedEvent(
-                        id=subdivision.id,
-                        name=subdivision.name,
-                        location=subdivision.location,
-                        work_status=subdivision.work_status,
-                        tenant_id=subdivision.tenant_id,
-                        link_to_subdivision_processing_domain=subdivision.link_to_subdivision_processing_domain,
-                    )
-                )
+                self._infra_event_bus.add_event(event)
             return subdivision
 
     async def delete_subdivision(self, id: UUID) -> Subdivision:
         async with self._uow as uow:
-            subdivision = await self.get_subdivision_by_id(id=id)
+            subdivision = await uow.subdivisions.get(id=id, include=())
             if not subdivision:
                 raise SubdivisionNotFoundError
             subdivision: Subdivision = await uow.subdivisions.delete(id=id)
+            event = SubdivisionDeletedEvent(
+                id=subdivision.id,
+                name=subdivision.name,
+                location=subdivision.location,
+                work_status=subdivision.work_status,
+                tenant_id=subdivision.tenant_id,
+                link_to_subdivision_processing_domain=(
+                    subdivision.link_to_subdivision_processing_domain
+                ),
+            )
+            await uow.add_event(event)
             await uow.commit()
             if self._infra_event_bus:
-                self._infra_event_bus.add_event(
-                    SubdivisionDeletedEvent(
-                        id=subdivision.id,
-                        name=subdivision.name,
-                        location=subdivision.location,
-                        work_status=subdivision.work_status,
-                        tenant_id=subdivision.tenant_id,
-                        link_to_subdivision_processing_domain=(
-                            subdivision.link_to_subdivision_processing_domain
-                        ),
-                    )
-                )
+                self._infra_event_bus.add_event(event)
             return subdivision
 
     async def create_subdivision(
@@ -265,23 +539,38 @@ class SubdivisionService:
                 tenant_id=create_command.tenant_id,
             )
             subdivision = await uow.subdivisions.add(model=subdivision)
+            event = SubdivisionCreatedEvent(
+                id=subdivision.id,
+                name=subdivision.name,
+                work_status=subdivision.work_status,
+                location=subdivision.location,
+                tenant_id=subdivision.tenant_id,
+                link_to_subdivision_processing_domain=(
+                    subdivision.link_to_subdivision_processing_domain
+                ),
+            )
+            await uow.add_event(event)
             await uow.commit()
             if self._infra_event_bus:
-                self._infra_event_bus.add_event(
-                    SubdivisionCreatedEvent(
-                        id=subdivision.id,
-                        name=subdivision.name,
-                        work_status=subdivision.work_status,
-                        location=subdivision.location,
-                        tenant_id=subdivision.tenant_id,
-                        link_to_subdivision_processing_domain=subdivision.link_to_subdivision_processing_domain,
-                    )
-                )
+                self._infra_event_bus.add_event(event)
             return subdivision
 
-    async def get_all_subdivisions(self) -> List[Subdivision]:
+    async def get_all_subdivisions(
+        self,
+        page: Optional[PageRequest] = None,
+        tenant_id: Optional[UUID] = None,
+        work_status: Optional[str] = None,
+        license_status: Optional[str] = None,
+        include: Optional[Collection[str]] = None,
+    ) -> List[Subdivision]:
         async with self._uow as uow:
-            subdivisions: List[Subdivision] = await uow.subdivisions.list()
+            subdivisions: List[Subdivision] = await uow.subdivisions.list(
+                page=page,
+                tenant_id=tenant_id,
+                work_status=work_status,
+                license_status=license_status,
+                include=include,
+            )
             return subdivisions
 
     async def get_subdivision_by_id(self, id: UUID) -> Subdivision:
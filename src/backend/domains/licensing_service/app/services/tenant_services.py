@@ -1,6 +1,8 @@
-from typing import Any, List, Optional
+from typing import Any, Collection, List, Optional
 from uuid import UUID
 
+from backend.core.infra.pagination import PageRequest
+
 from ...domain.aggregates.entities.user import User
 
 # ---Domain imports---
@@ -55,28 +57,39 @@ class TenantService:
                 phone=create_command.phone,
             )
             created_tenant = await uow.tenants.save(tenant=tenant)
+            event_tenant_created = TenantCreatedEvent(
+                id=created_tenant.id,
+                name=created_tenant.name,
+                address=created_tenant.address,
+                email=created_tenant.email,
+                phone=created_tenant.phone,
+            )
+            await uow.add_event(event_tenant_created)
             await uow.commit()
             tenant = await self.get_tenant_by_id(id=created_tenant.id)
             if self._infra_event_bus:
-                event_tenant_created = TenantCreatedEvent(
-                    id=tenant.id,
-                    name=tenant.name,
-                    address=tenant.address,
-                    email=tenant.email,
-                    phone=tenant.phone,
-                )
                 print(f"added a new event: {event_tenant_created}")
                 self._infra_event_bus.add_event(event_tenant_created)
             return tenant
 
-    async def get_all_tenants(self) -> List[Tenant]:
+    async def get_all_tenants(
+        self,
+        page: Optional[PageRequest] = None,
+        name: Optional[str] = None,
+        license_status: Optional[str] = None,
+        include: Optional[Collection[str]] = None,
+    ) -> List[Tenant]:
         async with self._uow as uow:
-            tenants: List[Tenant] = await uow.tenants.list()
+            tenants: List[Tenant] = await uow.tenants.list(
+                page=page, name=name, license_status=license_status, include=include
+            )
             return tenants
 
-    async def get_tenant_by_id(self, id: UUID | None) -> Tenant:
+    async def get_tenant_by_id(
+        self, id: UUID | None, include: Optional[Collection[str]] = None
+    ) -> Tenant:
         async with self._uow as uow:
-            tenant: Optional[Tenant] = await uow.tenants.get(id=id)
+            tenant: Optional[Tenant] = await uow.tenants.get(id=id, include=include)
             if not tenant:
                 raise TenantNotFoundError
             return tenant
@@ -93,7 +106,6 @@ class TenantService:
                 update_command.phone,
             )
             tenant: Tenant = await uow.tenants.update(id=tenant.id, model=tenant)
-            await uow.commit()
             event = TenantUpdatedEvent(
                 id=tenant.id,
                 name=tenant.name,
@@ -101,6 +113,8 @@ class TenantService:
                 email=tenant.email,
                 phone=tenant.phone,
             )
+            await uow.add_event(event)
+            await uow.commit()
             if self._infra_event_bus:
                 self._infra_event_bus.add_event(event)
             return tenant
@@ -108,7 +122,6 @@ class TenantService:
     async def delete_tenant(self, id: UUID) -> Tenant:
         async with self._uow as uow:
             tenant: Tenant = await uow.tenants.delete(id=id)
-            await uow.commit()
             if not tenant:
                 raise TenantNotFoundError
             event = TenantDeletedEvent(
@@ -118,6 +131,8 @@ class TenantService:
                 email=tenant.email,
                 phone=tenant.phone,
             )
+            await uow.add_event(event)
+            await uow.commit()
             if self._infra_event_bus:
                 self._infra_event_bus.add_event(event)
             return tenant
@@ -36,8 +36,9 @@ class UserService:
         async with self._uow as uow:
             print(f"model: {model}")
             user = await uow.users.add(model=model)
-            await uow.commit()
             event = UserCreatedEvent(user_id=user.user_id)
+            await uow.add_event(event)
+            await uow.commit()
             print(f"Add event to infra bus: {event}")
             if self._infra_event_bus:
                 self._infra_event_bus.add_event(event)
@@ -47,8 +48,9 @@ class UserService:
     async def update_user(self, id: UUID, user: User) -> User:
         async with self._uow as uow:
             user: User = await uow.users.update(id=id, model=user)
-            await uow.commit()
             event = UserUpdatedEvent(**await user.to_dict())
+            await uow.add_event(event)
+            await uow.commit()
             if self._infra_event_bus:
                 self._infra_event_bus.add_event(event)
             return user
@@ -59,8 +61,9 @@ class UserService:
         user_data = User(**user_data_from_user_domain)
         async with self._uow as uow:
             user: User = await uow.users.update(id=user_data.user_id, model=user_data)
-            await uow.commit()
             event = UserUpdatedEvent(**await user.to_dict())
+            await uow.add_event(event)
+            await uow.commit()
             if self._infra_event_bus:
                 self._infra_event_bus.add_event(event)
             return user
@@ -19,6 +19,8 @@ class License(AbstractEntity):
     subdivision_id: Optional[UUID] = None
     status: Optional[LicenseStatus] = LicenseStatus.ACTIVE
     count_requests: int = 0
+    # Requests made since the license was activated:
+    used_requests: int = 0
     activated: Optional[datetime] = None
     expirated: Optional[datetime] = None
     created: Optional[datetime] = datetime.now()
@@ -46,6 +48,10 @@ class License(AbstractEntity):
     def activate(self) -> None:
         self.status = LicenseStatus.ACTIVE
         self.activated = datetime.now()
+        self.used_requests = 0
+
+    def add_used_requests(self, count_requests: int) -> None:
+        self.used_requests += count_requests
 
     def deactivate(self) -> None:
         self.status = LicenseStatus.INACTIVE
@@ -85,6 +91,7 @@ class License(AbstractEntity):
         expirated: datetime,
         created: datetime,
         expiration: datetime,
+        used_requests: int = 0,
     ) -> License:
         return cls(
             name=name,
@@ -92,6 +99,7 @@ class License(AbstractEntity):
             type=type,
             subdivision_id=subdivision_id,
             count_requests=count_requests,
+            used_requests=used_requests,
             status=status,
             created=created,
             activated=activated,
@@ -112,18 +112,13 @@ class Subdivision(AbstractAggregateRoot):
 
     @property
     def total_count_requests(self) -> int:
+        """
+        Requests made since activation of the active license.
+        Counter is kept on the license, so statistics are not summed here.
+        """
         if not self.active_license:
             return 0
-        if not self.statistics:
-            return 0
-        for strow in self.statistics:
-            print(f"strow: {strow}")
-        return sum(
-            r.count_requests
-            for r in filter(
-                lambda x: x.created > self.active_license.activated, self.statistics
-            )
-        )
+        return self.active_license.used_requests
 
     def check_license(self):
         if self.active_license:
@@ -175,11 +170,11 @@ class Subdivision(AbstractAggregateRoot):
         if stat_row in self.statistics:
             raise SubdivisionStatisticAlreadyExistsError
         print(f"type(stat_row): {type(stat_row)}")
-        if (
-            stat_row.count_requests + self.total_count_requests
-        ) >= self.active_license.count_requests:
-            deactivated_license = self.active_license
-            self.active_license.deactivate()
+        current_license = self.active_license
+        current_license.add_used_requests(stat_row.count_requests)
+        if current_license.used_requests >= current_license.count_requests:
+            deactivated_license = current_license
+            current_license.deactivate()
             self.deactivate()
             if eventbus:
                 eventbus.add_event(
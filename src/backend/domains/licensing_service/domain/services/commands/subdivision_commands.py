@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Tuple
 from uuid import UUID
 
 from backend.core.infra.commands import AbstractCommand
@@ -12,6 +13,30 @@ class AddStatisticRowCommand(AbstractCommand):
     count_requests: int
 
 
+@dataclass(frozen=True)
+class RecordUsageCommand(AbstractCommand):
+    subdivision_id: UUID
+    count_requests: int
+
+
+@dataclass(frozen=True)
+class StatisticRowsBatchItem:
+    subdivision_id: UUID
+    count_requests: int
+
+
+@dataclass(frozen=True)
+class AddStatisticRowsBatchCommand(AbstractCommand):
+    items: Tuple[StatisticRowsBatchItem, ...]
+    created: datetime
+
+
+@dataclass(frozen=True)
+class ExpireLicensesCommand(AbstractCommand):
+    now: datetime
+    batch_size: int
+
+
 @dataclass(frozen=True)
 class ActivateSubdivisionLicenseCommand(AbstractCommand):
     subdivision_id: UUID
@@ -1,5 +1,5 @@
-from backend.core.infra.eventbus import AbstractEventBus
+from backend.core.infra.eventbus import ContextEventBus
 
 
-class DomainEventBus(AbstractEventBus):
+class DomainEventBus(ContextEventBus):
     ...
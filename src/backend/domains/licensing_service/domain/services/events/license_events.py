@@ -22,6 +22,7 @@ class LicenseActivatedEvent(AbstractEvent):
     subdivision_id: UUID
     status: str
     count_requests: int
+    used_requests: int
     activated: datetime
     expirated: datetime
     created: datetime
@@ -38,6 +39,7 @@ class LicenseDeactivatedEvent(AbstractEvent):
     subdivision_id: UUID
     status: str
     count_requests: int
+    used_requests: int
     activated: datetime
     expirated: datetime
     created: datetime
@@ -54,6 +56,7 @@ class LicenseCreatedEvent(AbstractEvent):
     subdivision_id: UUID
     status: str
     count_requests: int
+    used_requests: int
     activated: datetime
     expirated: datetime
     created: datetime
@@ -70,6 +73,7 @@ class LicenseDeletedEvent(AbstractEvent):
     subdivision_id: UUID
     status: str
     count_requests: int
+    used_requests: int
     activated: datetime
     expirated: datetime
     created: datetime
@@ -3,6 +3,7 @@ from typing import List, Optional
 from uuid import UUID
 
 from backend.core.domain.entity import AbstractEntity
+from backend.core.infra.pagination import PageRequest
 from backend.core.infra.repositories import AbstractRepository
 
 from ...aggregates.entities.license import License
@@ -41,5 +42,11 @@ class LicenseRepository(AbstractRepository, ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def list(self) -> List[License]:
+    async def list(
+        self,
+        page: Optional[PageRequest] = None,
+        subdivision_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        type: Optional[str] = None,
+    ) -> List[License]:
         raise NotImplementedError
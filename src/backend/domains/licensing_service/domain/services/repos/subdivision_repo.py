@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Collection, Dict, List, Optional, Sequence
 from uuid import UUID
 
 from backend.core.domain.entity import AbstractEntity
+from backend.core.infra.pagination import PageRequest
 from backend.core.infra.repositories import AbstractRepository
 
 from ...aggregates.entities.license import License
@@ -24,7 +26,13 @@ class SubdivisionRepository(AbstractRepository, ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def get(self, id: UUID) -> Optional[Subdivision]:
+    async def get(
+        self,
+        id: UUID,
+        for_update: bool = False,
+        with_statistics: bool = True,
+        include: Optional[Collection[str]] = None,
+    ) -> Optional[Subdivision]:
         raise NotImplementedError
 
     @abstractmethod
@@ -40,7 +48,14 @@ class SubdivisionRepository(AbstractRepository, ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def list(self) -> List[Subdivision]:
+    async def list(
+        self,
+        page: Optional[PageRequest] = None,
+        tenant_id: Optional[UUID] = None,
+        work_status: Optional[str] = None,
+        license_status: Optional[str] = None,
+        include: Optional[Collection[str]] = None,
+    ) -> List[Subdivision]:
         raise NotImplementedError
 
     @abstractmethod
@@ -52,3 +67,45 @@ class SubdivisionRepository(AbstractRepository, ABC):
         self, model: StatisticRow
     ) -> Optional[StatisticRow]:
         raise NotImplementedError
+
+    @abstractmethod
+    async def add_usage(
+        self,
+        subdivision_id: UUID,
+        count_requests: int,
+        statistic_row_id: UUID,
+        created: datetime,
+    ) -> Optional[Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_usage_state(self, subdivision_id: UUID) -> Optional[Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def add_usage_batch(
+        self, requests_by_subdivision: Dict[UUID, int], created: datetime
+    ) -> Sequence[Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def add_statistic_rows(self, rows: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def expire_licenses(self, now: datetime, limit: int) -> Sequence[Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_usage_states(self, subdivision_ids: List[UUID]) -> Sequence[Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_license_counters(self) -> Sequence[Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set_license_used_requests(
+        self, license_id: UUID, used_requests: int, expected_used_requests: int
+    ) -> bool:
+        raise NotImplementedError
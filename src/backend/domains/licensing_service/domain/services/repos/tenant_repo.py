@@ -1,8 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Collection, List, Optional
 from uuid import UUID
 
 from backend.core.domain.entity import AbstractEntity
+from backend.core.infra.pagination import PageRequest
 from backend.core.infra.repositories import AbstractRepository
 
 from ...aggregates.tenant import Tenant
@@ -21,7 +22,9 @@ class TenantRepository(AbstractRepository, ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def get(self, id: UUID) -> Optional[Tenant]:
+    async def get(
+        self, id: UUID, include: Optional[Collection[str]] = None
+    ) -> Optional[Tenant]:
         raise NotImplementedError
 
     @abstractmethod
@@ -33,5 +36,11 @@ class TenantRepository(AbstractRepository, ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def list(self) -> List[Tenant]:
+    async def list(
+        self,
+        page: Optional[PageRequest] = None,
+        name: Optional[str] = None,
+        license_status: Optional[str] = None,
+        include: Optional[Collection[str]] = None,
+    ) -> List[Tenant]:
         raise NotImplementedError
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from backend.core.domain.value_object import ValueObject
+
+from .license_type import LicenseType
+from .work_status import WorkStatus
+
+
+@dataclass(frozen=True, slots=True)
+class LicenseUsage(ValueObject):
+    """
+    State of the active license of subdivision after usage was recorded.
+    """
+
+    subdivision_id: UUID
+    license_id: UUID
+    statistic_row_id: UUID
+    count_requests: int
+    used_requests: int
+    limit_requests: int
+    remaining_requests: int
+    license_active: bool
+
+    @classmethod
+    def make(
+        cls,
+        subdivision_id: UUID,
+        license_id: UUID,
+        statistic_row_id: UUID,
+        count_requests: int,
+        used_requests: int,
+        limit_requests: int,
+        license_active: bool,
+    ) -> LicenseUsage:
+        return cls(
+            subdivision_id=subdivision_id,
+            license_id=license_id,
+            statistic_row_id=statistic_row_id,
+            count_requests=count_requests,
+            used_requests=used_requests,
+            limit_requests=limit_requests,
+            remaining_requests=max(limit_requests - used_requests, 0),
+            license_active=license_active,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class RejectedUsage(ValueObject):
+    """
+    Usage of a batch, which was not recorded.
+    """
+
+    subdivision_id: UUID
+    count_requests: int
+    reason: str
+
+
+@dataclass(frozen=True, slots=True)
+class LicenseUsageBatch(ValueObject):
+    """
+    Result of a batch of usage reports, items are in order of the batch.
+    """
+
+    accepted: List[LicenseUsage]
+    rejected: List[RejectedUsage]
+    expired_license_ids: List[UUID]
+
+
+@dataclass(frozen=True, slots=True)
+class LicenseState(ValueObject):
+    """
+    Whether subdivision is licensed now and how many requests are left.
+    Expiration is checked on every read, so the state can be cached.
+    """
+
+    subdivision_id: UUID
+    work_status: WorkStatus
+    license_id: Optional[UUID] = None
+    license_type: Optional[LicenseType] = None
+    expiration: Optional[datetime] = None
+    limit_requests: Optional[int] = None
+    used_requests: Optional[int] = None
+
+    @property
+    def licensed(self) -> bool:
+        if self.work_status != WorkStatus.ACTIVE or self.license_id is None:
+            return False
+        if self.license_type == LicenseType.BYTIME:
+            return self.expiration is None or self.expiration > datetime.now()
+        return self.remaining_requests != 0
+
+    @property
+    def remaining_requests(self) -> Optional[int]:
+        """
+        None - license is not limited by count of requests.
+        """
+        if self.license_type != LicenseType.BYCOUNT or self.limit_requests is None:
+            return None
+        return max(self.limit_requests - (self.used_requests or 0), 0)
@@ -0,0 +1,7 @@
+from enum import StrEnum
+
+
+class UsageBucket(StrEnum):
+    HOUR = "hour"
+    DAY = "day"
+    MONTH = "month"
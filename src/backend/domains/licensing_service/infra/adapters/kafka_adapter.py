@@ -1,6 +1,7 @@
 import sys
 from datetime import datetime
-from uuid import uuid4
+from typing import Optional
+from uuid import UUID
 
 import six
 from sqlalchemy import UUID as ALCH_UUID
@@ -9,13 +10,18 @@ if sys.version_info >= (3, 12, 0):
     sys.modules["kafka.vendor.six.moves"] = six.moves
 
 from kafka import KafkaConsumer, KafkaProducer
-from kafka.admin import KafkaAdminClient, NewTopic
+from kafka.admin import KafkaAdminClient, NewPartitions, NewTopic
 from kafka.errors import KafkaError, TopicAlreadyExistsError
 
 from backend.core.infra.events import AbstractEvent
 from backend.core.infra.outside_broker.connection import (
     DEFAULT_KAFKA_TOPIC,
+    KAFKA_PRODUCER_BATCH_SIZE,
+    KAFKA_PRODUCER_COMPRESSION_TYPE,
+    KAFKA_PRODUCER_LINGER_MS,
     KAFKA_SERVERS,
+    KAFKA_TOPIC_PARTITIONS,
+    KAFKA_TOPIC_REPLICATION_FACTOR,
     KAFKA_TOPICS,
 )
 
@@ -57,10 +63,23 @@ protobuf_types = {
     StatisticRowAddedEvent: StatisticRowEvent,
 }
 
+# Fields with id of the aggregate, which orders events, by priority:
+# events of licenses and statistic rows are ordered with their subdivision.
+AGGREGATE_ID_FIELDS = ("subdivision_id", "user_id", "id", "tenant_id")
+
 
 def create_topics(
-    kafka_servers: list = KAFKA_SERVERS, topics: list = KAFKA_TOPICS
+    kafka_servers: list = KAFKA_SERVERS,
+    topics: list = KAFKA_TOPICS,
+    num_partitions: int = KAFKA_TOPIC_PARTITIONS,
+    replication_factor: int = KAFKA_TOPIC_REPLICATION_FACTOR,
 ) -> None:
+    """
+    Creates topics with num_partitions partitions and adds partitions
+    to existing topics, which have less. Keys of some aggregates move
+    to the new partitions then, so their events, which were sent before,
+    can be consumed after the new ones once.
+    """
     print(f"kafka_servers: {kafka_servers}")
     print(f"topics: {topics}")
 
@@ -74,71 +93,179 @@ def create_topics(
     existing_topic_list = consumer.topics()
     print(existing_topic_list)
     topic_list = []
+    topic_partitions = {}
     for topic in topics:
         if topic not in existing_topic_list:
             print("Topic : {} added ".format(topic))
             topic_list.append(
-                NewTopic(name=topic, num_partitions=1, replication_factor=1)
+                NewTopic(
+                    name=topic,
+                    num_partitions=num_partitions,
+                    replication_factor=replication_factor,
+                )
             )
+        elif len(consumer.partitions_for_topic(topic) or ()) < num_partitions:
+            print(f"Topic : {topic} partitions increased to {num_partitions}")
+            topic_partitions[topic] = NewPartitions(total_count=num_partitions)
         else:
-            print("Topic : {topic} already exist ")
+            print(f"Topic : {topic} already exist ")
     try:
         if topic_list:
             admin_client.create_topics(new_topics=topic_list, validate_only=False)
             print("Topic Created Successfully")
         else:
             print("Topic Exist")
+        if topic_partitions:
+            admin_client.create_partitions(topic_partitions)
     except TopicAlreadyExistsError as e:
         print(f"Topic Already Exist: {e}")
     except Exception as e:
         print(f"Error: {e}")
+    finally:
+        consumer.close()
+        admin_client.close()
 
 
-class KafkaAdapter:
+async def serialize_event(event: AbstractEvent) -> bytes:
+    """
+    Converts event to protobuf message, ready to be sent to broker.
+    """
+    print(f"Prepare_message event: {event}")
+    protobuf_type = protobuf_types[type(event)]
+    message = protobuf_type()
+    print(f"type protobuf: {type(message).__name__}")
+    type_message = type(message).__name__
 
-    def __init__(
-        self, topic: str = DEFAULT_KAFKA_TOPIC, kafka_servers: list = KAFKA_SERVERS
-    ) -> None:
+    dict_event = await event.to_dict()
+    dict_event["type_name"] = type_message
+    for key, value in dict_event.items():
+        if str(type(value)).find("UUID") != -1:
+            value = str(value)
         try:
-            self.topic = topic
-            self.__producer = KafkaProducer(bootstrap_servers=kafka_servers)
+            setattr(message, key, value)
         except Exception as err:
+            print(f"{message},{key},{value}")
             print(f"Error: {err}")
+    if "action" in dict_event:
+        print(f"dict_event.action: {dict_event['action']}")
+        message.action = int(dict_event["action"])
+        print(f"message.action: {message.action}")
+
+    print(f"message: {message}")
+    return message.SerializeToString()
+
+
+def is_publishable(event: AbstractEvent) -> bool:
+    """
+    Only events, which have protobuf type, are sent to broker.
+    """
+    return type(event) in protobuf_types
+
+
+def make_event_key(event: AbstractEvent) -> Optional[bytes]:
+    """
+    Key of the message is id of the aggregate, the event belongs to.
+    Messages with the same key go to the same partition, so events
+    of a subdivision are consumed in the order they were sent,
+    while different subdivisions are consumed in parallel.
+    Event without id of its aggregate has no key, such messages are
+    spread over partitions and have no order.
+    """
+    for field in AGGREGATE_ID_FIELDS:
+        aggregate_id = getattr(event, field, None)
+        if aggregate_id is not None:
+            break
+    else:
+        return None
+    if isinstance(aggregate_id, UUID):
+        return aggregate_id.bytes
+    return str(aggregate_id).encode()
+
+
+# One producer per process, shared by every handler. KafkaProducer is
+# thread-safe and batches records in its own I/O thread, so `send` only
+# appends to the buffer and does not wait for the broker.
+_producer: Optional[KafkaProducer] = None
+
+
+def start_producer(
+    kafka_servers: list = KAFKA_SERVERS,
+    topic: str = DEFAULT_KAFKA_TOPIC,
+) -> Optional[KafkaProducer]:
+    """
+    Creates the process-wide producer.
+    Should be called once on application startup.
+    """
+    global _producer
+    if _producer is not None:
+        return _producer
+    try:
+        _producer = KafkaProducer(
+            bootstrap_servers=kafka_servers,
+            linger_ms=KAFKA_PRODUCER_LINGER_MS,
+            batch_size=KAFKA_PRODUCER_BATCH_SIZE,
+            compression_type=KAFKA_PRODUCER_COMPRESSION_TYPE,
+        )
+        # Warm up metadata, so the first send in a request doesn't block on it:
+        _producer.partitions_for(topic)
+    except Exception as err:
+        print(f"Error: {err}")
+    return _producer
 
-    async def prepare_message(self, event: AbstractEvent) -> str:
-        print(f"Prepare_message event: {event}")
-        protobuf_type = protobuf_types[type(event)]
-        message = protobuf_type()
-        print(f"type protobuf: {type(message).__name__}")
-        type_message = type(message).__name__
-
-        dict_event = await event.to_dict()
-        dict_event["type_name"] = type_message
-        for key, value in dict_event.items():
-            if str(type(value)).find("UUID") != -1:
-                value = str(value)
-            try:
-                setattr(message, key, value)
-            except Exception as err:
-                print(f"{message},{key},{value}")
-                print(f"Error: {err}")
-        if "action" in dict_event:
-            print(f"dict_event.action: {dict_event['action']}")
-            message.action = int(dict_event["action"])
-            print(f"message.action: {message.action}")
-
-        print(f"message: {message}")
-        return message.SerializeToString()
+
+def stop_producer(timeout: Optional[float] = None) -> None:
+    """
+    Delivers buffered messages and closes the process-wide producer.
+    Should be called once on application shutdown.
+    """
+    global _producer
+    if _producer is None:
+        return
+    try:
+        _producer.flush(timeout=timeout)
+        _producer.close(timeout=timeout)
+    except Exception as err:
+        print(f"Error: {err}")
+    finally:
+        _producer = None
+
+
+def get_producer() -> Optional[KafkaProducer]:
+    if _producer is None:
+        return start_producer()
+    return _producer
+
+
+def on_send_error(err: Exception) -> None:
+    print(f"Error: message was not delivered to Kafka: {err}")
+
+
+class KafkaAdapter:
+
+    def __init__(
+        self,
+        topic: str = DEFAULT_KAFKA_TOPIC,
+        producer: Optional[KafkaProducer] = None,
+    ) -> None:
+        self.topic = topic
+        self.__producer = producer or get_producer()
+
+    async def prepare_message(self, event: AbstractEvent) -> bytes:
+        return await serialize_event(event)
 
     async def send_event_to_kafka(self, event: AbstractEvent) -> None:
         """
-        Sends message to kafka broker
+        Sends message to kafka broker.
+        Message is only buffered here, the producer delivers it
+        in batches in the background.
         """
         try:
             kafka_mess = await self.prepare_message(event)
             print(f"kafka_mess: {kafka_mess}")
-            self.__producer.send(self.topic, key=uuid4().bytes, value=kafka_mess)
-            self.__producer.flush()
+            future = self.__producer.send(
+                self.topic, key=make_event_key(event), value=kafka_mess
+            )
+            future.add_errback(on_send_error)
             print("Message sent to Kafka")
         except Exception as e:
             print(f"Error: {e}")
@@ -1,18 +1,25 @@
 from uuid import uuid4
 
 from sqlalchemy import (
+    DDL,
     UUID,
     Boolean,
     Column,
+    Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     String,
     Table,
+    event,
+    text,
 )
 from sqlalchemy.orm import relationship
 
 from backend.core.infra.database.metadata import mapper_registry
+from backend.core.infra.database.partitions import default_partition_name
 
 tenants_table = Table(
     "tenants",
@@ -37,12 +44,23 @@ lisenses_table = Table(
     Column("created", DateTime, nullable=False),
     Column("expiration", DateTime, nullable=True),
     Column("count_requests", Integer, nullable=True),
+    Column("used_requests", Integer, nullable=False, default=0, server_default="0"),
     Column(
         "subdivision_id",
         UUID,
         ForeignKey("subdivisions.id", onupdate="CASCADE", ondelete="CASCADE"),
         nullable=False,
     ),
+    # Filters by subdivision and status, e.g. active license of subdivision:
+    Index("ix_lisenses_subdivision_id_status", "subdivision_id", "status"),
+    # Keyset pagination by creation time:
+    Index("ix_lisenses_created_id", "created", "id"),
+    # Expired licenses for the sweeper, only active ones expiring by time:
+    Index(
+        "ix_lisenses_expiration_active_by_time",
+        "expiration",
+        postgresql_where=text("status = 'active' AND type = 'by_time'"),
+    ),
 )
 
 subdivisions_table = Table(
@@ -59,20 +77,72 @@ subdivisions_table = Table(
         ForeignKey("tenants.id", onupdate="CASCADE", ondelete="CASCADE"),
         nullable=False,
     ),
+    # Keyset pagination by name, in all subdivisions and in a tenant:
+    Index("ix_subdivisions_name_id", "name", "id"),
+    Index("ix_subdivisions_tenant_id_name_id", "tenant_id", "name", "id"),
 )
 
+# Range partitioned by month of creation, so old months are dropped
+# as whole partitions (see StatisticPartitionService), primary key
+# has to contain the partition key. Rows of months without a partition
+# go to the default partition.
 statistic_row_table = Table(
     "statistic_rows",
     mapper_registry.metadata,
-    Column("id", UUID, primary_key=True, nullable=False, unique=True, default=uuid4),
-    Column("created", DateTime, nullable=False),
+    Column("id", UUID, primary_key=True, nullable=False, default=uuid4),
+    Column("created", DateTime, primary_key=True, nullable=False),
+    Column("count_requests", Integer, nullable=False),
+    Column(
+        "subdivision_id",
+        UUID,
+        ForeignKey("subdivisions.id", onupdate="CASCADE", ondelete="CASCADE"),
+        nullable=False,
+    ),
+    # Covers sums of requests of a subdivision since some moment:
+    Index(
+        "ix_statistic_rows_subdivision_id_created",
+        "subdivision_id",
+        "created",
+        postgresql_include=["count_requests"],
+    ),
+    postgresql_partition_by="RANGE (created)",
+)
+event.listen(
+    statistic_row_table,
+    "after_create",
+    DDL(
+        f"CREATE TABLE {default_partition_name('statistic_rows')} "
+        "PARTITION OF statistic_rows DEFAULT"
+    ),
+)
+
+# Requests of dropped partitions of statistic rows summed by day and by month.
+statistic_daily_rollups_table = Table(
+    "statistic_daily_rollups",
+    mapper_registry.metadata,
+    Column(
+        "subdivision_id",
+        UUID,
+        ForeignKey("subdivisions.id", onupdate="CASCADE", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    ),
+    Column("day", Date, primary_key=True, nullable=False),
     Column("count_requests", Integer, nullable=False),
+)
+
+statistic_monthly_rollups_table = Table(
+    "statistic_monthly_rollups",
+    mapper_registry.metadata,
     Column(
         "subdivision_id",
         UUID,
         ForeignKey("subdivisions.id", onupdate="CASCADE", ondelete="CASCADE"),
+        primary_key=True,
         nullable=False,
     ),
+    Column("month", Date, primary_key=True, nullable=False),
+    Column("count_requests", Integer, nullable=False),
 )
 
 users_table = Table(
@@ -91,6 +161,74 @@ users_table = Table(
     Column("superadmin", Boolean, default=False),
 )
 
+# Transactional outbox: events are written here in the same transaction
+# as the aggregate changes and are delivered to the broker by OutboxRelay.
+outbox_table = Table(
+    "outbox",
+    mapper_registry.metadata,
+    Column("id", UUID, primary_key=True, nullable=False, unique=True, default=uuid4),
+    Column("created", DateTime, nullable=False),
+    Column("event_type", String, nullable=False),
+    Column("topic", String, nullable=False),
+    Column("key", LargeBinary, nullable=True),
+    Column("payload", LargeBinary, nullable=False),
+    Column("attempts", Integer, nullable=False, default=0),
+    Column("last_error", String, nullable=True),
+    # Unsent message is not taken before this time: it is being sent
+    # by a relay or waits for retry after a failure:
+    Column("next_attempt", DateTime, nullable=True),
+    Column("sent", DateTime, nullable=True),
+    Index(
+        "ix_outbox_unsent_created",
+        "created",
+        postgresql_where=text("sent IS NULL"),
+    ),
+    # Sent messages are purged after the retention by this index:
+    Index(
+        "ix_outbox_sent",
+        "sent",
+        postgresql_where=text("sent IS NOT NULL"),
+    ),
+)
+
+# Read models (CQRS): denormalized rows for queries, which are refreshed
+# from the tables above by projectors on domain events.
+# They have no foreign keys, projectors delete rows of deleted aggregates.
+subdivision_summaries_table = Table(
+    "subdivision_summaries",
+    mapper_registry.metadata,
+    Column("id", UUID, primary_key=True, nullable=False),
+    Column("tenant_id", UUID, nullable=False, index=True),
+    Column("name", String, nullable=False),
+    Column("location", String, nullable=False),
+    Column("link_to_subdivision_processing_domain", String),
+    Column("work_status", String, nullable=False),
+    Column("licenses_count", Integer, nullable=False),
+    Column("active_license_id", UUID, nullable=True),
+    Column("active_license_name", String, nullable=True),
+    Column("active_license_type", String, nullable=True),
+    Column("active_license_activated", DateTime, nullable=True),
+    Column("active_license_expiration", DateTime, nullable=True),
+    Column("limit_requests", Integer, nullable=True),
+    # Counter at the last refresh, queries read the current one of the license:
+    Column("used_requests", Integer, nullable=True),
+    Column("refreshed", DateTime, nullable=False),
+)
+
+tenant_summaries_table = Table(
+    "tenant_summaries",
+    mapper_registry.metadata,
+    Column("id", UUID, primary_key=True, nullable=False),
+    Column("name", String, nullable=False),
+    Column("address", String, nullable=False),
+    Column("email", String, nullable=False),
+    Column("phone", String, nullable=False),
+    Column("subdivisions_count", Integer, nullable=False),
+    Column("active_subdivisions_count", Integer, nullable=False),
+    Column("active_licenses_count", Integer, nullable=False),
+    Column("refreshed", DateTime, nullable=False),
+)
+
 
 def start_mappers():
     """
@@ -147,6 +285,8 @@ def start_mappers():
     mapper_registry.map_imperatively(
         class_=StatisticRow,
         local_table=statistic_row_table,
+        # Identity is the id, created is in the key only for partitioning:
+        primary_key=[statistic_row_table.c.id],
         properties={
             "subdivision": relationship(Subdivision, back_populates="statistics")
         },
@@ -0,0 +1,233 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, List, Optional
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from backend.core.infra.database.connection import (
+    session_factory as default_session_factory,
+)
+from backend.core.infra.outside_broker.connection import (
+    OUTBOX_ALERT_ATTEMPTS,
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_MAX_RETRY_BACKOFF,
+    OUTBOX_POLL_INTERVAL,
+    OUTBOX_RETRY_BACKOFF,
+    OUTBOX_SEND_TIMEOUT,
+)
+
+from ..repos.sqlalchemy.outbox_repo import SQLAlchemyOutboxRepository
+from .kafka_adapter import start_producer
+
+# Relay running in this process, if any. Units of work wake it up after commit.
+_relay: Optional["OutboxRelay"] = None
+
+
+def notify_outbox_relay() -> None:
+    if _relay is not None:
+        _relay.notify()
+
+
+def _set_waiter(waiter: asyncio.Future, result: Any, error: Any) -> None:
+    if waiter.done():
+        return
+    if error is not None:
+        waiter.set_exception(error)
+    else:
+        waiter.set_result(result)
+
+
+def _wait_for_delivery(
+    future: Any, loop: asyncio.AbstractEventLoop
+) -> asyncio.Future:
+    """
+    Wraps the future of KafkaProducer.send, which is resolved in producer
+    I/O thread, into asyncio future.
+    """
+    waiter = loop.create_future()
+    future.add_callback(
+        lambda metadata: loop.call_soon_threadsafe(_set_waiter, waiter, metadata, None)
+    )
+    future.add_errback(
+        lambda err: loop.call_soon_threadsafe(_set_waiter, waiter, None, err)
+    )
+    return waiter
+
+
+class OutboxRelay:
+    """
+    Background task, which delivers events from outbox table to Kafka.
+
+    Rows are leased in batches in a short transaction and marked as sent
+    only after broker acknowledged them, so delivery is at-least-once.
+    Failed rows are retried with exponential backoff, they are never dropped.
+    Next batch is taken only when the previous one is acknowledged,
+    that limits the number of messages in flight.
+
+    Messages of one key are not taken, while an earlier one waits for
+    retry (see claim_unsent), so between batches and relays they are
+    delivered in order. Inside a batch they are sent in order by one
+    producer, but if the broker rejects a message after the producer
+    retries, later messages of its key in the same batch may already be
+    delivered before it.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = default_session_factory,
+        producer: Any = None,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        poll_interval: float = OUTBOX_POLL_INTERVAL,
+        send_timeout: float = OUTBOX_SEND_TIMEOUT,
+        retry_backoff: float = OUTBOX_RETRY_BACKOFF,
+        max_retry_backoff: float = OUTBOX_MAX_RETRY_BACKOFF,
+        alert_attempts: int = OUTBOX_ALERT_ATTEMPTS,
+    ) -> None:
+        self._session_factory = session_factory
+        self._producer = producer
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._send_timeout = send_timeout
+        self._retry_backoff = retry_backoff
+        self._max_retry_backoff = max_retry_backoff
+        self._alert_attempts = alert_attempts
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._failed = 0
+        self._producer_failures = 0
+        self._producer_retry_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def notify(self) -> None:
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        global _relay
+        _relay = self
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Finishes current batch and delivers what is left in the outbox.
+        """
+        global _relay
+        if _relay is self:
+            _relay = None
+        self._stopping = True
+        self._wakeup.set()
+        if self._task:
+            await self._task
+            self._task = None
+        try:
+            while await self.relay_batch() == self._batch_size and not self._failed:
+                pass
+        except Exception as err:
+            print(f"Error: outbox relay: {err}")
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                processed = await self.relay_batch()
+            except Exception as err:
+                print(f"Error: outbox relay: {err}")
+                processed = 0
+            # Full batch means there is more to send, unless broker is failing:
+            if processed == self._batch_size and not self._failed:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def _backoff(self, failures: int) -> float:
+        return min(self._retry_backoff * 2 ** (failures - 1), self._max_retry_backoff)
+
+    async def _get_producer(self) -> Any:
+        """
+        Creating KafkaProducer blocks till the broker answers,
+        so it is created in a thread, and retried with backoff
+        while the broker is unavailable.
+        """
+        if self._producer is not None:
+            return self._producer
+        if time.monotonic() < self._producer_retry_at:
+            return None
+        loop = asyncio.get_running_loop()
+        self._producer = await loop.run_in_executor(None, start_producer)
+        if self._producer is None:
+            self._producer_failures += 1
+            delay = self._backoff(self._producer_failures)
+            self._producer_retry_at = time.monotonic() + delay
+            print(f"Error: outbox relay: no Kafka producer, retry in {delay:.0f}s")
+        else:
+            self._producer_failures = 0
+        return self._producer
+
+    async def relay_batch(self) -> int:
+        """
+        Sends one batch of unsent messages.
+        Returns number of processed rows.
+        """
+        self._failed = 0
+        producer = await self._get_producer()
+        if producer is None:
+            return 0
+        loop = asyncio.get_running_loop()
+        now = datetime.now()
+        # Lease outlives the wait for acknowledgements:
+        lease_until = now + timedelta(seconds=self._send_timeout * 2)
+        async with self._session_factory() as session:
+            async with session.begin():
+                rows = await SQLAlchemyOutboxRepository(session=session).claim_unsent(
+                    limit=self._batch_size, now=now, lease_until=lease_until
+                )
+        if not rows:
+            return 0
+
+        waiters: List[asyncio.Future] = []
+        for row in rows:
+            try:
+                future = producer.send(row.topic, key=row.key, value=row.payload)
+                waiters.append(_wait_for_delivery(future, loop))
+            except Exception as err:
+                waiter = loop.create_future()
+                waiter.set_exception(err)
+                waiters.append(waiter)
+        await asyncio.wait(waiters, timeout=self._send_timeout)
+
+        sent_ids, failed_ids, errors = [], [], set()
+        for row, waiter in zip(rows, waiters):
+            if waiter.done() and waiter.exception() is None:
+                sent_ids.append(row.id)
+                continue
+            failed_ids.append(row.id)
+            if waiter.done():
+                errors.add(str(waiter.exception()))
+            else:
+                waiter.cancel()
+                errors.add("delivery timeout")
+        async with self._session_factory() as session:
+            async with session.begin():
+                outbox = SQLAlchemyOutboxRepository(session=session)
+                await outbox.mark_sent(sent_ids)
+                failed = await outbox.mark_failed(
+                    failed_ids,
+                    error="; ".join(errors),
+                    now=datetime.now(),
+                    backoff=self._retry_backoff,
+                    max_backoff=self._max_retry_backoff,
+                )
+        self._failed = len(failed_ids)
+        if failed_ids:
+            print(f"Error: outbox relay failed to send {self._failed} messages")
+            print(f"Error: {errors}")
+        stuck = [row.id for row in failed if row.attempts >= self._alert_attempts]
+        if stuck:
+            print(
+                f"Error: outbox relay: {len(stuck)} messages failed "
+                f"{self._alert_attempts} times or more, still retrying: {stuck}"
+            )
+        return len(rows)
@@ -13,9 +13,12 @@ from ...domain.services.commands.license_commands import (
 from ...domain.services.commands.subdivision_commands import (
     ActivateSubdivisionLicenseCommand,
     AddStatisticRowCommand,
+    AddStatisticRowsBatchCommand,
     CreateSubdivisionCommand,
     DeactivateSubdivisionLicenseCommand,
     DeleteSubdivisionCommand,
+    ExpireLicensesCommand,
+    RecordUsageCommand,
     UpdateSubdivisionCommand,
 )
 from ...domain.services.commands.tenant_commands import (
@@ -51,9 +54,12 @@ from .commands.license import (
 from .commands.subdivision import (
     ActivateSubdivisionLicenseCommandHandler,
     AddStaticticRowSubdivisionCommandHandler,
+    AddStatisticRowsBatchCommandHandler,
     CreateSubdivisionCommandHandler,
     DeactivateSubdivisionLicenseCommandHandler,
     DeleteSubdivisionCommandHandler,
+    ExpireLicensesCommandHandler,
+    RecordUsageCommandHandler,
     UpdateSubdivisionCommandHandler,
 )
 from .commands.tenant import (
@@ -66,7 +72,15 @@ from .events.license_event_handlers import (
     LicenseActivatedEventHandler,
     LicenseDeactivatedEventHandler,
 )
-from .events.outside_broker_event_handlers import ExternalMessageBusSender
+from .events.license_status_cache_handlers import (
+    LicenseEventLicenseStateInvalidator,
+    SubdivisionEventLicenseStateInvalidator,
+)
+from .events.read_model_event_handlers import (
+    LicenseReadModelProjector,
+    SubdivisionReadModelProjector,
+    TenantReadModelProjector,
+)
 from .events.tenant_event_handlers import TenantCreatedEventHandler
 from .events.user_event_handlers import UserCreatedEventHandler
 
@@ -80,25 +94,48 @@ def aggregates_event_handler_scanner(
             print(method)
 
 
+# Events are sent to the outside broker by OutboxRelay from the outbox table,
+# which is filled by units of work in the same transaction as the changes.
+# Read model projectors refresh read models (CQRS) of changed aggregates,
+# usage is not projected, queries read request counters of licenses.
+# Invalidators drop cached license states of changed subdivisions.
 EVENTS_HANDLERS_FOR_INJECTION: Dict[
     Type[AbstractEvent], List[Type[AbstractEventHandler]]
 ] = {
-    UserCreatedEvent: [ExternalMessageBusSender, UserCreatedEventHandler],
-    UserUpdatedEvent: [
-        ExternalMessageBusSender,
+    UserCreatedEvent: [UserCreatedEventHandler],
+    UserUpdatedEvent: [],
+    LicenseActivatedEvent: [
+        LicenseEventLicenseStateInvalidator,
+        LicenseActivatedEventHandler,
+        LicenseReadModelProjector,
+    ],
+    LicenseDeactivatedEvent: [
+        LicenseEventLicenseStateInvalidator,
+        LicenseDeactivatedEventHandler,
+        LicenseReadModelProjector,
+    ],
+    LicenseCreatedEvent: [LicenseReadModelProjector],
+    LicenseDeletedEvent: [
+        LicenseEventLicenseStateInvalidator,
+        LicenseReadModelProjector,
+    ],
+    TenantCreatedEvent: [TenantReadModelProjector],
+    TenantUpdatedEvent: [TenantReadModelProjector],
+    TenantDeletedEvent: [TenantReadModelProjector],
+    SubdivisionCreatedEvent: [SubdivisionReadModelProjector],
+    SubdivisionUpdatedEvent: [
+        SubdivisionEventLicenseStateInvalidator,
+        SubdivisionReadModelProjector,
+    ],
+    SubdivisionDeletedEvent: [
+        SubdivisionEventLicenseStateInvalidator,
+        SubdivisionReadModelProjector,
+    ],
+    StatisticRowAddedEvent: [],
+    SubdivisionLicenseExpiredEvent: [
+        SubdivisionEventLicenseStateInvalidator,
+        SubdivisionReadModelProjector,
     ],
-    LicenseActivatedEvent: [ExternalMessageBusSender, LicenseActivatedEventHandler],
-    LicenseDeactivatedEvent: [ExternalMessageBusSender, LicenseDeactivatedEventHandler],
-    LicenseCreatedEvent: [ExternalMessageBusSender],
-    LicenseDeletedEvent: [ExternalMessageBusSender],
-    TenantCreatedEvent: [ExternalMessageBusSender],
-    TenantUpdatedEvent: [ExternalMessageBusSender],
-    TenantDeletedEvent: [ExternalMessageBusSender],
-    SubdivisionCreatedEvent: [ExternalMessageBusSender],
-    SubdivisionUpdatedEvent: [ExternalMessageBusSender],
-    SubdivisionDeletedEvent: [ExternalMessageBusSender],
-    StatisticRowAddedEvent: [ExternalMessageBusSender],
-    SubdivisionLicenseExpiredEvent: [ExternalMessageBusSender],
 }
 
 COMMANDS_HANDLERS_FOR_INJECTION: Dict[
@@ -115,6 +152,9 @@ COMMANDS_HANDLERS_FOR_INJECTION: Dict[
     UpdateLicenseCommand: UpdateLicenseCommandHandler,
     DeleteLicenseCommand: DeleteLicenseCommandHandler,
     AddStatisticRowCommand: AddStaticticRowSubdivisionCommandHandler,
+    RecordUsageCommand: RecordUsageCommandHandler,
+    AddStatisticRowsBatchCommand: AddStatisticRowsBatchCommandHandler,
+    ExpireLicensesCommand: ExpireLicensesCommandHandler,
     ActivateSubdivisionLicenseCommand: (ActivateSubdivisionLicenseCommandHandler),
     DeactivateSubdivisionLicenseCommand: (DeactivateSubdivisionLicenseCommandHandler),
 }
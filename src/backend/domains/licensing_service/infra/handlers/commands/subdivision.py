@@ -1,14 +1,21 @@
+from typing import List
+from uuid import UUID
+
 from ....app.services.subdivision_services import SubdivisionService
 from ....domain.aggregates.subdivision import Subdivision
 from ....domain.services.commands.subdivision_commands import (
     ActivateSubdivisionLicenseCommand,
     AddStatisticRowCommand,
+    AddStatisticRowsBatchCommand,
     CreateSubdivisionCommand,
     DeactivateSubdivisionLicenseCommand,
     DeleteSubdivisionCommand,
+    ExpireLicensesCommand,
+    RecordUsageCommand,
     UpdateSubdivisionCommand,
 )
 from ....domain.services.handlers.subdivision_handlers import SubdivisionCommandHandler
+from ....domain.value_objects.license_usage import LicenseUsage, LicenseUsageBatch
 
 
 class ActivateSubdivisionLicenseCommandHandler(SubdivisionCommandHandler):
@@ -59,6 +66,44 @@ class AddStaticticRowSubdivisionCommandHandler(SubdivisionCommandHandler):
         return subdivision
 
 
+class RecordUsageCommandHandler(SubdivisionCommandHandler):
+    async def __call__(self, command: RecordUsageCommand) -> LicenseUsage:
+        """
+        Handle RecordUsageCommand
+        """
+        service: SubdivisionService = SubdivisionService(
+            domain_event_bus=self.domain_event_bus, infra_event_bus=self.infra_event_bus
+        )
+        usage = await service.record_usage(usage_command=command)
+        return usage
+
+
+class AddStatisticRowsBatchCommandHandler(SubdivisionCommandHandler):
+    async def __call__(
+        self, command: AddStatisticRowsBatchCommand
+    ) -> LicenseUsageBatch:
+        """
+        Handle AddStatisticRowsBatchCommand
+        """
+        service: SubdivisionService = SubdivisionService(
+            domain_event_bus=self.domain_event_bus, infra_event_bus=self.infra_event_bus
+        )
+        usage_batch = await service.add_statistic_rows_batch(batch_command=command)
+        return usage_batch
+
+
+class ExpireLicensesCommandHandler(SubdivisionCommandHandler):
+    async def __call__(self, command: ExpireLicensesCommand) -> List[UUID]:
+        """
+        Handle ExpireLicensesCommand
+        """
+        service: SubdivisionService = SubdivisionService(
+            domain_event_bus=self.domain_event_bus, infra_event_bus=self.infra_event_bus
+        )
+        license_ids = await service.expire_licenses(expire_command=command)
+        return license_ids
+
+
 class CreateSubdivisionCommandHandler(SubdivisionCommandHandler):
 
     async def __call__(self, command: CreateSubdivisionCommand) -> Subdivision:
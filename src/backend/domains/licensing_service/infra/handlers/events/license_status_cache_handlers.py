@@ -0,0 +1,30 @@
+from backend.core.infra.handlers import AbstractEventHandler
+
+from ....app.queries.subdivision_queries import SubdivisionQuery
+from ....domain.services.events.license_events import LicenseActivatedEvent
+from ....domain.services.events.subdivision_events import (
+    SubdivisionLicenseExpiredEvent,
+)
+
+
+class LicenseStateInvalidator(AbstractEventHandler):
+    """
+    Drops cached license state of the subdivision changed by the event.
+    It does no I/O, so it's registered before other handlers of the event.
+    It's not deferrable: status requested right after the command
+    should not be served from stale cache.
+    """
+
+    deferrable = False
+
+
+class LicenseEventLicenseStateInvalidator(LicenseStateInvalidator):
+
+    async def __call__(self, event: LicenseActivatedEvent) -> None:
+        SubdivisionQuery.invalidate_license_state(event.subdivision_id)
+
+
+class SubdivisionEventLicenseStateInvalidator(LicenseStateInvalidator):
+
+    async def __call__(self, event: SubdivisionLicenseExpiredEvent) -> None:
+        SubdivisionQuery.invalidate_license_state(event.id)
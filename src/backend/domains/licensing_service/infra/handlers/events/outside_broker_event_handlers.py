@@ -5,6 +5,9 @@ from ...adapters.kafka_adapter import KafkaAdapter
 
 
 class ExternalMessageBusSender(AbstractEventHandler):
+    # Sending to broker should not hold domain handlers of the event:
+    independent = True
+    timeout = 10.0
 
     async def __call__(self, event: AbstractEvent) -> None:
         print("Start sending to Kafka")
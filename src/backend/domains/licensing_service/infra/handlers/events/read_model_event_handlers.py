@@ -0,0 +1,58 @@
+from typing import Any
+
+from backend.core.infra.eventbus import AbstractEventBus
+from backend.core.infra.handlers import AbstractEventHandler
+
+from ....app.services.read_model_services import ReadModelService
+from ....domain.services.events.license_events import LicenseActivatedEvent
+from ....domain.services.events.subdivision_events import SubdivisionCreatedEvent
+from ....domain.services.events.tenant_events import TenantCreatedEvent
+
+
+class ReadModelProjector(AbstractEventHandler):
+    # Read models are refreshed after changes are commited,
+    # their errors should not fail the command,
+    # queries after the command should see the changes:
+    independent = True
+    timeout = 10.0
+    deferrable = False
+
+    def __init__(
+        self,
+        domain_event_bus: AbstractEventBus,
+        infra_event_bus: AbstractEventBus,
+        db_session_factory: Any | None = None,
+    ) -> None:
+        super().__init__(
+            domain_event_bus=domain_event_bus, infra_event_bus=infra_event_bus
+        )
+        self._db_session_factory = db_session_factory
+
+
+class SubdivisionReadModelProjector(ReadModelProjector):
+
+    async def __call__(self, event: SubdivisionCreatedEvent) -> None:
+        read_model_service = ReadModelService(
+            db_session_factory=self._db_session_factory
+        )
+        await read_model_service.refresh_subdivision(subdivision_id=event.id)
+
+
+class LicenseReadModelProjector(ReadModelProjector):
+
+    async def __call__(self, event: LicenseActivatedEvent) -> None:
+        read_model_service = ReadModelService(
+            db_session_factory=self._db_session_factory
+        )
+        await read_model_service.refresh_subdivision(
+            subdivision_id=event.subdivision_id
+        )
+
+
+class TenantReadModelProjector(ReadModelProjector):
+
+    async def __call__(self, event: TenantCreatedEvent) -> None:
+        read_model_service = ReadModelService(
+            db_session_factory=self._db_session_factory
+        )
+        await read_model_service.refresh_tenant(tenant_id=event.id)
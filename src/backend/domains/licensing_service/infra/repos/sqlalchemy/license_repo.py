@@ -1,13 +1,16 @@
-from typing import Any, List, Optional, Sequence
+from typing import Any, Dict, List, Optional, Sequence
 from uuid import UUID
 
 from sqlalchemy import Result, Row, RowMapping, delete, insert, select, update
 
 from backend.core.domain.entity import AbstractEntity
+from backend.core.infra.database.pagination import paginate
 from backend.core.infra.database.repositories import SQLAlchemyAbstractRepository
+from backend.core.infra.pagination import PageRequest
 
 from ....domain.aggregates.entities.license import License
 from ....domain.services.repos.license_repo import LicenseRepository
+from ...adapters.orm import lisenses_table
 
 
 class SQLAlchemyLicenseRepository(SQLAlchemyAbstractRepository, LicenseRepository):
@@ -62,7 +65,20 @@ class SQLAlchemyLicenseRepository(SQLAlchemyAbstractRepository, LicenseRepositor
         )
         return result.scalar_one()
 
-    async def list(self) -> List[License]:
+    # Fields, by which list of licenses can be sorted:
+    SORT_COLUMNS: Dict[str, Any] = {
+        "id": lisenses_table.c.id,
+        "name": lisenses_table.c.name,
+        "created": lisenses_table.c.created,
+    }
+
+    async def list(
+        self,
+        page: Optional[PageRequest] = None,
+        subdivision_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        type: Optional[str] = None,
+    ) -> List[License]:
         """
         Returning result object instead of converting to new objects by
         [TenantModel(**await r.to_dict()) for r in result.scalars().all()]
@@ -70,9 +86,20 @@ class SQLAlchemyLicenseRepository(SQLAlchemyAbstractRepository, LicenseRepositor
 
         Checking by asserts, that expected return type is equal
         to fact return type.
-        """
 
-        result: Result = await self._session.execute(select(License))
+        Filters are applied in SQL. With page returns licenses of the page
+        and one more, if there is the next page.
+        """
+        query = select(License)
+        if subdivision_id is not None:
+            query = query.where(lisenses_table.c.subdivision_id == subdivision_id)
+        if status is not None:
+            query = query.where(lisenses_table.c.status == status)
+        if type is not None:
+            query = query.where(lisenses_table.c.type == type)
+        if page is not None:
+            query = paginate(query, page, sort_columns=self.SORT_COLUMNS)
+        result: Result = await self._session.execute(query)
         licenses: Sequence[Row | RowMapping | Any] = result.scalars().all()
 
         assert isinstance(licenses, List)
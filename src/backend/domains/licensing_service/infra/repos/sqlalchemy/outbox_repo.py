@@ -0,0 +1,170 @@
+from datetime import datetime
+from typing import List, Sequence
+from uuid import UUID, uuid4
+
+from sqlalchemy import (
+    Result,
+    Row,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.infra.events import AbstractEvent
+from backend.core.infra.outside_broker.connection import DEFAULT_KAFKA_TOPIC
+
+from ...adapters.kafka_adapter import is_publishable, make_event_key, serialize_event
+from ...adapters.orm import outbox_table
+
+# Key of the advisory lock, which serializes claims of all relays:
+OUTBOX_CLAIM_LOCK = 7_243_501
+
+
+class SQLAlchemyOutboxRepository:
+    """
+    Repository for outbox messages.
+    Works with the table directly, outbox rows are not domain models.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session: AsyncSession = session
+
+    async def add_events(
+        self, events: List[AbstractEvent], topic: str = DEFAULT_KAFKA_TOPIC
+    ) -> int:
+        rows = []
+        for event in events:
+            if not is_publishable(event):
+                continue
+            rows.append(
+                dict(
+                    id=uuid4(),
+                    created=datetime.now(),
+                    event_type=type(event).__name__,
+                    topic=topic,
+                    key=make_event_key(event),
+                    payload=await serialize_event(event),
+                    attempts=0,
+                )
+            )
+        if rows:
+            await self._session.execute(insert(outbox_table), rows)
+        return len(rows)
+
+    async def claim_unsent(
+        self, limit: int, now: datetime, lease_until: datetime
+    ) -> Sequence[Row]:
+        """
+        Takes unsent rows, which are due, and leases them till `lease_until`:
+        other relays don't take them meanwhile, so the transaction can be
+        committed before sending and no row stays locked while the broker
+        acknowledges it. If the relay dies, rows are taken again after
+        the lease.
+
+        Messages of one key are sent in order: a row is not taken, while
+        an earlier row of its key is leased or waits for retry, so a later
+        event of an aggregate does not overtake a failed one, also when
+        several relays drain the outbox. Claims of relays are serialized
+        by an advisory lock for that, they are short, sending is not.
+        Rows without key have no order.
+        """
+        await self._session.execute(
+            select(func.pg_advisory_xact_lock(OUTBOX_CLAIM_LOCK))
+        )
+        earlier = outbox_table.alias("earlier")
+        earlier_not_due = exists().where(
+            earlier.c.key == outbox_table.c.key,
+            earlier.c.sent.is_(None),
+            earlier.c.created < outbox_table.c.created,
+            earlier.c.next_attempt > now,
+        )
+        claimed = (
+            select(outbox_table.c.id)
+            .where(
+                outbox_table.c.sent.is_(None),
+                or_(
+                    outbox_table.c.next_attempt.is_(None),
+                    outbox_table.c.next_attempt <= now,
+                ),
+                ~earlier_not_due,
+            )
+            .order_by(outbox_table.c.created)
+            .limit(limit)
+            .with_for_update()
+            .cte("claimed")
+        )
+        result: Result = await self._session.execute(
+            update(outbox_table)
+            .where(outbox_table.c.id == claimed.c.id)
+            .values(next_attempt=lease_until)
+            .returning(*outbox_table.c)
+        )
+        return sorted(result.all(), key=lambda row: row.created)
+
+    async def mark_sent(self, ids: List[UUID]) -> None:
+        if not ids:
+            return
+        await self._session.execute(
+            update(outbox_table)
+            .where(outbox_table.c.id.in_(ids))
+            .values(
+                sent=datetime.now(),
+                attempts=outbox_table.c.attempts + 1,
+                next_attempt=None,
+            )
+        )
+
+    async def mark_failed(
+        self,
+        ids: List[UUID],
+        error: str,
+        now: datetime,
+        backoff: float,
+        max_backoff: float,
+    ) -> Sequence[Row]:
+        """
+        Schedules the next attempt after `backoff` seconds, doubled
+        by every previous attempt, but not later than `max_backoff`.
+        Returns ids and attempts of the rows.
+        """
+        if not ids:
+            return []
+        delay = func.least(
+            backoff * func.power(2, outbox_table.c.attempts), max_backoff
+        )
+        result: Result = await self._session.execute(
+            update(outbox_table)
+            .where(outbox_table.c.id.in_(ids))
+            .values(
+                attempts=outbox_table.c.attempts + 1,
+                last_error=error,
+                next_attempt=literal(now)
+                + func.make_interval(0, 0, 0, 0, 0, 0, delay),
+            )
+            .returning(outbox_table.c.id, outbox_table.c.attempts)
+        )
+        return result.all()
+
+    async def purge_sent(self, sent_before: datetime, limit: int) -> int:
+        """
+        Deletes up to `limit` messages sent before `sent_before`.
+        Returns number of deleted ones, less than limit means
+        there are no more.
+        """
+        purged = (
+            select(outbox_table.c.id)
+            .where(outbox_table.c.sent < sent_before)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result: Result = await self._session.execute(
+            delete(outbox_table).where(outbox_table.c.id.in_(purged))
+        )
+        return result.rowcount
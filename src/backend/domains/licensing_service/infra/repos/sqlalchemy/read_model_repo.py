@@ -0,0 +1,370 @@
+from typing import Any, Collection, Dict, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import Result, Row, Select, delete, exists, func, select, true
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.infra.database.pagination import paginate
+from backend.core.infra.pagination import PageRequest
+
+from ....domain.value_objects.license_status import LicenseStatus
+from ....domain.value_objects.work_status import WorkStatus
+from ...adapters.orm import (
+    lisenses_table,
+    statistic_row_table,
+    subdivision_summaries_table,
+    subdivisions_table,
+    tenant_summaries_table,
+    tenants_table,
+    users_table,
+)
+
+
+class SQLAlchemyReadModelRepository:
+    """
+    Repository for read models of subdivisions and tenants.
+    Works with the tables directly, read models are not domain models.
+
+    Rows are refreshed from the write tables with one INSERT ... SELECT
+    ... ON CONFLICT statement, so a refresh is idempotent and can be
+    repeated for the same event. A refresh, which read older state
+    than the stored row, does not overwrite it.
+
+    Usage reports are not projected: they change only the request counter
+    of the active license, which is read from the license by its key
+    together with the summary.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session: AsyncSession = session
+
+    @staticmethod
+    def _subdivision_summary_source() -> Select:
+        subdivisions = subdivisions_table
+        licenses = lisenses_table
+        active_license = (
+            select(licenses)
+            .where(
+                licenses.c.subdivision_id == subdivisions.c.id,
+                licenses.c.status == LicenseStatus.ACTIVE,
+            )
+            .order_by(licenses.c.activated.desc())
+            .limit(1)
+            .lateral("active_license")
+        )
+        licenses_count = (
+            select(func.count())
+            .where(licenses.c.subdivision_id == subdivisions.c.id)
+            .scalar_subquery()
+        )
+        return select(
+            subdivisions.c.id,
+            subdivisions.c.tenant_id,
+            subdivisions.c.name,
+            subdivisions.c.location,
+            subdivisions.c.link_to_subdivision_processing_domain,
+            subdivisions.c.work_status,
+            licenses_count.label("licenses_count"),
+            active_license.c.id.label("active_license_id"),
+            active_license.c.name.label("active_license_name"),
+            active_license.c.type.label("active_license_type"),
+            active_license.c.activated.label("active_license_activated"),
+            active_license.c.expiration.label("active_license_expiration"),
+            active_license.c.count_requests.label("limit_requests"),
+            active_license.c.used_requests,
+            func.statement_timestamp().label("refreshed"),
+        ).select_from(subdivisions.outerjoin(active_license, true()))
+
+    @staticmethod
+    def _select_subdivision_summaries() -> Select:
+        summaries = subdivision_summaries_table
+        return select(
+            *(column for column in summaries.c if column.name != "used_requests"),
+            lisenses_table.c.used_requests,
+        ).select_from(
+            summaries.outerjoin(
+                lisenses_table, lisenses_table.c.id == summaries.c.active_license_id
+            )
+        )
+
+    @staticmethod
+    def _tenant_summary_source() -> Select:
+        tenants = tenants_table
+        subdivisions = subdivisions_table
+        licenses = lisenses_table
+        subdivisions_count = (
+            select(func.count())
+            .where(subdivisions.c.tenant_id == tenants.c.id)
+            .scalar_subquery()
+        )
+        active_subdivisions_count = (
+            select(func.count())
+            .where(
+                subdivisions.c.tenant_id == tenants.c.id,
+                subdivisions.c.work_status == WorkStatus.ACTIVE,
+            )
+            .scalar_subquery()
+        )
+        active_licenses_count = (
+            select(func.count())
+            .select_from(
+                licenses.join(
+                    subdivisions, subdivisions.c.id == licenses.c.subdivision_id
+                )
+            )
+            .where(
+                subdivisions.c.tenant_id == tenants.c.id,
+                licenses.c.status == LicenseStatus.ACTIVE,
+            )
+            .scalar_subquery()
+        )
+        return select(
+            tenants.c.id,
+            tenants.c.name,
+            tenants.c.address,
+            tenants.c.email,
+            tenants.c.phone,
+            subdivisions_count.label("subdivisions_count"),
+            active_subdivisions_count.label("active_subdivisions_count"),
+            active_licenses_count.label("active_licenses_count"),
+            func.statement_timestamp().label("refreshed"),
+        )
+
+    @staticmethod
+    def _upsert(table: Any, source: Select) -> Any:
+        statement = insert(table).from_select(
+            [column.name for column in source.selected_columns], source
+        )
+        return statement.on_conflict_do_update(
+            index_elements=[table.c.id],
+            set_={
+                column.name: statement.excluded[column.name]
+                for column in table.c
+                if column.name != "id"
+            },
+            where=table.c.refreshed <= statement.excluded.refreshed,
+        )
+
+    async def refresh_subdivision(self, subdivision_id: UUID) -> Optional[UUID]:
+        """
+        Returns tenant id of the subdivision,
+        summary of deleted subdivision is deleted.
+        """
+        source = self._subdivision_summary_source().where(
+            subdivisions_table.c.id == subdivision_id
+        )
+        result: Result = await self._session.execute(
+            self._upsert(subdivision_summaries_table, source).returning(
+                subdivision_summaries_table.c.tenant_id
+            )
+        )
+        tenant_id: Optional[UUID] = result.scalar_one_or_none()
+        if tenant_id is None:
+            # Nothing is upserted, if the stored row is newer
+            # or subdivision is deleted:
+            tenant_id = await self._session.scalar(
+                select(subdivisions_table.c.tenant_id).where(
+                    subdivisions_table.c.id == subdivision_id
+                )
+            )
+        if tenant_id is None:
+            result = await self._session.execute(
+                delete(subdivision_summaries_table)
+                .where(subdivision_summaries_table.c.id == subdivision_id)
+                .returning(subdivision_summaries_table.c.tenant_id)
+            )
+            tenant_id = result.scalar_one_or_none()
+        return tenant_id
+
+    async def refresh_tenant(self, tenant_id: UUID) -> None:
+        """
+        Summaries of deleted tenant and its subdivisions are deleted.
+        """
+        source = self._tenant_summary_source().where(tenants_table.c.id == tenant_id)
+        await self._session.execute(self._upsert(tenant_summaries_table, source))
+        tenant_exists = await self._session.scalar(
+            select(exists().where(tenants_table.c.id == tenant_id))
+        )
+        if tenant_exists:
+            return
+        await self._session.execute(
+            delete(tenant_summaries_table).where(
+                tenant_summaries_table.c.id == tenant_id
+            )
+        )
+        await self._session.execute(
+            delete(subdivision_summaries_table).where(
+                subdivision_summaries_table.c.tenant_id == tenant_id
+            )
+        )
+
+    async def rebuild(self) -> None:
+        """
+        Fills read models from scratch, e.g. for data,
+        which was written before read models existed.
+        """
+        await self._session.execute(delete(subdivision_summaries_table))
+        await self._session.execute(delete(tenant_summaries_table))
+        await self._session.execute(
+            self._upsert(
+                subdivision_summaries_table, self._subdivision_summary_source()
+            )
+        )
+        await self._session.execute(
+            self._upsert(tenant_summaries_table, self._tenant_summary_source())
+        )
+
+    async def get_license_state(self, subdivision_id: UUID) -> Optional[Row]:
+        """
+        Active license of subdivision, read from the write tables,
+        so it's never older than the last commited change.
+        """
+        source = self._subdivision_summary_source().subquery()
+        result: Result = await self._session.execute(
+            select(
+                source.c.id.label("subdivision_id"),
+                source.c.work_status,
+                source.c.active_license_id.label("license_id"),
+                source.c.active_license_type.label("license_type"),
+                source.c.active_license_expiration.label("expiration"),
+                source.c.limit_requests,
+                source.c.used_requests,
+            ).where(source.c.id == subdivision_id)
+        )
+        return result.first()
+
+    async def get_subdivision_summary(self, subdivision_id: UUID) -> Optional[Row]:
+        result: Result = await self._session.execute(
+            self._select_subdivision_summaries().where(
+                subdivision_summaries_table.c.id == subdivision_id
+            )
+        )
+        return result.first()
+
+    # Fields, by which list of subdivision summaries can be sorted:
+    SUBDIVISION_SORT_COLUMNS: Dict[str, Any] = {
+        "id": subdivision_summaries_table.c.id,
+        "name": subdivision_summaries_table.c.name,
+    }
+
+    async def list_subdivision_summaries(
+        self,
+        page: Optional[PageRequest] = None,
+        tenant_id: Optional[UUID] = None,
+        work_status: Optional[str] = None,
+        license_status: Optional[str] = None,
+    ) -> Sequence[Row]:
+        """
+        Filters are the same as of SQLAlchemySubdivisionRepository.list.
+        With page returns summaries of the page and one more,
+        if there is the next page, without page - all, ordered by name.
+        """
+        summaries = subdivision_summaries_table
+        query = self._select_subdivision_summaries()
+        if tenant_id is not None:
+            query = query.where(summaries.c.tenant_id == tenant_id)
+        if work_status is not None:
+            query = query.where(summaries.c.work_status == work_status)
+        if license_status is not None:
+            query = query.where(
+                exists().where(
+                    lisenses_table.c.subdivision_id == summaries.c.id,
+                    lisenses_table.c.status == license_status,
+                )
+            )
+        if page is not None:
+            query = paginate(query, page, sort_columns=self.SUBDIVISION_SORT_COLUMNS)
+        else:
+            query = query.order_by(summaries.c.name, summaries.c.id)
+        result: Result = await self._session.execute(query)
+        return result.all()
+
+    async def get_tenant_summary(self, tenant_id: UUID) -> Optional[Row]:
+        result: Result = await self._session.execute(
+            select(tenant_summaries_table).where(
+                tenant_summaries_table.c.id == tenant_id
+            )
+        )
+        return result.first()
+
+    # Fields, by which list of tenant summaries can be sorted:
+    TENANT_SORT_COLUMNS: Dict[str, Any] = {
+        "id": tenant_summaries_table.c.id,
+        "name": tenant_summaries_table.c.name,
+    }
+
+    async def list_tenant_summaries(
+        self,
+        page: Optional[PageRequest] = None,
+        name: Optional[str] = None,
+        license_status: Optional[str] = None,
+    ) -> Sequence[Row]:
+        """
+        Filters are the same as of SQLAlchemyTenantRepository.list.
+        With page returns summaries of the page and one more,
+        if there is the next page, without page - all, ordered by name.
+        """
+        summaries = tenant_summaries_table
+        query = select(summaries)
+        if name is not None:
+            query = query.where(summaries.c.name.icontains(name, autoescape=True))
+        if license_status is not None:
+            query = query.where(
+                exists()
+                .select_from(
+                    lisenses_table.join(
+                        subdivisions_table,
+                        subdivisions_table.c.id == lisenses_table.c.subdivision_id,
+                    )
+                )
+                .where(
+                    subdivisions_table.c.tenant_id == summaries.c.id,
+                    lisenses_table.c.status == license_status,
+                )
+            )
+        if page is not None:
+            query = paginate(query, page, sort_columns=self.TENANT_SORT_COLUMNS)
+        else:
+            query = query.order_by(summaries.c.name, summaries.c.id)
+        result: Result = await self._session.execute(query)
+        return result.all()
+
+    async def list_subdivision_summaries_of_tenants(
+        self, tenant_ids: Collection[UUID]
+    ) -> Sequence[Row]:
+        summaries = subdivision_summaries_table
+        result: Result = await self._session.execute(
+            self._select_subdivision_summaries()
+            .where(summaries.c.tenant_id.in_(tenant_ids))
+            .order_by(summaries.c.name, summaries.c.id)
+        )
+        return result.all()
+
+    async def list_licenses(self, subdivision_ids: Collection[UUID]) -> Sequence[Row]:
+        """
+        Licenses of subdivisions are read from the flat table,
+        without building the aggregates.
+        """
+        result: Result = await self._session.execute(
+            select(lisenses_table)
+            .where(lisenses_table.c.subdivision_id.in_(subdivision_ids))
+            .order_by(lisenses_table.c.created, lisenses_table.c.id)
+        )
+        return result.all()
+
+    async def list_statistic_rows(
+        self, subdivision_ids: Collection[UUID]
+    ) -> Sequence[Row]:
+        result: Result = await self._session.execute(
+            select(statistic_row_table)
+            .where(statistic_row_table.c.subdivision_id.in_(subdivision_ids))
+            .order_by(statistic_row_table.c.created, statistic_row_table.c.id)
+        )
+        return result.all()
+
+    async def list_users(self, tenant_ids: Collection[UUID]) -> Sequence[Row]:
+        result: Result = await self._session.execute(
+            select(users_table).where(users_table.c.tenant_id.in_(tenant_ids))
+        )
+        return result.all()
@@ -0,0 +1,48 @@
+from typing import AsyncIterator, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import RowMapping, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.infra.export import EXPORT_BATCH_SIZE
+
+from ...adapters.orm import statistic_row_table, subdivisions_table
+
+
+class SQLAlchemyStatisticExportRepository:
+    """
+    Reads statistic rows for export through a server-side cursor,
+    only one batch of rows is kept in memory at once.
+    Works with the table directly, rows are not loaded as entities.
+    """
+
+    COLUMNS: Sequence[str] = ("id", "subdivision_id", "created", "count_requests")
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session: AsyncSession = session
+
+    async def stream(
+        self,
+        subdivision_id: Optional[UUID] = None,
+        tenant_id: Optional[UUID] = None,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        """
+        Yields batches of rows of the subdivision or of all subdivisions
+        of the tenant, ordered by subdivision and creation time.
+        """
+        rows = statistic_row_table
+        query = (
+            select(*(rows.c[column] for column in self.COLUMNS))
+            .order_by(rows.c.subdivision_id, rows.c.created, rows.c.id)
+            .execution_options(yield_per=batch_size)
+        )
+        if subdivision_id is not None:
+            query = query.where(rows.c.subdivision_id == subdivision_id)
+        if tenant_id is not None:
+            query = query.join(
+                subdivisions_table, subdivisions_table.c.id == rows.c.subdivision_id
+            ).where(subdivisions_table.c.tenant_id == tenant_id)
+        result = await self._session.stream(query)
+        async for batch in result.mappings().partitions():
+            yield batch
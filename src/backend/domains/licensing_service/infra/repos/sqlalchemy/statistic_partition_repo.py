@@ -0,0 +1,129 @@
+from datetime import datetime
+from typing import Any, List, Optional
+
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Result,
+    Table,
+    cast,
+    column,
+    func,
+    literal,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.infra.database.partitions import (
+    add_months,
+    create_monthly_partition_statements,
+    default_partition_name,
+    monthly_partition_name,
+    parse_monthly_partition_name,
+)
+
+from ...adapters.orm import (
+    statistic_daily_rollups_table,
+    statistic_monthly_rollups_table,
+    statistic_row_table,
+)
+
+
+class SQLAlchemyStatisticPartitionRepository:
+    """
+    Maintains monthly partitions of statistic rows:
+    creates them and rolls them up into daily and monthly rollups
+    before they are dropped.
+    """
+
+    TABLE: str = statistic_row_table.name
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session: AsyncSession = session
+
+    async def get_partition_months(self) -> List[datetime]:
+        result: Result = await self._session.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = CAST(:table AS regclass)"
+            ),
+            {"table": self.TABLE},
+        )
+        months = [
+            parse_monthly_partition_name(self.TABLE, name) for name in result.scalars()
+        ]
+        return sorted(month for month in months if month)
+
+    async def get_default_partition_months(self) -> List[datetime]:
+        """
+        Months of rows, which went to the default partition,
+        as there was no partition for them.
+        """
+        default_partition = table(
+            default_partition_name(self.TABLE), column("created", DateTime)
+        )
+        month = func.date_trunc("month", default_partition.c.created)
+        result: Result = await self._session.execute(
+            select(month.distinct()).order_by(month)
+        )
+        return list(result.scalars())
+
+    async def create_partition(self, month: datetime) -> None:
+        for statement in create_monthly_partition_statements(self.TABLE, month):
+            await self._session.execute(text(statement))
+
+    async def roll_up_partition(self, month: datetime) -> None:
+        """
+        Adds requests of the partition to daily and monthly rollups.
+        Must be in one transaction with drop_partition(),
+        so requests are neither lost nor counted twice.
+        """
+        day = func.date_trunc("day", statistic_row_table.c.created)
+        await self._add_to_rollups(
+            rollups=statistic_daily_rollups_table,
+            period_column=statistic_daily_rollups_table.c.day,
+            period=cast(day, Date),
+            month=month,
+            group_by=[day],
+        )
+        await self._add_to_rollups(
+            rollups=statistic_monthly_rollups_table,
+            period_column=statistic_monthly_rollups_table.c.month,
+            period=literal(month.date(), Date),
+            month=month,
+        )
+
+    async def _add_to_rollups(
+        self,
+        rollups: Table,
+        period_column: Column,
+        period: Any,
+        month: datetime,
+        group_by: Optional[List[Any]] = None,
+    ) -> None:
+        rows = statistic_row_table
+        statement = insert(rollups).from_select(
+            ["subdivision_id", period_column.name, "count_requests"],
+            select(rows.c.subdivision_id, period, func.sum(rows.c.count_requests))
+            .where(rows.c.created >= month, rows.c.created < add_months(month, 1))
+            .group_by(rows.c.subdivision_id, *(group_by or [])),
+        )
+        await self._session.execute(
+            statement.on_conflict_do_update(
+                index_elements=["subdivision_id", period_column.name],
+                set_=dict(
+                    count_requests=rollups.c.count_requests
+                    + statement.excluded.count_requests
+                ),
+            )
+        )
+
+    async def drop_partition(self, month: datetime) -> None:
+        await self._session.execute(
+            text(f"DROP TABLE {monthly_partition_name(self.TABLE, month)}")
+        )
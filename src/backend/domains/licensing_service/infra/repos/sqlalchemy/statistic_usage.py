@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from sqlalchemy import DateTime, ScalarSelect, Subquery, cast, func, select, union_all
+
+from ....domain.value_objects.usage_bucket import UsageBucket
+from ...adapters.orm import (
+    statistic_daily_rollups_table,
+    statistic_monthly_rollups_table,
+    statistic_row_table,
+)
+
+
+def statistic_usage_source(precision: UsageBucket = UsageBucket.DAY) -> Subquery:
+    """
+    Requests of subdivisions (subdivision_id, created, count_requests)
+    in statistic rows and in rollups of their dropped partitions.
+    A rollup is a row created at the start of its day (or month),
+    so sums since a moment are exact while it's in kept partitions,
+    and are counted from the next day (month) for older moments.
+    Hour precision reads statistic rows only.
+    """
+    rows = statistic_row_table
+    statistic_rows = select(
+        rows.c.subdivision_id, rows.c.created, rows.c.count_requests
+    )
+    if precision == UsageBucket.HOUR:
+        return statistic_rows.subquery("statistic_usage")
+    if precision == UsageBucket.MONTH:
+        rollups = statistic_monthly_rollups_table
+        period = rollups.c.month
+    else:
+        rollups = statistic_daily_rollups_table
+        period = rollups.c.day
+    return union_all(
+        statistic_rows,
+        select(
+            rollups.c.subdivision_id,
+            cast(period, DateTime).label("created"),
+            rollups.c.count_requests,
+        ),
+    ).subquery("statistic_usage")
+
+
+def rolled_up_until() -> ScalarSelect:
+    """
+    Moment, since which statistic rows are kept, NULL if nothing
+    was rolled up.
+    """
+    daily_rollups = statistic_daily_rollups_table
+    return select(
+        cast(func.max(daily_rollups.c.day), DateTime) + timedelta(days=1)
+    ).scalar_subquery()
@@ -1,22 +1,54 @@
-from typing import Any, List, Optional, Sequence
+from datetime import datetime
+from typing import Any, Collection, Dict, List, Optional, Sequence, Set, Tuple
 from uuid import UUID
 
-from sqlalchemy import Result, Row, RowMapping, delete, insert, select, update
-from sqlalchemy.orm import selectinload
+from sqlalchemy import (
+    ARRAY,
+    Integer,
+    Result,
+    Row,
+    RowMapping,
+    and_,
+    case,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    true,
+    update,
+)
+from sqlalchemy import UUID as ALCH_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload, selectinload
 
 from backend.core.domain.entity import AbstractEntity
+from backend.core.infra.database.pagination import paginate
 from backend.core.infra.database.repositories import SQLAlchemyAbstractRepository
+from backend.core.infra.pagination import PageRequest
 
 from ....domain.aggregates.entities.license import License
 from ....domain.aggregates.entities.stat_row import StatisticRow
 from ....domain.aggregates.subdivision import Subdivision
 from ....domain.services.repos.subdivision_repo import SubdivisionRepository
+from ....domain.value_objects.license_status import LicenseStatus
+from ....domain.value_objects.license_type import LicenseType
+from ....domain.value_objects.work_status import WorkStatus
+from ...adapters.orm import lisenses_table, statistic_row_table, subdivisions_table
+from .statistic_usage import rolled_up_until, statistic_usage_source
 
 
 class SQLAlchemySubdivisionRepository(
     SQLAlchemyAbstractRepository, SubdivisionRepository
 ):
 
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session=session)
+        # Ids of aggregates, which were loaded without statistics:
+        self._without_statistics: Set[UUID] = set()
+
     async def add(self, model: AbstractEntity) -> Subdivision:
         print(f"model: {model}")
         for_save = await model.to_dict(
@@ -62,7 +94,38 @@ class SQLAlchemySubdivisionRepository(
         )
         return result.scalar_one()
 
-    async def list(self) -> List[Subdivision]:
+    # Relations of subdivision, which can be loaded with it:
+    RELATIONS: Tuple[str, ...] = ("licenses", "statistics")
+
+    @classmethod
+    def _loader_options(cls, include: Optional[Collection[str]]) -> List[Any]:
+        """
+        Relations, which are not in include, are not loaded and stay empty.
+        None - all relations are loaded.
+        """
+        return [
+            (
+                selectinload(getattr(Subdivision, relation))
+                if include is None or relation in include
+                else noload(getattr(Subdivision, relation))
+            )
+            for relation in cls.RELATIONS
+        ]
+
+    # Fields, by which list of subdivisions can be sorted:
+    SORT_COLUMNS: Dict[str, Any] = {
+        "id": subdivisions_table.c.id,
+        "name": subdivisions_table.c.name,
+    }
+
+    async def list(
+        self,
+        page: Optional[PageRequest] = None,
+        tenant_id: Optional[UUID] = None,
+        work_status: Optional[str] = None,
+        license_status: Optional[str] = None,
+        include: Optional[Collection[str]] = None,
+    ) -> List[Subdivision]:
         """
         Returning result object instead of converting to new objects by
         [TenantModel(**await r.to_dict()) for r in result.scalars().all()]
@@ -70,14 +133,28 @@ class SQLAlchemySubdivisionRepository(
 
         Checking by asserts, that expected return type is equal
         to fact return type.
-        """
 
-        result: Result = await self._session.execute(
-            select(Subdivision).options(
-                selectinload(Subdivision.licenses),
-                selectinload(Subdivision.statistics),
+        Filters are applied in SQL, license_status keeps subdivisions,
+        which have a license with this status.
+        With page returns subdivisions of the page and one more,
+        if there is the next page.
+        include: relations to load, None - all.
+        """
+        query = select(Subdivision).options(*self._loader_options(include))
+        if tenant_id is not None:
+            query = query.where(subdivisions_table.c.tenant_id == tenant_id)
+        if work_status is not None:
+            query = query.where(subdivisions_table.c.work_status == work_status)
+        if license_status is not None:
+            query = query.where(
+                exists().where(
+                    lisenses_table.c.subdivision_id == subdivisions_table.c.id,
+                    lisenses_table.c.status == license_status,
+                )
             )
-        )
+        if page is not None:
+            query = paginate(query, page, sort_columns=self.SORT_COLUMNS)
+        result: Result = await self._session.execute(query)
         subdivisions: Sequence[Row | RowMapping | Any] = result.scalars().all()
 
         assert isinstance(subdivisions, List)
@@ -86,30 +163,52 @@ class SQLAlchemySubdivisionRepository(
 
         return subdivisions
 
-    async def get(self, id: UUID) -> Optional[Subdivision]:
-        subdivision_result: Result = await self._session.execute(
+    async def get(
+        self,
+        id: UUID,
+        for_update: bool = False,
+        with_statistics: bool = True,
+        include: Optional[Collection[str]] = None,
+    ) -> Optional[Subdivision]:
+        """
+        for_update locks the subdivision row and rows of its licenses
+        till the end of transaction, so concurrent changes of the same
+        subdivision are applied one by one, also with add_usage and
+        add_usage_batch, which lock only the license row. Licenses are locked
+        first and in order of id, same as in add_usage_batch, so the paths
+        do not deadlock.
+        with_statistics=False leaves statistics empty, new rows added to
+        the aggregate are still saved by save() of this instance,
+        existing ones are not touched.
+        include: relations to load for reading, None - all.
+
+        Returns the instance of the session, so the session tracks changes
+        of the aggregate and its entities for save().
+        """
+        if not with_statistics:
+            include = set(self.RELATIONS if include is None else include)
+            include.discard("statistics")
+        query = (
             select(Subdivision)
-            .options(
-                selectinload(Subdivision.licenses),
-                selectinload(Subdivision.statistics),
-            )
+            .options(*self._loader_options(include))
             .filter_by(id=id)
         )
+        if for_update:
+            await self._session.execute(
+                select(lisenses_table.c.id)
+                .where(lisenses_table.c.subdivision_id == id)
+                .order_by(lisenses_table.c.id)
+                .with_for_update()
+            )
+            # Values are read again after the lock, the session may keep
+            # the ones read before it:
+            query = query.with_for_update().execution_options(
+                populate_existing=True
+            )
+        subdivision_result: Result = await self._session.execute(query)
         subdivision: Optional[Subdivision] = subdivision_result.scalar_one_or_none()
-        if not subdivision:
-            return None
-        subdivision = Subdivision.make_from_persistence(
-            id=subdivision.id,
-            name=subdivision.name,
-            location=subdivision.location,
-            tenant_id=subdivision.tenant_id,
-            work_status=subdivision.work_status,
-            link_to_subdivision_processing_domain=(
-                subdivision.link_to_subdivision_processing_domain
-            ),
-            licenses=subdivision.licenses,
-            statistics=subdivision.statistics,
-        )
+        if subdivision is not None and not with_statistics:
+            self._without_statistics.add(subdivision.id)
         return subdivision
 
     async def get_license_by_id(self, license_id: UUID) -> Optional[License]:
@@ -137,8 +236,330 @@ class SQLAlchemySubdivisionRepository(
         print(f"stats_row: {stats_row}")
         return stats_row
 
+    @staticmethod
+    def _license_usage_values(added_requests: Any, created: datetime) -> dict:
+        """
+        Values for UPDATE of the active license, which adds requests
+        to its counter and deactivates it when the limit is reached
+        (same rule as Subdivision.save_day_statistic).
+        """
+        licenses = lisenses_table
+        used_requests = licenses.c.used_requests + added_requests
+        limit_reached = used_requests >= licenses.c.count_requests
+        return dict(
+            used_requests=used_requests,
+            status=case(
+                (limit_reached, LicenseStatus.INACTIVE), else_=licenses.c.status
+            ),
+            expirated=case((limit_reached, created), else_=licenses.c.expirated),
+        )
+
+    @staticmethod
+    def _expired_subdivision_columns() -> List[Any]:
+        subdivisions = subdivisions_table
+        return [
+            subdivisions.c.name.label("subdivision_name"),
+            subdivisions.c.location.label("subdivision_location"),
+            subdivisions.c.tenant_id.label("subdivision_tenant_id"),
+            subdivisions.c.link_to_subdivision_processing_domain.label(
+                "subdivision_link_to_subdivision_processing_domain"
+            ),
+            subdivisions.c.work_status.label("subdivision_work_status"),
+        ]
+
+    async def add_usage(
+        self,
+        subdivision_id: UUID,
+        count_requests: int,
+        statistic_row_id: UUID,
+        created: datetime,
+    ) -> Optional[Row]:
+        """
+        Records usage in one statement, without loading the aggregate:
+        - increments counter of the active license, deactivating it
+          when the limit is reached (same rule as Subdivision.save_day_statistic),
+        - deactivates subdivision, if its license was deactivated,
+        - inserts statistic row.
+        Concurrent calls are serialized by the license row lock of UPDATE.
+        Returns None, if subdivision is not active or has no active license.
+        """
+        licenses = lisenses_table
+        subdivisions = subdivisions_table
+        statistic_rows = statistic_row_table
+
+        license_cte = (
+            update(licenses)
+            .where(
+                licenses.c.subdivision_id == subdivision_id,
+                licenses.c.status == LicenseStatus.ACTIVE,
+                exists().where(
+                    subdivisions.c.id == subdivision_id,
+                    subdivisions.c.work_status == WorkStatus.ACTIVE,
+                ),
+            )
+            .values(**self._license_usage_values(count_requests, created))
+            .returning(*licenses.c)
+            .cte("license_usage")
+        )
+        subdivision_cte = (
+            update(subdivisions)
+            .where(
+                subdivisions.c.id == subdivision_id,
+                exists().where(license_cte.c.status == LicenseStatus.INACTIVE),
+            )
+            .values(work_status=WorkStatus.INACTIVE)
+            .returning(*self._expired_subdivision_columns())
+            .cte("expired_subdivision")
+        )
+        statistic_row_cte = (
+            insert(statistic_rows)
+            .from_select(
+                ["id", "created", "count_requests", "subdivision_id"],
+                select(
+                    literal(statistic_row_id, ALCH_UUID),
+                    literal(created),
+                    literal(count_requests),
+                    literal(subdivision_id, ALCH_UUID),
+                ).select_from(license_cte),
+            )
+            .returning(statistic_rows.c.id.label("statistic_row_id"))
+            .cte("statistic_row")
+        )
+        result: Result = await self._session.execute(
+            select(license_cte, statistic_row_cte, subdivision_cte).select_from(
+                license_cte.join(statistic_row_cte, true()).outerjoin(
+                    subdivision_cte, true()
+                )
+            )
+        )
+        return result.first()
+
+    async def get_usage_state(self, subdivision_id: UUID) -> Optional[Row]:
+        """
+        Returns work status of subdivision and whether it has an active license.
+        """
+        has_active_license = exists().where(
+            lisenses_table.c.subdivision_id == subdivision_id,
+            lisenses_table.c.status == LicenseStatus.ACTIVE,
+        )
+        result: Result = await self._session.execute(
+            select(
+                subdivisions_table.c.work_status,
+                has_active_license.label("has_active_license"),
+            ).where(subdivisions_table.c.id == subdivision_id)
+        )
+        return result.first()
+
+    async def add_usage_batch(
+        self, requests_by_subdivision: Dict[UUID, int], created: datetime
+    ) -> Sequence[Row]:
+        """
+        Set-wise version of add_usage for many subdivisions:
+        one statement adds requests to counters of all active licenses
+        and deactivates licenses and subdivisions which reached the limit.
+        Statistic rows are inserted separately by add_statistic_rows.
+        Licenses are locked in order of id, so concurrent batches
+        do not deadlock.
+        Returns rows only for subdivisions which accepted the usage.
+        """
+        licenses = lisenses_table
+        subdivisions = subdivisions_table
+
+        batch = (
+            func.unnest(
+                literal(list(requests_by_subdivision.keys()), ARRAY(ALCH_UUID)),
+                literal(list(requests_by_subdivision.values()), ARRAY(Integer)),
+            )
+            .table_valued("subdivision_id", "count_requests")
+            .render_derived(name="batch")
+        )
+        locked_licenses = (
+            select(licenses.c.id, batch.c.count_requests)
+            .join(batch, batch.c.subdivision_id == licenses.c.subdivision_id)
+            .join(subdivisions, subdivisions.c.id == licenses.c.subdivision_id)
+            .where(
+                licenses.c.status == LicenseStatus.ACTIVE,
+                subdivisions.c.work_status == WorkStatus.ACTIVE,
+            )
+            .order_by(licenses.c.id)
+            .with_for_update(of=licenses)
+            .cte("locked_licenses")
+        )
+        license_cte = (
+            update(licenses)
+            .where(licenses.c.id == locked_licenses.c.id)
+            .values(
+                **self._license_usage_values(locked_licenses.c.count_requests, created)
+            )
+            .returning(*licenses.c)
+            .cte("license_usage")
+        )
+        subdivision_cte = (
+            update(subdivisions)
+            .where(
+                subdivisions.c.id.in_(
+                    select(license_cte.c.subdivision_id).where(
+                        license_cte.c.status == LicenseStatus.INACTIVE
+                    )
+                )
+            )
+            .values(work_status=WorkStatus.INACTIVE)
+            .returning(
+                subdivisions.c.id.label("expired_subdivision_id"),
+                *self._expired_subdivision_columns(),
+            )
+            .cte("expired_subdivision")
+        )
+        result: Result = await self._session.execute(
+            select(license_cte, subdivision_cte).select_from(
+                license_cte.outerjoin(
+                    subdivision_cte,
+                    subdivision_cte.c.expired_subdivision_id
+                    == license_cte.c.subdivision_id,
+                )
+            )
+        )
+        return result.all()
+
+    async def add_statistic_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Inserts statistic rows with one executemany.
+        """
+        if rows:
+            await self._session.execute(insert(statistic_row_table), rows)
+
+    async def expire_licenses(self, now: datetime, limit: int) -> Sequence[Row]:
+        """
+        Deactivates at most `limit` active licenses of type by time, which
+        expired by `now`, and their subdivisions, set-wise in one statement.
+        Licenses locked by other transactions are skipped, so concurrent
+        sweepers take different licenses.
+        Returns rows of deactivated licenses with their subdivisions.
+        """
+        licenses = lisenses_table
+        subdivisions = subdivisions_table
+
+        # Values are rendered in SQL, so the partial index of expiration
+        # matches also prepared statements:
+        active = literal(LicenseStatus.ACTIVE, literal_execute=True)
+        by_time = literal(LicenseType.BYTIME, literal_execute=True)
+        expired_licenses = (
+            select(licenses.c.id)
+            .where(
+                licenses.c.status == active,
+                licenses.c.type == by_time,
+                licenses.c.expiration <= now,
+            )
+            .order_by(licenses.c.expiration)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("expired_licenses")
+        )
+        license_cte = (
+            update(licenses)
+            .where(licenses.c.id == expired_licenses.c.id)
+            .values(status=LicenseStatus.INACTIVE, expirated=now)
+            .returning(*licenses.c)
+            .cte("license_expiration")
+        )
+        subdivision_cte = (
+            update(subdivisions)
+            .where(subdivisions.c.id.in_(select(license_cte.c.subdivision_id)))
+            .values(work_status=WorkStatus.INACTIVE)
+            .returning(
+                subdivisions.c.id.label("expired_subdivision_id"),
+                *self._expired_subdivision_columns(),
+            )
+            .cte("expired_subdivision")
+        )
+        result: Result = await self._session.execute(
+            select(license_cte, subdivision_cte).select_from(
+                license_cte.outerjoin(
+                    subdivision_cte,
+                    subdivision_cte.c.expired_subdivision_id
+                    == license_cte.c.subdivision_id,
+                )
+            )
+        )
+        return result.all()
+
+    async def get_usage_states(self, subdivision_ids: List[UUID]) -> Sequence[Row]:
+        """
+        Batch version of get_usage_state, rows also contain subdivision id.
+        """
+        has_active_license = exists().where(
+            lisenses_table.c.subdivision_id == subdivisions_table.c.id,
+            lisenses_table.c.status == LicenseStatus.ACTIVE,
+        )
+        result: Result = await self._session.execute(
+            select(
+                subdivisions_table.c.id,
+                subdivisions_table.c.work_status,
+                has_active_license.label("has_active_license"),
+            ).where(subdivisions_table.c.id.in_(subdivision_ids))
+        )
+        return result.all()
+
+    async def get_license_counters(self) -> Sequence[Row]:
+        """
+        Returns request counters of all active licenses together with
+        the number of requests recomputed from statistic rows.
+        Licenses activated before the kept statistic rows are skipped,
+        rollups do not give their exact number.
+        """
+        usage = statistic_usage_source()
+        kept_since = rolled_up_until()
+        actual_requests = func.coalesce(func.sum(usage.c.count_requests), 0)
+        result: Result = await self._session.execute(
+            select(
+                License.id,
+                License.subdivision_id,
+                License.used_requests,
+                actual_requests.label("actual_requests"),
+            )
+            .outerjoin(
+                usage,
+                and_(
+                    usage.c.subdivision_id == License.subdivision_id,
+                    usage.c.created > License.activated,
+                ),
+            )
+            .where(
+                License.status == LicenseStatus.ACTIVE,
+                or_(kept_since.is_(None), License.activated >= kept_since),
+            )
+            .group_by(License.id)
+        )
+        return result.all()
+
+    async def set_license_used_requests(
+        self, license_id: UUID, used_requests: int, expected_used_requests: int
+    ) -> bool:
+        """
+        Updates counter only if it was not changed since it was read.
+        """
+        result: Result = await self._session.execute(
+            update(License)
+            .filter_by(id=license_id, used_requests=expected_used_requests)
+            .values(used_requests=used_requests)
+        )
+        return result.rowcount == 1
+
     async def save(self, subdivision: Subdivision) -> Subdivision:
-        print(f"subdivision: {subdivision}")
-        new_sub = await self._session.merge(subdivision)
-        print(f"new_sub: {new_sub}")
-        return new_sub
+        """
+        Aggregate loaded by get() is flushed with its changes only:
+        changed columns of changed licenses are updated, added entities
+        are inserted and removed ones are deleted (delete-orphan).
+        Aggregate built outside of the session is merged.
+        Aggregate loaded without statistics is never merged: merge would
+        delete its stored statistic rows as orphans.
+        """
+        if subdivision not in self._session:
+            if subdivision.id in self._without_statistics:
+                raise ValueError(
+                    f"Subdivision {subdivision.id} was loaded without statistics, "
+                    "it can be saved only while it is in the session"
+                )
+            return await self._session.merge(subdivision)
+        await self._session.flush()
+        return subdivision
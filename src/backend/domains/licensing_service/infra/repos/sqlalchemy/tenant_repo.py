@@ -1,31 +1,78 @@
-from typing import Any, List, Optional, Sequence
+from typing import Any, Collection, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 
-from sqlalchemy import Result, Row, RowMapping, delete, insert, select, update
-from sqlalchemy.orm import selectinload
+from sqlalchemy import (
+    Result,
+    Row,
+    RowMapping,
+    delete,
+    exists,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.orm import noload, selectinload
 
 from backend.core.domain.entity import AbstractEntity
+from backend.core.infra.database.pagination import paginate
 from backend.core.infra.database.repositories import SQLAlchemyAbstractRepository
+from backend.core.infra.pagination import PageRequest
 
 from ....domain.aggregates.subdivision import Subdivision
 from ....domain.aggregates.tenant import Tenant
 
 # from ....domain.aggregates.entities.user import User
 from ....domain.services.repos.tenant_repo import TenantRepository
+from ...adapters.orm import lisenses_table, subdivisions_table, tenants_table
 
 
 class SQLAlchemyTenantRepository(SQLAlchemyAbstractRepository, TenantRepository):
 
-    async def get(self, id: UUID) -> Optional[Tenant]:
-        result: Result = await self._session.execute(
-            select(Tenant)
-            .options(
-                selectinload(Tenant.subdivisions).selectinload(Subdivision.licenses),
-                selectinload(Tenant.subdivisions).selectinload(Subdivision.statistics),
-                selectinload(Tenant.subdivisions),
-                selectinload(Tenant.users),
+    # Relations of tenant, which can be loaded with it,
+    # relations of subdivisions are loaded with subdivisions only:
+    RELATIONS: Tuple[str, ...] = (
+        "users",
+        "subdivisions",
+        "subdivisions.licenses",
+        "subdivisions.statistics",
+    )
+
+    @classmethod
+    def _loader_options(cls, include: Optional[Collection[str]]) -> List[Any]:
+        """
+        Relations, which are not in include, are not loaded and stay empty.
+        None - all relations are loaded.
+        """
+        if include is None:
+            include = cls.RELATIONS
+        options = [
+            selectinload(Tenant.users) if "users" in include else noload(Tenant.users)
+        ]
+        if "subdivisions" not in include:
+            options.append(noload(Tenant.subdivisions))
+            return options
+        options.append(
+            selectinload(Tenant.subdivisions).options(
+                *(
+                    (
+                        selectinload(getattr(Subdivision, relation))
+                        if f"subdivisions.{relation}" in include
+                        else noload(getattr(Subdivision, relation))
+                    )
+                    for relation in ("licenses", "statistics")
+                )
             )
-            .filter_by(id=id)
+        )
+        return options
+
+    async def get(
+        self, id: UUID, include: Optional[Collection[str]] = None
+    ) -> Optional[Tenant]:
+        """
+        include: relations to load for reading, None - all.
+        """
+        result: Result = await self._session.execute(
+            select(Tenant).options(*self._loader_options(include)).filter_by(id=id)
         )
         tenant = result.scalar_one_or_none()
         if not tenant:
@@ -103,10 +150,24 @@ class SQLAlchemyTenantRepository(SQLAlchemyAbstractRepository, TenantRepository)
     async def save(self, tenant: Tenant) -> Subdivision:
         print(f"tenant: {tenant}")
         new_tenant = await self._session.merge(tenant)
+        # Id of a new tenant is generated on insert, its events need it:
+        await self._session.flush()
         print(f"new_tenant: {new_tenant}")
         return new_tenant
 
-    async def list(self) -> List[Tenant]:
+    # Fields, by which list of tenants can be sorted:
+    SORT_COLUMNS: Dict[str, Any] = {
+        "id": tenants_table.c.id,
+        "name": tenants_table.c.name,
+    }
+
+    async def list(
+        self,
+        page: Optional[PageRequest] = None,
+        name: Optional[str] = None,
+        license_status: Optional[str] = None,
+        include: Optional[Collection[str]] = None,
+    ) -> List[Tenant]:
         """
         Returning result object instead of converting to new objects by
         [TenantModel(**await r.to_dict()) for r in result.scalars().all()]
@@ -114,15 +175,33 @@ class SQLAlchemyTenantRepository(SQLAlchemyAbstractRepository, TenantRepository)
 
         Checking by asserts, that expected return type is equal
         to fact return type.
+
+        Filters are applied in SQL: name - part of the name,
+        license_status keeps tenants, which have a license with this status.
+        With page returns tenants of the page and one more,
+        if there is the next page.
+        include: relations to load, None - all.
         """
-        db_result: Result = await self._session.execute(
-            select(Tenant).options(
-                selectinload(Tenant.subdivisions).selectinload(Subdivision.licenses),
-                selectinload(Tenant.subdivisions).selectinload(Subdivision.statistics),
-                selectinload(Tenant.subdivisions),
-                selectinload(Tenant.users),
+        query = select(Tenant).options(*self._loader_options(include))
+        if name is not None:
+            query = query.where(tenants_table.c.name.icontains(name, autoescape=True))
+        if license_status is not None:
+            query = query.where(
+                exists()
+                .select_from(
+                    lisenses_table.join(
+                        subdivisions_table,
+                        subdivisions_table.c.id == lisenses_table.c.subdivision_id,
+                    )
+                )
+                .where(
+                    subdivisions_table.c.tenant_id == tenants_table.c.id,
+                    lisenses_table.c.status == license_status,
+                )
             )
-        )
+        if page is not None:
+            query = paginate(query, page, sort_columns=self.SORT_COLUMNS)
+        db_result: Result = await self._session.execute(query)
         db_tenants: Sequence[Row | RowMapping | Any] = db_result.scalars().all()
         assert isinstance(db_tenants, List)
         tenant_list = []
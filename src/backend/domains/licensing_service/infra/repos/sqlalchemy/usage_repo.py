@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import Result, Row, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ....domain.value_objects.usage_bucket import UsageBucket
+from ...adapters.orm import subdivisions_table
+from .statistic_usage import statistic_usage_source
+
+
+class SQLAlchemyUsageRepository:
+    """
+    Usage of subdivisions over time, summed by the database
+    into hour, day or month buckets.
+    Day and month buckets also read rollups of dropped partitions,
+    month buckets read monthly rollups, so long periods stay cheap.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session: AsyncSession = session
+
+    @staticmethod
+    def _to_naive(moment: datetime) -> datetime:
+        # Statistic rows are stored in local time without time zone:
+        if moment.tzinfo:
+            return moment.astimezone().replace(tzinfo=None)
+        return moment
+
+    async def get_usage(
+        self,
+        bucket: UsageBucket,
+        subdivision_id: Optional[UUID] = None,
+        tenant_id: Optional[UUID] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Sequence[Row]:
+        """
+        Returns rows (start, count_requests) of buckets with requests,
+        ordered by start, of the subdivision or of all subdivisions
+        of the tenant, created in [start, end).
+        """
+        usage = statistic_usage_source(precision=bucket)
+        bucket_start = func.date_trunc(bucket.value, usage.c.created).label("start")
+        count_requests = func.sum(usage.c.count_requests).label("count_requests")
+        query = (
+            select(bucket_start, count_requests)
+            .group_by(bucket_start)
+            .order_by(bucket_start)
+        )
+        if subdivision_id is not None:
+            query = query.where(usage.c.subdivision_id == subdivision_id)
+        if tenant_id is not None:
+            query = query.join(
+                subdivisions_table, subdivisions_table.c.id == usage.c.subdivision_id
+            ).where(subdivisions_table.c.tenant_id == tenant_id)
+        if start is not None:
+            query = query.where(usage.c.created >= self._to_naive(start))
+        if end is not None:
+            query = query.where(usage.c.created < self._to_naive(end))
+        result: Result = await self._session.execute(query)
+        return result.all()
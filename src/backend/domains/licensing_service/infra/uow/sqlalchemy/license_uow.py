@@ -1,15 +1,14 @@
 from typing import Self
 
-from backend.core.infra.database.units_of_work import SQLAlchemyAbstractUnitOfWork
-
 from ....domain.services.repos.license_repo import LicenseRepository
 from ....domain.services.uow.license_uow import LicenseUnitOfWork
 from ...repos.sqlalchemy.license_repo import (  # SQLAlchemyUserStatisticsRepository,; SQLAlchemyUserVotesRepository
     SQLAlchemyLicenseRepository,
 )
+from .outbox_uow import SQLAlchemyOutboxUnitOfWork
 
 
-class SQLAlchemyLicenseUnitOfWork(SQLAlchemyAbstractUnitOfWork, LicenseUnitOfWork):
+class SQLAlchemyLicenseUnitOfWork(SQLAlchemyOutboxUnitOfWork, LicenseUnitOfWork):
 
     async def __aenter__(self) -> Self:
         uow = await super().__aenter__()
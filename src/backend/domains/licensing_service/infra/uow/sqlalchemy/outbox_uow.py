@@ -0,0 +1,32 @@
+from typing import Self
+
+from backend.core.infra.database.units_of_work import SQLAlchemyAbstractUnitOfWork
+
+from ...adapters.outbox_relay import notify_outbox_relay
+from ...repos.sqlalchemy.outbox_repo import SQLAlchemyOutboxRepository
+
+
+class SQLAlchemyOutboxUnitOfWork(SQLAlchemyAbstractUnitOfWork):
+    """
+    Unit of work, which stores events added by uow.add_event()
+    to the outbox table in the same transaction, as all other changes.
+    Events are sent to broker later by OutboxRelay.
+    """
+
+    async def __aenter__(self) -> Self:
+        uow = await super().__aenter__()
+        self.outbox: SQLAlchemyOutboxRepository = SQLAlchemyOutboxRepository(
+            session=self._session
+        )
+        return uow
+
+    async def commit(self) -> None:
+        stored = await self.outbox.add_events(list(self.get_events()))
+        await super().commit()
+        if stored:
+            notify_outbox_relay()
+
+    async def rollback(self) -> None:
+        # Events of not commited changes should not be published:
+        self._events.clear()
+        await super().rollback()
@@ -0,0 +1,31 @@
+from typing import Self
+
+from backend.core.infra.database.units_of_work import SQLAlchemyAbstractUnitOfWork
+
+from ...repos.sqlalchemy.read_model_repo import SQLAlchemyReadModelRepository
+from ...repos.sqlalchemy.statistic_export_repo import (
+    SQLAlchemyStatisticExportRepository,
+)
+from ...repos.sqlalchemy.usage_repo import SQLAlchemyUsageRepository
+
+
+class SQLAlchemyReadModelUnitOfWork(SQLAlchemyAbstractUnitOfWork):
+    """
+    Unit of work for read models. Read models are refreshed
+    from already commited changes, so no events are stored here.
+    Also gives streaming reads of statistic rows for export
+    and usage over time.
+    """
+
+    async def __aenter__(self) -> Self:
+        uow = await super().__aenter__()
+        self.read_models: SQLAlchemyReadModelRepository = (
+            SQLAlchemyReadModelRepository(session=self._session)
+        )
+        self.statistic_rows: SQLAlchemyStatisticExportRepository = (
+            SQLAlchemyStatisticExportRepository(session=self._session)
+        )
+        self.usage: SQLAlchemyUsageRepository = SQLAlchemyUsageRepository(
+            session=self._session
+        )
+        return uow
@@ -0,0 +1,21 @@
+from typing import Self
+
+from backend.core.infra.database.units_of_work import SQLAlchemyAbstractUnitOfWork
+
+from ...repos.sqlalchemy.statistic_partition_repo import (
+    SQLAlchemyStatisticPartitionRepository,
+)
+
+
+class SQLAlchemyStatisticPartitionUnitOfWork(SQLAlchemyAbstractUnitOfWork):
+    """
+    Unit of work for maintenance of partitions of statistic rows.
+    Rollup and drop of a partition are commited together.
+    """
+
+    async def __aenter__(self) -> Self:
+        uow = await super().__aenter__()
+        self.statistic_partitions: SQLAlchemyStatisticPartitionRepository = (
+            SQLAlchemyStatisticPartitionRepository(session=self._session)
+        )
+        return uow
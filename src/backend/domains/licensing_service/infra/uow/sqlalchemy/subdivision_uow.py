@@ -1,14 +1,13 @@
 from typing import Self
 
-from backend.core.infra.database.units_of_work import SQLAlchemyAbstractUnitOfWork
-
 from ....domain.services.repos.subdivision_repo import SubdivisionRepository
 from ....domain.services.uow.subdivision_uow import SubdivisionUnitOfWork
 from ...repos.sqlalchemy.subdivision_repo import SQLAlchemySubdivisionRepository
+from .outbox_uow import SQLAlchemyOutboxUnitOfWork
 
 
 class SQLAlchemySubdivisionUnitOfWork(
-    SQLAlchemyAbstractUnitOfWork, SubdivisionUnitOfWork
+    SQLAlchemyOutboxUnitOfWork, SubdivisionUnitOfWork
 ):
 
     async def __aenter__(self) -> Self:
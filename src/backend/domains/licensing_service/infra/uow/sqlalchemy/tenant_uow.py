@@ -1,7 +1,5 @@
 from typing import Self
 
-from backend.core.infra.database.units_of_work import SQLAlchemyAbstractUnitOfWork
-
 from ....domain.services.repos.subdivision_repo import SubdivisionRepository
 from ....domain.services.repos.tenant_repo import TenantRepository
 from ....domain.services.repos.user_repo import UserRepository
@@ -9,9 +7,10 @@ from ....domain.services.uow.tenant_uow import TenantUnitOfWork
 from ...repos.sqlalchemy.subdivision_repo import SQLAlchemySubdivisionRepository
 from ...repos.sqlalchemy.tenant_repo import SQLAlchemyTenantRepository
 from ...repos.sqlalchemy.user_repo import SQLAlchemyUserRepository
+from .outbox_uow import SQLAlchemyOutboxUnitOfWork
 
 
-class SQLAlchemyTenantUnitOfWork(SQLAlchemyAbstractUnitOfWork, TenantUnitOfWork):
+class SQLAlchemyTenantUnitOfWork(SQLAlchemyOutboxUnitOfWork, TenantUnitOfWork):
 
     async def __aenter__(self) -> Self:
         uow = await super().__aenter__()
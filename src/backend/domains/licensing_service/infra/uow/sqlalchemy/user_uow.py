@@ -1,13 +1,12 @@
 from typing import Self
 
-from backend.core.infra.database.units_of_work import SQLAlchemyAbstractUnitOfWork
-
 from ....domain.services.repos.user_repo import UserRepository
 from ....domain.services.uow.user_uow import UserUnitOfWork
 from ...repos.sqlalchemy.user_repo import SQLAlchemyUserRepository
+from .outbox_uow import SQLAlchemyOutboxUnitOfWork
 
 
-class SQLAlchemyUserUnitOfWork(SQLAlchemyAbstractUnitOfWork, UserUnitOfWork):
+class SQLAlchemyUserUnitOfWork(SQLAlchemyOutboxUnitOfWork, UserUnitOfWork):
 
     async def __aenter__(self) -> Self:
         uow = await super().__aenter__()
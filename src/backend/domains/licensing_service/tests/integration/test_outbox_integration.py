@@ -0,0 +1,264 @@
+# tests/integration/test_outbox_integration.py
+import asyncio
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import insert, select, update
+
+from backend.core.infra.eventbus import AbstractEventBus
+from backend.domains.licensing_service.app.services.tenant_services import (
+    TenantService,
+)
+from backend.domains.licensing_service.domain.services.commands.tenant_commands import (
+    CreateTenantCommand,
+)
+from backend.domains.licensing_service.domain.services.events import (
+    statistic_row_events,
+    subdivision_events,
+    tenant_events,
+)
+from backend.domains.licensing_service.infra.adapters.kafka_adapter import (
+    make_event_key,
+)
+from backend.domains.licensing_service.infra.adapters.orm import outbox_table
+from backend.domains.licensing_service.infra.adapters.outbox_relay import OutboxRelay
+
+
+class MockEventBus(AbstractEventBus):
+    def __init__(self):
+        self.events = []
+
+    def add_event(self, event):
+        self.events.append(event)
+
+
+class MockSendFuture:
+    def __init__(self, error=None, acknowledged=True):
+        self.error = error
+        self.acknowledged = acknowledged
+        self.callbacks = []
+
+    def add_callback(self, callback):
+        if self.error is None and self.acknowledged:
+            callback(None)
+        self.callbacks.append(callback)
+        return self
+
+    def add_errback(self, errback):
+        if self.error is not None:
+            errback(self.error)
+        return self
+
+    def acknowledge(self):
+        for callback in self.callbacks:
+            callback(None)
+
+
+class MockProducer:
+    def __init__(self, error=None, acknowledged=True):
+        self.error = error
+        self.acknowledged = acknowledged
+        self.messages = []
+        self.futures = []
+
+    def send(self, topic, key=None, value=None):
+        self.messages.append((topic, key, value))
+        self.futures.append(MockSendFuture(self.error, self.acknowledged))
+        return self.futures[-1]
+
+
+async def create_tenant(db_session):
+    service = TenantService(
+        domain_event_bus=MockEventBus(),
+        infra_event_bus=MockEventBus(),
+        db_session_factory=db_session,
+    )
+    return await service.create_tenant(
+        CreateTenantCommand(
+            user_id=uuid4(),
+            name="Tenant 1",
+            address="123 Main St",
+            email="tenant1@example.com",
+            phone="+123456789",
+        )
+    )
+
+
+async def get_outbox_rows(db_session):
+    async with db_session() as session:
+        result = await session.execute(select(outbox_table))
+        return result.all()
+
+
+@pytest.mark.asyncio
+async def test_event_is_stored_in_outbox_with_changes(db_session):
+    tenant = await create_tenant(db_session)
+
+    rows = await get_outbox_rows(db_session)
+    assert len(rows) == 1
+    assert rows[0].event_type == "TenantCreatedEvent"
+    assert rows[0].key == tenant.id.bytes
+    assert rows[0].sent is None
+    assert rows[0].attempts == 0
+
+
+def test_events_of_subdivision_have_its_key():
+    subdivision_id = uuid4()
+    subdivision_event = subdivision_events.SubdivisionUpdatedEvent(
+        name="Subdivision",
+        location="City",
+        tenant_id=uuid4(),
+        link_to_subdivision_processing_domain="",
+        work_status="active",
+        id=subdivision_id,
+    )
+    statistic_row_event = statistic_row_events.StatisticRowAddedEvent(
+        id=uuid4(),
+        created=datetime.now(),
+        count_requests=1,
+        subdivision_id=subdivision_id,
+    )
+
+    assert make_event_key(subdivision_event) == subdivision_id.bytes
+    assert make_event_key(statistic_row_event) == subdivision_id.bytes
+
+
+def test_event_without_aggregate_id_has_no_key():
+    tenant_event = tenant_events.TenantCreatedEvent(
+        id=None,
+        name="Tenant",
+        address="123 Main St",
+        email="tenant@example.com",
+        phone="+123456789",
+    )
+
+    assert make_event_key(tenant_event) is None
+
+
+@pytest.mark.asyncio
+async def test_relay_marks_acknowledged_messages_as_sent(db_session):
+    await create_tenant(db_session)
+    producer = MockProducer()
+    relay = OutboxRelay(session_factory=db_session, producer=producer)
+
+    assert await relay.relay_batch() == 1
+    assert len(producer.messages) == 1
+
+    rows = await get_outbox_rows(db_session)
+    assert rows[0].sent is not None
+    assert rows[0].payload == producer.messages[0][2]
+
+    # Sent messages are not relayed again:
+    assert await relay.relay_batch() == 0
+
+
+@pytest.mark.asyncio
+async def test_relay_retries_failed_messages_with_backoff(db_session):
+    await create_tenant(db_session)
+    relay = OutboxRelay(
+        session_factory=db_session,
+        producer=MockProducer(error=ConnectionError("broker is down")),
+        retry_backoff=60,
+    )
+
+    assert await relay.relay_batch() == 1
+    rows = await get_outbox_rows(db_session)
+    assert rows[0].sent is None
+    assert rows[0].attempts == 1
+    assert "broker is down" in rows[0].last_error
+    assert rows[0].next_attempt > datetime.now()
+
+    # Not taken again before the backoff passed:
+    assert await relay.relay_batch() == 0
+
+
+@pytest.mark.asyncio
+async def test_relay_keeps_retrying_after_alert_attempts(db_session):
+    await create_tenant(db_session)
+    producer = MockProducer(error=ConnectionError("broker is down"))
+    relay = OutboxRelay(
+        session_factory=db_session,
+        producer=producer,
+        retry_backoff=0,
+        alert_attempts=2,
+    )
+
+    for _ in range(3):
+        assert await relay.relay_batch() == 1
+
+    producer.error = None
+    assert await relay.relay_batch() == 1
+    rows = await get_outbox_rows(db_session)
+    assert rows[0].sent is not None
+    assert rows[0].attempts == 4
+
+
+@pytest.mark.asyncio
+async def test_relay_does_not_lock_rows_while_waiting_for_broker(db_session):
+    await create_tenant(db_session)
+    producer = MockProducer(acknowledged=False)
+    relay = OutboxRelay(session_factory=db_session, producer=producer)
+    other_relay = OutboxRelay(session_factory=db_session, producer=MockProducer())
+
+    relaying = asyncio.create_task(relay.relay_batch())
+    while not producer.futures:
+        await asyncio.sleep(0.01)
+
+    async with db_session() as session:
+        # Raises, if the row is still locked by the relay:
+        result = await session.execute(
+            select(outbox_table).with_for_update(nowait=True)
+        )
+        assert result.one().next_attempt > datetime.now()
+    # Leased row is not taken by another relay:
+    assert await other_relay.relay_batch() == 0
+
+    producer.futures[0].acknowledge()
+    assert await relaying == 1
+    rows = await get_outbox_rows(db_session)
+    assert rows[0].sent is not None
+
+
+@pytest.mark.asyncio
+async def test_relay_keeps_order_of_messages_with_one_key(db_session):
+    now = datetime.now()
+    key, other_key = uuid4().bytes, uuid4().bytes
+    messages = [
+        # Failed earlier and waits for retry:
+        dict(key=key, next_attempt=now + timedelta(minutes=1)),
+        dict(key=key, next_attempt=None),
+        dict(key=other_key, next_attempt=None),
+    ]
+    async with db_session() as session:
+        await session.execute(
+            insert(outbox_table),
+            [
+                dict(
+                    id=uuid4(),
+                    created=now + timedelta(seconds=index),
+                    event_type="TenantUpdatedEvent",
+                    topic="main-topic",
+                    payload=f"message {index}".encode(),
+                    attempts=1 if message["next_attempt"] else 0,
+                    **message,
+                )
+                for index, message in enumerate(messages)
+            ],
+        )
+        await session.commit()
+    producer = MockProducer()
+    relay = OutboxRelay(session_factory=db_session, producer=producer)
+
+    # Later message of the key does not overtake the failed one:
+    assert await relay.relay_batch() == 1
+    assert producer.messages == [("main-topic", other_key, b"message 2")]
+
+    async with db_session() as session:
+        await session.execute(update(outbox_table).values(next_attempt=None))
+        await session.commit()
+    assert await relay.relay_batch() == 2
+    assert producer.messages[1:] == [
+        ("main-topic", key, b"message 0"),
+        ("main-topic", key, b"message 1"),
+    ]
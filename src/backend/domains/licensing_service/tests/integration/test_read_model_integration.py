@@ -0,0 +1,340 @@
+# tests/integration/test_read_model_integration.py
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import insert, select
+
+from backend.core.bootstrap import Bootstrap
+from backend.core.infra.pagination import PageRequest
+from backend.domains.licensing_service.app.queries.subdivision_queries import (
+    SubdivisionQuery,
+)
+from backend.domains.licensing_service.app.queries.tenant_queries import TenantQuery
+from backend.domains.licensing_service.app.services.read_model_services import (
+    ReadModelService,
+)
+from backend.domains.licensing_service.app.services.subdivision_services import (
+    SubdivisionService,
+)
+from backend.domains.licensing_service.app.services.tenant_services import TenantService
+from backend.domains.licensing_service.domain.services.commands import (
+    license_commands,
+    subdivision_commands,
+    tenant_commands,
+)
+from backend.domains.licensing_service.domain.services.domain_event_bus import (
+    DomainEventBus,
+)
+from backend.domains.licensing_service.domain.value_objects.license_type import (
+    LicenseType,
+)
+from backend.domains.licensing_service.domain.value_objects.usage_bucket import (
+    UsageBucket,
+)
+from backend.domains.licensing_service.infra.handlers import (
+    EVENTS_HANDLERS_FOR_INJECTION,
+)
+from backend.domains.licensing_service.infra.handlers.events import (
+    read_model_event_handlers,
+)
+from backend.domains.licensing_service.infra.adapters.orm import (
+    statistic_row_table,
+    subdivision_summaries_table,
+    tenant_summaries_table,
+)
+from backend.domains.licensing_service.infra.uow.sqlalchemy.read_model_uow import (
+    SQLAlchemyReadModelUnitOfWork,
+)
+
+
+async def create_tenant_with_subdivision(db_session):
+    tenant_service = TenantService(db_session_factory=db_session)
+    tenant = await tenant_service.create_tenant(
+        tenant_commands.CreateTenantCommand(
+            user_id=uuid4(),
+            name="Read Model Tenant",
+            address="1 Read St",
+            email="read@example.com",
+            phone="+111111111",
+        )
+    )
+    subdivision_service = SubdivisionService(db_session_factory=db_session)
+    subdivision = await subdivision_service.create_subdivision(
+        subdivision_commands.CreateSubdivisionCommand(
+            name="Read Model Subdivision", location="Read City", tenant_id=tenant.id
+        )
+    )
+    return tenant, subdivision
+
+
+def make_messagebus(db_session):
+    """
+    Messagebus with read model projectors registered as in the application,
+    they work with the test database.
+    """
+    projectors = {
+        event_type: [
+            handler
+            for handler in handlers
+            if issubclass(handler, read_model_event_handlers.ReadModelProjector)
+        ]
+        for event_type, handlers in EVENTS_HANDLERS_FOR_INJECTION.items()
+    }
+    bootstrap = Bootstrap(
+        domain_event_bus=DomainEventBus(),
+        infra_event_bus=DomainEventBus(),
+        events_handlers_for_injection=projectors,
+        commands_handlers_for_injection={},
+        dependencies={"db_session_factory": db_session},
+    )
+    return bootstrap.get_messagebus()
+
+
+async def get_summary(db_session, table, id):
+    async with db_session() as session:
+        result = await session.execute(select(table).where(table.c.id == id))
+        return result.first()
+
+
+@pytest.mark.asyncio
+async def test_refresh_subdivision_read_models(db_session):
+    """
+    Integration test for read models:
+    - create tenant, subdivision and active license
+    - record usage
+    - refresh read models and check them
+    """
+    tenant, subdivision = await create_tenant_with_subdivision(db_session)
+    subdivision_service = SubdivisionService(db_session_factory=db_session)
+    updated_subdivision = await subdivision_service.add_license(
+        license_commands.CreateLicenseCommand(
+            type=LicenseType.BYCOUNT,
+            count_requests=10,
+            name="Read License",
+            description="Read License Description",
+            subdivision_id=subdivision.id,
+        )
+    )
+    license = updated_subdivision.licenses[0]
+    await subdivision_service.activate_subdivision_license(
+        subdivision_id=subdivision.id, license_id=license.id
+    )
+    await subdivision_service.record_usage(
+        subdivision_commands.RecordUsageCommand(
+            subdivision_id=subdivision.id, count_requests=3
+        )
+    )
+
+    read_model_service = ReadModelService(db_session_factory=db_session)
+    await read_model_service.refresh_subdivision(subdivision_id=subdivision.id)
+    # Refresh is idempotent:
+    await read_model_service.refresh_subdivision(subdivision_id=subdivision.id)
+
+    summary = await get_summary(db_session, subdivision_summaries_table, subdivision.id)
+    assert summary.tenant_id == tenant.id
+    assert summary.name == "Read Model Subdivision"
+    assert summary.licenses_count == 1
+    assert summary.active_license_id == license.id
+    assert summary.limit_requests == 10
+    assert summary.used_requests == 3
+
+    tenant_summary = await get_summary(db_session, tenant_summaries_table, tenant.id)
+    assert tenant_summary.subdivisions_count == 1
+    assert tenant_summary.active_licenses_count == 1
+
+
+@pytest.mark.asyncio
+async def test_read_models_of_deleted_aggregates_are_deleted(db_session):
+    tenant, subdivision = await create_tenant_with_subdivision(db_session)
+    read_model_service = ReadModelService(db_session_factory=db_session)
+    await read_model_service.rebuild()
+    assert await get_summary(db_session, subdivision_summaries_table, subdivision.id)
+
+    subdivision_service = SubdivisionService(db_session_factory=db_session)
+    await subdivision_service.delete_subdivision(id=subdivision.id)
+    await read_model_service.refresh_subdivision(subdivision_id=subdivision.id)
+
+    summary = await get_summary(db_session, subdivision_summaries_table, subdivision.id)
+    assert summary is None
+    tenant_summary = await get_summary(db_session, tenant_summaries_table, tenant.id)
+    assert tenant_summary.subdivisions_count == 0
+
+    tenant_service = TenantService(db_session_factory=db_session)
+    await tenant_service.delete_tenant(id=tenant.id)
+    await read_model_service.refresh_tenant(tenant_id=tenant.id)
+
+    assert not await get_summary(db_session, tenant_summaries_table, tenant.id)
+
+
+@pytest.mark.asyncio
+async def test_read_models_are_refreshed_by_events(db_session):
+    """
+    Integration test for projectors:
+    - create tenant, subdivision and active license, collecting their events
+    - handle the events by the messagebus
+    - read tenant and subdivisions by the queries from the read models
+    """
+    event_bus = DomainEventBus()
+    tenant_service = TenantService(
+        infra_event_bus=event_bus, db_session_factory=db_session
+    )
+    tenant = await tenant_service.create_tenant(
+        tenant_commands.CreateTenantCommand(
+            user_id=uuid4(),
+            name="Projected Tenant",
+            address="2 Read St",
+            email="projected@example.com",
+            phone="+222222222",
+        )
+    )
+    subdivision_service = SubdivisionService(
+        infra_event_bus=event_bus, db_session_factory=db_session
+    )
+    subdivision = await subdivision_service.create_subdivision(
+        subdivision_commands.CreateSubdivisionCommand(
+            name="Projected Subdivision", location="Read City", tenant_id=tenant.id
+        )
+    )
+    updated_subdivision = await subdivision_service.add_license(
+        license_commands.CreateLicenseCommand(
+            type=LicenseType.BYCOUNT,
+            count_requests=10,
+            name="Projected License",
+            description="Projected License Description",
+            subdivision_id=subdivision.id,
+        )
+    )
+    license = updated_subdivision.licenses[0]
+    await subdivision_service.activate_subdivision_license(
+        subdivision_id=subdivision.id, license_id=license.id
+    )
+
+    events = list(event_bus.get_events())
+    assert events[0].id == tenant.id
+    messagebus = make_messagebus(db_session)
+    for event in events:
+        await messagebus.handle(event)
+
+    tenant_query = TenantQuery(db_session_factory=db_session)
+    tenant_summary = await tenant_query.get_tenant_summary(id=tenant.id)
+    assert tenant_summary.subdivisions_count == 1
+    assert tenant_summary.active_licenses_count == 1
+    projected_tenant = await tenant_query.get_tenant(
+        tenant_id=tenant.id, include=("users", "subdivisions", "subdivisions.licenses")
+    )
+    assert projected_tenant["name"] == "Projected Tenant"
+    assert len(projected_tenant["users"]) == 1
+    [projected_subdivision] = projected_tenant["subdivisions"]
+    assert projected_subdivision["id"] == subdivision.id
+    assert [row["id"] for row in projected_subdivision["licenses"]] == [license.id]
+    assert projected_subdivision["statistics"] == []
+
+    subdivision_query = SubdivisionQuery(db_session_factory=db_session)
+    subdivisions_page = await subdivision_query.get_all_subdivisions(
+        page=PageRequest(limit=10), tenant_id=tenant.id, include=()
+    )
+    assert [item["id"] for item in subdivisions_page.items] == [subdivision.id]
+    assert subdivisions_page.items[0]["licenses"] == []
+    summary = await subdivision_query.get_subdivision_summary(id=subdivision.id)
+    assert summary.active_license_id == license.id
+    assert summary.used_requests == 0
+
+    # Usage is not projected, summaries read the counter of the license:
+    metrics = messagebus.metrics.snapshot()
+    await subdivision_service.record_usage(
+        subdivision_commands.RecordUsageCommand(
+            subdivision_id=subdivision.id, count_requests=3
+        )
+    )
+    usage_events = list(event_bus.get_events())
+    for event in usage_events:
+        await messagebus.handle(event)
+    assert messagebus.metrics.snapshot() == metrics
+    summary = await subdivision_query.get_subdivision_summary(id=subdivision.id)
+    assert summary.used_requests == 3
+    [summary] = await subdivision_query.get_all_subdivision_summaries(
+        tenant_id=tenant.id
+    )
+    assert summary.used_requests == 3
+
+
+@pytest.mark.asyncio
+async def test_export_statistic_rows_by_batches(db_session):
+    tenant, subdivision = await create_tenant_with_subdivision(db_session)
+    subdivision_service = SubdivisionService(db_session_factory=db_session)
+    updated_subdivision = await subdivision_service.add_license(
+        license_commands.CreateLicenseCommand(
+            type=LicenseType.BYCOUNT,
+            count_requests=100,
+            name="Export License",
+            description="Export License Description",
+            subdivision_id=subdivision.id,
+        )
+    )
+    await subdivision_service.activate_subdivision_license(
+        subdivision_id=subdivision.id, license_id=updated_subdivision.licenses[0].id
+    )
+    for count_requests in range(1, 6):
+        await subdivision_service.record_usage(
+            subdivision_commands.RecordUsageCommand(
+                subdivision_id=subdivision.id, count_requests=count_requests
+            )
+        )
+
+    async with SQLAlchemyReadModelUnitOfWork(session_factory=db_session) as uow:
+        batches = [
+            rows
+            async for rows in uow.statistic_rows.stream(
+                tenant_id=tenant.id, batch_size=2
+            )
+        ]
+
+    assert [len(rows) for rows in batches] == [2, 2, 1]
+    exported = [row for rows in batches for row in rows]
+    assert [row["count_requests"] for row in exported] == [1, 2, 3, 4, 5]
+    assert all(row["subdivision_id"] == subdivision.id for row in exported)
+
+
+@pytest.mark.asyncio
+async def test_usage_is_summed_by_buckets(db_session):
+    tenant, subdivision = await create_tenant_with_subdivision(db_session)
+    created = [
+        datetime(2025, 3, 1, 10, 5),
+        datetime(2025, 3, 1, 10, 50),
+        datetime(2025, 3, 2, 9),
+        datetime(2025, 4, 1),
+    ]
+    async with db_session() as session:
+        await session.execute(
+            insert(statistic_row_table),
+            [
+                dict(
+                    id=uuid4(),
+                    created=moment,
+                    count_requests=index + 1,
+                    subdivision_id=subdivision.id,
+                )
+                for index, moment in enumerate(created)
+            ],
+        )
+        await session.commit()
+
+    async with SQLAlchemyReadModelUnitOfWork(session_factory=db_session) as uow:
+        hours = await uow.usage.get_usage(
+            bucket=UsageBucket.HOUR,
+            subdivision_id=subdivision.id,
+            end=datetime(2025, 4, 1),
+        )
+        months = await uow.usage.get_usage(
+            bucket=UsageBucket.MONTH, tenant_id=tenant.id
+        )
+
+    assert [(row.start, row.count_requests) for row in hours] == [
+        (datetime(2025, 3, 1, 10), 3),
+        (datetime(2025, 3, 2, 9), 3),
+    ]
+    assert [(row.start, row.count_requests) for row in months] == [
+        (datetime(2025, 3, 1), 6),
+        (datetime(2025, 4, 1), 4),
+    ]
@@ -0,0 +1,172 @@
+# tests/integration/test_scheduler_integration.py
+import asyncio
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import insert, select
+
+from backend.core.infra.database.scheduler import (
+    JOB_FAILED,
+    JOB_SKIPPED,
+    JOB_SUCCEEDED,
+    Scheduler,
+    job_runs_table,
+)
+from backend.core.infra.scheduling import CronSchedule, IntervalSchedule, Job
+from backend.domains.licensing_service.app.jobs.schedule import make_scheduled_jobs
+from backend.domains.licensing_service.app.services.outbox_services import (
+    OutboxService,
+)
+from backend.domains.licensing_service.infra.adapters.orm import outbox_table
+
+
+async def get_job_runs(engine, name):
+    async with engine.connect() as connection:
+        result = await connection.execute(
+            select(job_runs_table)
+            .where(job_runs_table.c.job == name)
+            .order_by(job_runs_table.c.scheduled)
+        )
+        return result.all()
+
+
+@pytest.mark.asyncio
+async def test_job_is_run_once_across_schedulers(engine):
+    """
+    Integration test for the scheduler:
+    - several schedulers run the same due job at once
+    - verify it is run by one of them and the run is recorded
+    """
+    calls = []
+
+    async def job_func():
+        calls.append(1)
+        await asyncio.sleep(0.2)
+        return 7
+
+    job = Job(name="test.once", func=job_func, schedule=IntervalSchedule(3600))
+    schedulers = [Scheduler(jobs=[job], engine=engine) for _ in range(4)]
+
+    statuses = await asyncio.gather(
+        *(scheduler.run_pending() for scheduler in schedulers)
+    )
+
+    assert len(calls) == 1
+    assert sorted(statuses, key=len) == [{}, {}, {}, {job.name: JOB_SUCCEEDED}]
+    runs = await get_job_runs(engine, job.name)
+    assert len(runs) == 1
+    assert runs[0].rows == 7
+    assert runs[0].duration >= 0.2
+    assert runs[0].status == JOB_SUCCEEDED
+
+    # The next run is due after the interval only:
+    assert await schedulers[0].run_pending() == {}
+    later = datetime.now() + timedelta(hours=1, seconds=1)
+    assert await schedulers[1].run_pending(now=later) == {job.name: JOB_SUCCEEDED}
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_missed_runs_are_caught_up_once_or_skipped(engine):
+    """
+    Integration test for the scheduler:
+    - daily jobs, which missed runs for days
+    - verify the one catching up runs once, the other skips them
+    """
+    calls = []
+
+    async def job_func():
+        calls.append(1)
+
+    async def failing_job_func():
+        raise RuntimeError("broken job")
+
+    schedule = CronSchedule("0 3 * * *")
+    catching_up = Job(name="test.catch_up", func=job_func, schedule=schedule)
+    skipping = Job(name="test.skip", func=job_func, schedule=schedule, catch_up=False)
+    failing = Job(name="test.fail", func=failing_job_func, schedule=schedule)
+    now = datetime.now()
+    last_run = (now - timedelta(days=5)).replace(hour=3, minute=0, second=0)
+    async with engine.begin() as connection:
+        for job in (catching_up, skipping, failing):
+            await connection.execute(
+                insert(job_runs_table).values(
+                    job=job.name,
+                    scheduled=last_run,
+                    started=last_run,
+                    duration=0.0,
+                    status=JOB_SUCCEEDED,
+                )
+            )
+    scheduler = Scheduler(jobs=[catching_up, skipping, failing], engine=engine)
+
+    statuses = await scheduler.run_pending(now=now)
+
+    assert statuses == {
+        catching_up.name: JOB_SUCCEEDED,
+        skipping.name: JOB_SKIPPED,
+        failing.name: JOB_FAILED,
+    }
+    assert len(calls) == 1
+    runs = await get_job_runs(engine, catching_up.name)
+    assert len(runs) == 2
+    assert runs[-1].scheduled == schedule.next_after(now - timedelta(days=1))
+    failed_runs = await get_job_runs(engine, failing.name)
+    assert "broken job" in failed_runs[-1].error
+
+    # Runs are not repeated after that:
+    assert await scheduler.run_pending(now=now) == {}
+
+
+@pytest.mark.asyncio
+async def test_sent_outbox_messages_are_purged(engine, db_session):
+    """
+    Integration test for the outbox purge job:
+    - sent messages older and newer than the retention, unsent messages
+    - run the purge by the scheduler
+    - verify old sent messages are deleted by batches, the rest are kept
+    """
+    [purge_job] = [
+        job
+        for job in make_scheduled_jobs(license_expiration_sweeper=None)
+        if job.name == "licensing_service.purge_outbox"
+    ]
+    now = datetime.now()
+    sent = [now - timedelta(days=8)] * 5 + [now - timedelta(days=6), None]
+    async with db_session() as session:
+        await session.execute(
+            insert(outbox_table),
+            [
+                dict(
+                    id=uuid4(),
+                    created=now - timedelta(days=9),
+                    event_type="TenantUpdatedEvent",
+                    topic="main-topic",
+                    payload=b"message",
+                    attempts=1 if sent_at else 0,
+                    sent=sent_at,
+                )
+                for sent_at in sent
+            ],
+        )
+        await session.commit()
+    outbox_service = OutboxService(
+        db_session_factory=db_session, retention_days=7, batch_size=2
+    )
+    job = Job(
+        name=purge_job.name,
+        func=lambda: outbox_service.purge_sent(now=now),
+        schedule=purge_job.schedule,
+    )
+
+    # Hourly job is due within an hour after the scheduler is started:
+    scheduler = Scheduler(jobs=[job], engine=engine)
+    statuses = await scheduler.run_pending(now=now + timedelta(hours=1))
+
+    assert statuses == {job.name: JOB_SUCCEEDED}
+    runs = await get_job_runs(engine, job.name)
+    assert runs[-1].rows == 5
+    async with db_session() as session:
+        kept = (await session.execute(select(outbox_table.c.sent))).scalars().all()
+    assert sorted(kept, key=lambda sent_at: sent_at is None) == sent[5:]
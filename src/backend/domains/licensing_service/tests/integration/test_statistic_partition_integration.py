@@ -0,0 +1,102 @@
+# tests/integration/test_statistic_partition_integration.py
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import insert, select
+
+from backend.core.infra.database.partitions import add_months, month_start
+from backend.domains.licensing_service.app.services import (
+    statistic_partition_services,
+)
+from backend.domains.licensing_service.app.services.subdivision_services import (
+    SubdivisionService,
+)
+from backend.domains.licensing_service.app.services.tenant_services import TenantService
+from backend.domains.licensing_service.domain.services.commands import (
+    subdivision_commands,
+    tenant_commands,
+)
+from backend.domains.licensing_service.domain.value_objects.usage_bucket import (
+    UsageBucket,
+)
+from backend.domains.licensing_service.infra.adapters.orm import (
+    statistic_daily_rollups_table,
+    statistic_monthly_rollups_table,
+    statistic_row_table,
+)
+from backend.domains.licensing_service.infra.uow.sqlalchemy.read_model_uow import (
+    SQLAlchemyReadModelUnitOfWork,
+)
+
+
+@pytest.mark.asyncio
+async def test_old_partitions_are_rolled_up_and_dropped(db_session):
+    tenant_service = TenantService(db_session_factory=db_session)
+    tenant = await tenant_service.create_tenant(
+        tenant_commands.CreateTenantCommand(
+            user_id=uuid4(),
+            name="Partition Tenant",
+            address="1 Partition St",
+            email="partition@example.com",
+            phone="+111111111",
+        )
+    )
+    subdivision_service = SubdivisionService(db_session_factory=db_session)
+    subdivision = await subdivision_service.create_subdivision(
+        subdivision_commands.CreateSubdivisionCommand(
+            name="Partition Subdivision", location="Partition City", tenant_id=tenant.id
+        )
+    )
+    now = datetime.now()
+    old_month = add_months(month_start(now), -6)
+    created = [
+        old_month.replace(day=2, hour=10),
+        old_month.replace(day=2, hour=11),
+        old_month.replace(day=3),
+        now,
+    ]
+    async with db_session() as session:
+        await session.execute(
+            insert(statistic_row_table),
+            [
+                dict(
+                    id=uuid4(),
+                    created=moment,
+                    count_requests=index + 1,
+                    subdivision_id=subdivision.id,
+                )
+                for index, moment in enumerate(created)
+            ],
+        )
+        await session.commit()
+
+    statistic_partition_service = (
+        statistic_partition_services.StatisticPartitionService(
+            db_session_factory=db_session, ahead=1, retention=3
+        )
+    )
+    result = await statistic_partition_service.maintain(now=now)
+
+    # Old month went to the default partition, it's moved and dropped:
+    assert old_month in result["created"]
+    assert result["dropped"] == [old_month]
+    async with db_session() as session:
+        rows = (await session.execute(select(statistic_row_table))).all()
+        daily = (await session.execute(select(statistic_daily_rollups_table))).all()
+        monthly = (await session.execute(select(statistic_monthly_rollups_table))).all()
+    assert [row.count_requests for row in rows] == [4]
+    assert sorted((row.day.day, row.count_requests) for row in daily) == [
+        (2, 3),
+        (3, 3),
+    ]
+    assert [row.count_requests for row in monthly] == [6]
+
+    # Rollups are counted with kept rows:
+    async with SQLAlchemyReadModelUnitOfWork(session_factory=db_session) as uow:
+        usage = await uow.usage.get_usage(
+            bucket=UsageBucket.DAY,
+            subdivision_id=subdivision.id,
+            start=add_months(old_month, -1),
+        )
+    assert sum(bucket.count_requests for bucket in usage) == 10
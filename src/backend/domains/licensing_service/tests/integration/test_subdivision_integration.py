@@ -1,10 +1,13 @@
 # tests/integration/test_tenant_service.py
-from datetime import datetime
+import asyncio
+from datetime import datetime, timedelta
 from uuid import uuid4
 
 import pytest
+from sqlalchemy import text
 
 from backend.core.infra.eventbus import AbstractEventBus
+from backend.core.infra.pagination import PageRequest, make_page
 from backend.domains.licensing_service.app.services.subdivision_services import (
     SubdivisionService,
 )
@@ -24,7 +27,11 @@ from backend.domains.licensing_service.domain.services.commands.license_commands
 )
 from backend.domains.licensing_service.domain.services.commands.subdivision_commands import (
     AddStatisticRowCommand,
+    AddStatisticRowsBatchCommand,
     CreateSubdivisionCommand,
+    ExpireLicensesCommand,
+    RecordUsageCommand,
+    StatisticRowsBatchItem,
     UpdateSubdivisionCommand,
 )
 from backend.domains.licensing_service.domain.services.commands.tenant_commands import (
@@ -33,6 +40,7 @@ from backend.domains.licensing_service.domain.services.commands.tenant_commands
 from backend.domains.licensing_service.domain.services.events.license_events import (
     LicenseActivatedEvent,
     LicenseCreatedEvent,
+    LicenseDeactivatedEvent,
 )
 from backend.domains.licensing_service.domain.services.events.statistic_row_events import (
     StatisticRowAddedEvent,
@@ -229,6 +237,95 @@ async def test_get_all_tenants(db_session):
         assert fetched_subdivisions[i].name == f"Subdivision {i}"
 
 
+@pytest.mark.asyncio
+async def test_get_subdivisions_by_pages(db_session):
+    """
+    Integration test for keyset pagination and filters of subdivisions:
+    - create two tenants with subdivisions
+    - read subdivisions of one tenant by pages of 2 sorted by name
+    - filter by work status
+    """
+    tenant_service = TenantService(db_session_factory=db_session)
+    subdivision_service = SubdivisionService(db_session_factory=db_session)
+    tenants = []
+    for number in range(2):
+        tenants.append(
+            await tenant_service.create_tenant(
+                CreateTenantCommand(
+                    user_id=uuid4(),
+                    name=f"Paged Tenant {number}",
+                    address="1 Page St",
+                    email=f"page{number}@example.com",
+                    phone="+123456789",
+                )
+            )
+        )
+        for i in range(5):
+            await subdivision_service.create_subdivision(
+                CreateSubdivisionCommand(
+                    name=f"Subdivision {i}", location="City", tenant_id=tenants[-1].id
+                )
+            )
+
+    names = []
+    page_request = PageRequest(limit=2, sort="name")
+    while True:
+        page = make_page(
+            await subdivision_service.get_all_subdivisions(
+                page=page_request, tenant_id=tenants[0].id
+            ),
+            page_request,
+        )
+        assert len(page.items) <= 2
+        assert all(item.tenant_id == tenants[0].id for item in page.items)
+        names.extend(item.name for item in page.items)
+        if not page.next_cursor:
+            break
+        page_request = PageRequest(limit=2, cursor=page.next_cursor, sort="name")
+    assert names == [f"Subdivision {i}" for i in range(5)]
+
+    inactive = await subdivision_service.get_all_subdivisions(
+        page=PageRequest(), work_status=WorkStatus.INACTIVE
+    )
+    active = await subdivision_service.get_all_subdivisions(
+        page=PageRequest(), work_status=WorkStatus.ACTIVE
+    )
+    assert len(inactive) + len(active) == 10
+
+
+@pytest.mark.asyncio
+async def test_get_subdivisions_with_included_relations(db_session):
+    """
+    Integration test for include of relations:
+    - create subdivision with active license and usage
+    - read it without statistics and without any relations
+    """
+    subdivision = await create_subdivision_with_active_license(db_session, 100)
+    subdivision_service = SubdivisionService(db_session_factory=db_session)
+    await subdivision_service.record_usage(
+        RecordUsageCommand(subdivision_id=subdivision.id, count_requests=5)
+    )
+
+    [fetched] = await subdivision_service.get_all_subdivisions(
+        tenant_id=subdivision.tenant_id, include={"licenses"}
+    )
+    assert len(fetched.licenses) == 1
+    assert fetched.statistics == []
+
+    [fetched] = await subdivision_service.get_all_subdivisions(
+        tenant_id=subdivision.tenant_id, include=()
+    )
+    assert fetched.licenses == []
+    assert fetched.statistics == []
+
+    tenant = await TenantService(db_session_factory=db_session).get_tenant_by_id(
+        subdivision.tenant_id, include={"subdivisions"}
+    )
+    assert tenant.users == []
+    assert [item.id for item in tenant.subdivisions] == [subdivision.id]
+    assert tenant.subdivisions[0].licenses == []
+
+
 @pytest.mark.asyncio
 async def test_delete_tenant(db_session):
     """
@@ -424,6 +521,13 @@ async def test_update_license_in_subdivision(db_session):
     assert updated_subdivision.licenses[0].name == "Updated License"
     assert updated_subdivision.licenses[0].description == "Updated Description"
 
+    # Returned state is the one, which was saved
+    saved_subdivision = await subdivision_service.get_subdivision_by_id(
+        id=subdivision.id
+    )
+    assert saved_subdivision.licenses[0].name == "Updated License"
+    assert saved_subdivision.licenses[0].description == "Updated Description"
+
 
 @pytest.mark.asyncio
 async def test_delete_license_from_subdivision(db_session):
@@ -939,9 +1043,14 @@ async def test_add_statistic_row_deactivate_subdivision(db_session):
     )
 
     assert stat_added_subdivision is not None
-    assert len(stat_added_subdivision.statistics) == 2
-    assert stat_added_subdivision.statistics[0].count_requests == 50
-    assert stat_added_subdivision.statistics[1].count_requests == 51
+    # Stored rows are not loaded to add one:
+    assert [row.count_requests for row in stat_added_subdivision.statistics] == [51]
+    stored_subdivision = await subdivision_service.get_subdivision_by_id(
+        subdivision.id
+    )
+    assert len(stored_subdivision.statistics) == 2
+    assert stored_subdivision.statistics[0].count_requests == 50
+    assert stored_subdivision.statistics[1].count_requests == 51
 
     # Check events
     assert len(infra_event_bus.events) == 7
@@ -949,3 +1058,484 @@ async def test_add_statistic_row_deactivate_subdivision(db_session):
     assert isinstance(infra_event_bus.events[-1], SubdivisionLicenseExpiredEvent)
 
     assert not stat_added_subdivision.is_active
+
+
+@pytest.mark.asyncio
+async def test_reconcile_license_counters(db_session):
+    """
+    Integration test for reconciliation of license request counters:
+    - create subdivision with active license
+    - add statistic rows
+    - break the counter
+    - verify drift is reported and fixed
+    """
+    tenant_service = TenantService(db_session_factory=db_session)
+    tenant = await tenant_service.create_tenant(
+        CreateTenantCommand(
+            user_id=uuid4(),
+            name="Stats Tenant",
+            address="303 Stats St",
+            email="stats@example.com",
+            phone="+666666666",
+        )
+    )
+    subdivision_service = SubdivisionService(db_session_factory=db_session)
+    subdivision = await subdivision_service.create_subdivision(
+        CreateSubdivisionCommand(
+            name="Stats Subdivision", location="Stats City", tenant_id=tenant.id
+        )
+    )
+    updated_subdivision = await subdivision_service.add_license(
+        CreateLicenseCommand(
+            type=LicenseType.BYCOUNT,
+            count_requests=100,
+            name="Test License",
+            description="Test License Description",
+            subdivision_id=subdivision.id,
+        )
+    )
+    license = updated_subdivision.licenses[0]
+    await subdivision_service.activate_subdivision_license(
+        subdivision_id=subdivision.id, license_id=license.id
+    )
+    for count_requests in (10, 20):
+        await subdivision_service.add_subdivision_statistic_row(
+            AddStatisticRowCommand(
+                created=datetime.now(),
+                count_requests=count_requests,
+                subdivision_id=subdivision.id,
+            )
+        )
+
+    assert await subdivision_service.reconcile_license_counters() == []
+
+    async with db_session() as session:
+        await session.execute(
+            text("UPDATE lisenses SET used_requests = 5 WHERE id = :id"),
+            {"id": license.id},
+        )
+        await session.commit()
+
+    drifts = await subdivision_service.reconcile_license_counters()
+    assert len(drifts) == 1
+    assert drifts[0]["license_id"] == license.id
+    assert drifts[0]["used_requests"] == 5
+    assert drifts[0]["actual_requests"] == 30
+    assert drifts[0]["fixed"]
+
+    subdivision = await subdivision_service.get_subdivision_by_id(subdivision.id)
+    assert subdivision.total_count_requests == 30
+
+
+@pytest.mark.asyncio
+async def test_add_statistic_rows_keeps_earlier_rows(db_session):
+    """
+    Integration test for statistic rows added one by one:
+    - create subdivision with active license
+    - add statistic rows
+    - verify earlier rows are kept in the table and counted by the license
+    """
+    tenant_service = TenantService(db_session_factory=db_session)
+    tenant = await tenant_service.create_tenant(
+        CreateTenantCommand(
+            user_id=uuid4(),
+            name="Stats Tenant",
+            address="303 Stats St",
+            email="stats@example.com",
+            phone="+666666666",
+        )
+    )
+    subdivision_service = SubdivisionService(db_session_factory=db_session)
+    subdivision = await subdivision_service.create_subdivision(
+        CreateSubdivisionCommand(
+            name="Stats Subdivision", location="Stats City", tenant_id=tenant.id
+        )
+    )
+    updated_subdivision = await subdivision_service.add_license(
+        CreateLicenseCommand(
+            type=LicenseType.BYCOUNT,
+            count_requests=100,
+            name="Test License",
+            description="Test License Description",
+            subdivision_id=subdivision.id,
+        )
+    )
+    license = updated_subdivision.licenses[0]
+    await subdivision_service.activate_subdivision_license(
+        subdivision_id=subdivision.id, license_id=license.id
+    )
+    for count_requests in (10, 20):
+        await subdivision_service.add_subdivision_statistic_row(
+            AddStatisticRowCommand(
+                created=datetime.now(),
+                count_requests=count_requests,
+                subdivision_id=subdivision.id,
+            )
+        )
+
+    async with db_session() as session:
+        rows = await session.execute(
+            text(
+                "SELECT count(*), sum(count_requests) FROM statistic_rows "
+                "WHERE subdivision_id = :id"
+            ),
+            {"id": subdivision.id},
+        )
+        assert tuple(rows.one()) == (2, 30)
+
+    subdivision = await subdivision_service.get_subdivision_by_id(subdivision.id)
+    assert subdivision.total_count_requests == 30
+    assert len(subdivision.statistics) == 2
+
+
+async def create_subdivision_with_active_license(db_session, count_requests):
+    tenant_service = TenantService(db_session_factory=db_session)
+    tenant = await tenant_service.create_tenant(
+        CreateTenantCommand(
+            user_id=uuid4(),
+            # Names of tenants are unique:
+            name=f"Usage Tenant {uuid4()}",
+            address="404 Usage St",
+            email="usage@example.com",
+            phone="+777777777",
+        )
+    )
+    subdivision_service = SubdivisionService(db_session_factory=db_session)
+    subdivision = await subdivision_service.create_subdivision(
+        CreateSubdivisionCommand(
+            name="Usage Subdivision", location="Usage City", tenant_id=tenant.id
+        )
+    )
+    updated_subdivision = await subdivision_service.add_license(
+        CreateLicenseCommand(
+            type=LicenseType.BYCOUNT,
+            count_requests=count_requests,
+            name="Usage License",
+            description="Usage License Description",
+            subdivision_id=subdivision.id,
+        )
+    )
+    license = updated_subdivision.licenses[0]
+    return await subdivision_service.activate_subdivision_license(
+        subdivision_id=subdivision.id, license_id=license.id
+    )
+
+
+@pytest.mark.asyncio
+async def test_record_usage(db_session):
+    """
+    Integration test for usage ingestion:
+    - create subdivision with active license
+    - record usage
+    - verify counters, statistics and events
+    """
+    subdivision = await create_subdivision_with_active_license(db_session, 100)
+    infra_event_bus = MockEventBus()
+    domain_event_bus = MockEventBus()
+    subdivision_service = SubdivisionService(
+        domain_event_bus=domain_event_bus,
+        infra_event_bus=infra_event_bus,
+        db_session_factory=db_session,
+    )
+
+    usage = await subdivision_service.record_usage(
+        RecordUsageCommand(subdivision_id=subdivision.id, count_requests=40)
+    )
+
+    assert usage.used_requests == 40
+    assert usage.remaining_requests == 60
+    assert usage.license_active
+    assert len(infra_event_bus.events) == 1
+    assert isinstance(infra_event_bus.events[0], StatisticRowAddedEvent)
+    assert infra_event_bus.events[0].id == usage.statistic_row_id
+
+    subdivision = await subdivision_service.get_subdivision_by_id(subdivision.id)
+    assert subdivision.total_count_requests == 40
+    assert len(subdivision.statistics) == 1
+    assert subdivision.statistics[0].count_requests == 40
+
+
+@pytest.mark.asyncio
+async def test_record_usage_deactivates_license_when_limit_reached(db_session):
+    """
+    Integration test for usage ingestion:
+    - record usage over the license limit
+    - verify license and subdivision are deactivated and events are raised
+    - verify next usage is rejected
+    """
+    subdivision = await create_subdivision_with_active_license(db_session, 100)
+    infra_event_bus = MockEventBus()
+    domain_event_bus = MockEventBus()
+    subdivision_service = SubdivisionService(
+        domain_event_bus=domain_event_bus,
+        infra_event_bus=infra_event_bus,
+        db_session_factory=db_session,
+    )
+
+    usage = await subdivision_service.record_usage(
+        RecordUsageCommand(subdivision_id=subdivision.id, count_requests=100)
+    )
+
+    assert not usage.license_active
+    assert usage.remaining_requests == 0
+    assert isinstance(domain_event_bus.events[0], LicenseDeactivatedEvent)
+    # Usage is published once, on the infra event bus:
+    assert not any(
+        isinstance(event, StatisticRowAddedEvent) for event in domain_event_bus.events
+    )
+    assert isinstance(infra_event_bus.events[-2], StatisticRowAddedEvent)
+    assert isinstance(infra_event_bus.events[-1], SubdivisionLicenseExpiredEvent)
+    assert infra_event_bus.events[-1].work_status == WorkStatus.INACTIVE
+
+    subdivision = await subdivision_service.get_subdivision_by_id(subdivision.id)
+    assert not subdivision.is_active
+    assert subdivision.active_license is None
+
+    with pytest.raises(SubdivisionInactiveError):
+        await subdivision_service.record_usage(
+            RecordUsageCommand(subdivision_id=subdivision.id, count_requests=1)
+        )
+
+
+@pytest.mark.asyncio
+async def test_record_usage_errors(db_session):
+    subdivision_service = SubdivisionService(db_session_factory=db_session)
+    with pytest.raises(SubdivisionNotFoundError):
+        await subdivision_service.record_usage(
+            RecordUsageCommand(subdivision_id=uuid4(), count_requests=1)
+        )
+
+    subdivision = await create_subdivision_with_active_license(db_session, 100)
+    await subdivision_service.deactivate_subdivision_license(
+        subdivision_id=subdivision.id, license_id=subdivision.licenses[0].id
+    )
+    await subdivision_service.update_subdivision(
+        UpdateSubdivisionCommand(
+            id=subdivision.id,
+            name=subdivision.name,
+            location=subdivision.location,
+            work_status=WorkStatus.ACTIVE,
+            link_to_subdivision_processing_domain="",
+        )
+    )
+    with pytest.raises(LicenseInactiveError):
+        await subdivision_service.record_usage(
+            RecordUsageCommand(subdivision_id=subdivision.id, count_requests=1)
+        )
+
+
+@pytest.mark.asyncio
+async def test_record_usage_concurrently(db_session):
+    """
+    Concurrent usage reports for one subdivision are all counted.
+    """
+    subdivision = await create_subdivision_with_active_license(db_session, 1000)
+
+    async def report():
+        service = SubdivisionService(db_session_factory=db_session)
+        return await service.record_usage(
+            RecordUsageCommand(subdivision_id=subdivision.id, count_requests=5)
+        )
+
+    usages = await asyncio.gather(*(report() for _ in range(20)))
+
+    assert sorted(usage.used_requests for usage in usages) == list(range(5, 101, 5))
+    subdivision_service = SubdivisionService(db_session_factory=db_session)
+    subdivision = await subdivision_service.get_subdivision_by_id(subdivision.id)
+    assert subdivision.total_count_requests == 100
+    assert len(subdivision.statistics) == 20
+
+
+@pytest.mark.asyncio
+async def test_add_statistic_row_and_record_usage_concurrently(db_session):
+    """
+    Concurrent reports by the aggregate and by the fast path
+    for one subdivision are all counted.
+    """
+    subdivision = await create_subdivision_with_active_license(db_session, 1000)
+
+    async def add_row():
+        service = SubdivisionService(db_session_factory=db_session)
+        await service.add_subdivision_statistic_row(
+            AddStatisticRowCommand(
+                created=datetime.now(), count_requests=5, subdivision_id=subdivision.id
+            )
+        )
+
+    async def report():
+        service = SubdivisionService(db_session_factory=db_session)
+        await service.record_usage(
+            RecordUsageCommand(subdivision_id=subdivision.id, count_requests=5)
+        )
+
+    await asyncio.gather(
+        *(add_row() for _ in range(10)), *(report() for _ in range(10))
+    )
+
+    subdivision_service = SubdivisionService(db_session_factory=db_session)
+    subdivision = await subdivision_service.get_subdivision_by_id(subdivision.id)
+    assert subdivision.total_count_requests == 100
+    assert len(subdivision.statistics) == 20
+
+
+@pytest.mark.asyncio
+async def test_add_statistic_rows_batch(db_session):
+    """
+    Integration test for batch usage ingestion:
+    - record a batch for two subdivisions and an unknown one
+    - verify per-item results, expired licenses and counters
+    """
+    first = await create_subdivision_with_active_license(db_session, 100)
+    second = await create_subdivision_with_active_license(db_session, 10)
+    unknown_id = uuid4()
+    infra_event_bus = MockEventBus()
+    subdivision_service = SubdivisionService(
+        infra_event_bus=infra_event_bus, db_session_factory=db_session
+    )
+
+    usage_batch = await subdivision_service.add_statistic_rows_batch(
+        AddStatisticRowsBatchCommand(
+            items=(
+                StatisticRowsBatchItem(subdivision_id=first.id, count_requests=10),
+                StatisticRowsBatchItem(subdivision_id=second.id, count_requests=6),
+                StatisticRowsBatchItem(subdivision_id=unknown_id, count_requests=1),
+                StatisticRowsBatchItem(subdivision_id=first.id, count_requests=20),
+                StatisticRowsBatchItem(subdivision_id=second.id, count_requests=6),
+            ),
+            created=datetime.now(),
+        )
+    )
+
+    assert [
+        (usage.subdivision_id, usage.used_requests, usage.license_active)
+        for usage in usage_batch.accepted
+    ] == [
+        (first.id, 10, True),
+        (second.id, 6, True),
+        (first.id, 30, True),
+        (second.id, 12, False),
+    ]
+    assert len(usage_batch.rejected) == 1
+    assert usage_batch.rejected[0].subdivision_id == unknown_id
+    assert usage_batch.rejected[0].reason == SubdivisionNotFoundError.DETAIL
+    assert usage_batch.expired_license_ids == [second.licenses[0].id]
+
+    stat_row_events = [
+        event
+        for event in infra_event_bus.events
+        if isinstance(event, StatisticRowAddedEvent)
+    ]
+    assert len(stat_row_events) == 4
+    assert isinstance(infra_event_bus.events[-1], SubdivisionLicenseExpiredEvent)
+    assert infra_event_bus.events[-1].id == second.id
+
+    first = await subdivision_service.get_subdivision_by_id(first.id)
+    assert first.total_count_requests == 30
+    assert len(first.statistics) == 2
+    second = await subdivision_service.get_subdivision_by_id(second.id)
+    assert not second.is_active
+    assert len(second.statistics) == 2
+
+    usage_batch = await subdivision_service.add_statistic_rows_batch(
+        AddStatisticRowsBatchCommand(
+            items=(StatisticRowsBatchItem(subdivision_id=second.id, count_requests=1),),
+            created=datetime.now(),
+        )
+    )
+    assert usage_batch.accepted == []
+    assert usage_batch.rejected[0].reason == SubdivisionInactiveError.DETAIL
+
+
+@pytest.mark.asyncio
+async def test_expire_licenses(db_session):
+    """
+    Integration test for the expiration sweep:
+    - activate licenses by time, one of them expired
+    - expire licenses
+    - verify only the expired license and its subdivision are deactivated
+    """
+    infra_event_bus = MockEventBus()
+    domain_event_bus = MockEventBus()
+    subdivision_service = SubdivisionService(
+        domain_event_bus=domain_event_bus,
+        infra_event_bus=infra_event_bus,
+        db_session_factory=db_session,
+    )
+    tenant = await TenantService(db_session_factory=db_session).create_tenant(
+        CreateTenantCommand(
+            user_id=uuid4(),
+            name="Expiration Tenant",
+            address="505 Expiration St",
+            email="expiration@example.com",
+            phone="+888888888",
+        )
+    )
+    licenses = []
+    for name in ("Expired", "Valid"):
+        subdivision = await subdivision_service.create_subdivision(
+            CreateSubdivisionCommand(
+                name=f"{name} Subdivision", location="Time City", tenant_id=tenant.id
+            )
+        )
+        subdivision = await subdivision_service.add_license(
+            CreateLicenseCommand(
+                type=LicenseType.BYTIME,
+                count_requests=None,
+                name=f"{name} License",
+                description="License by time",
+                subdivision_id=subdivision.id,
+            )
+        )
+        license = subdivision.licenses[0]
+        await subdivision_service.activate_subdivision_license(
+            subdivision_id=subdivision.id, license_id=license.id
+        )
+        licenses.append(license)
+    expired_license, valid_license = licenses
+
+    now = datetime.now()
+    async with db_session() as session:
+        await session.execute(
+            text("UPDATE lisenses SET expiration = :expiration WHERE id = :id"),
+            {"expiration": now - timedelta(minutes=1), "id": expired_license.id},
+        )
+        await session.execute(
+            text("UPDATE lisenses SET expiration = :expiration WHERE id = :id"),
+            {"expiration": now + timedelta(days=1), "id": valid_license.id},
+        )
+        await session.commit()
+    infra_event_bus.events.clear()
+    domain_event_bus.events.clear()
+
+    expired_ids = await subdivision_service.expire_licenses(
+        ExpireLicensesCommand(now=now, batch_size=100)
+    )
+
+    assert expired_license.id in expired_ids
+    assert valid_license.id not in expired_ids
+    assert any(
+        isinstance(event, SubdivisionLicenseExpiredEvent)
+        and event.id == expired_license.subdivision_id
+        for event in infra_event_bus.events
+    )
+    assert any(
+        isinstance(event, LicenseDeactivatedEvent) and event.id == expired_license.id
+        for event in domain_event_bus.events
+    )
+
+    expired = await subdivision_service.get_subdivision_by_id(
+        expired_license.subdivision_id
+    )
+    assert not expired.is_active
+    assert not expired.licenses[0].is_active
+    assert expired.licenses[0].expirated == now
+    valid = await subdivision_service.get_subdivision_by_id(
+        valid_license.subdivision_id
+    )
+    assert valid.is_active
+    assert valid.licenses[0].is_active
+
+    expired_ids = await subdivision_service.expire_licenses(
+        ExpireLicensesCommand(now=now, batch_size=100)
+    )
+    assert expired_license.id not in expired_ids
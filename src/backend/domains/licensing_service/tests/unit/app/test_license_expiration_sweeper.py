@@ -0,0 +1,39 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from backend.domains.licensing_service.app.commands.license_expiration_sweeper import (
+    LicenseExpirationSweeper,
+)
+
+
+class FakeMessageBus:
+    """
+    Deactivates expired licenses by batches like the database.
+    """
+
+    def __init__(self, expired_count):
+        self.expired = [uuid4() for _ in range(expired_count)]
+        self.commands = []
+
+    async def handle(self, message):
+        self.commands.append(message)
+        batch = self.expired[: message.batch_size]
+        del self.expired[: message.batch_size]
+        return batch
+
+
+@pytest.mark.asyncio
+async def test_sweep_takes_batches_till_nothing_expired():
+    messagebus = FakeMessageBus(expired_count=5)
+    sweeper = LicenseExpirationSweeper(
+        messagebus_factory=lambda: messagebus, batch_size=2
+    )
+    now = datetime(2025, 1, 1)
+
+    expired = await sweeper.sweep(now=now)
+
+    assert len(expired) == 5
+    assert [command.batch_size for command in messagebus.commands] == [2, 2, 2]
+    assert all(command.now == now for command in messagebus.commands)
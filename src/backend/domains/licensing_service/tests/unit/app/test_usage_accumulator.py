@@ -0,0 +1,133 @@
+from uuid import uuid4
+
+import pytest
+
+from backend.domains.licensing_service.app.commands.usage_accumulator import (
+    UsageAccumulator,
+)
+from backend.domains.licensing_service.domain.exceptions.license import (
+    LicenseInactiveError,
+)
+from backend.domains.licensing_service.domain.value_objects.license_type import (
+    LicenseType,
+)
+from backend.domains.licensing_service.domain.value_objects.license_usage import (
+    LicenseState,
+    LicenseUsage,
+    LicenseUsageBatch,
+)
+from backend.domains.licensing_service.domain.value_objects.work_status import (
+    WorkStatus,
+)
+
+
+class FakeMessageBus:
+    """
+    Records batches like the database: counters of licenses with limits.
+    """
+
+    def __init__(self, limits):
+        self.limits = limits
+        self.used = {subdivision_id: 0 for subdivision_id in limits}
+        self.commands = []
+        self.fail = False
+
+    async def handle(self, message):
+        if self.fail:
+            raise ConnectionError("database is down")
+        self.commands.append(message)
+        accepted = []
+        for item in message.items:
+            self.used[item.subdivision_id] += item.count_requests
+            used = self.used[item.subdivision_id]
+            limit = self.limits[item.subdivision_id]
+            accepted.append(
+                LicenseUsage.make(
+                    subdivision_id=item.subdivision_id,
+                    license_id=uuid4(),
+                    statistic_row_id=uuid4(),
+                    count_requests=item.count_requests,
+                    used_requests=used,
+                    limit_requests=limit,
+                    license_active=used < limit,
+                )
+            )
+        return LicenseUsageBatch(accepted=accepted, rejected=[], expired_license_ids=[])
+
+
+def make_accumulator(messagebus, **kwargs):
+    async def load_state(subdivision_id):
+        return LicenseState(
+            subdivision_id=subdivision_id,
+            work_status=WorkStatus.ACTIVE,
+            license_id=uuid4(),
+            license_type=LicenseType.BYCOUNT,
+            limit_requests=messagebus.limits[subdivision_id],
+            used_requests=messagebus.used[subdivision_id],
+        )
+
+    return UsageAccumulator(
+        messagebus_factory=lambda: messagebus, load_state=load_state, **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_usage_is_summed_and_flushed_as_one_batch():
+    first, second = uuid4(), uuid4()
+    messagebus = FakeMessageBus(limits={first: 100, second: 100})
+    accumulator = make_accumulator(messagebus)
+    await accumulator.start()
+
+    for _ in range(3):
+        await accumulator.add(first, 2)
+    state = await accumulator.add(second, 5)
+    assert state.remaining_requests == 95
+    assert messagebus.commands == []
+
+    await accumulator.stop()
+
+    [command] = messagebus.commands
+    assert {item.subdivision_id: item.count_requests for item in command.items} == {
+        first: 6,
+        second: 5,
+    }
+    assert accumulator.unrecorded == 0
+
+
+@pytest.mark.asyncio
+async def test_reaching_limit_is_flushed_at_once_and_next_usage_rejected():
+    subdivision_id = uuid4()
+    messagebus = FakeMessageBus(limits={subdivision_id: 10})
+    accumulator = make_accumulator(messagebus)
+    await accumulator.start()
+
+    await accumulator.add(subdivision_id, 6)
+    state = await accumulator.add(subdivision_id, 4)
+
+    assert not state.licensed
+    assert len(messagebus.commands) == 1
+    assert messagebus.used[subdivision_id] == 10
+    with pytest.raises(LicenseInactiveError):
+        await accumulator.add(subdivision_id, 1)
+    await accumulator.stop()
+
+
+@pytest.mark.asyncio
+async def test_unrecorded_usage_is_bounded_and_kept_on_failure():
+    subdivision_id = uuid4()
+    messagebus = FakeMessageBus(limits={subdivision_id: 1000})
+    accumulator = make_accumulator(messagebus, max_unrecorded=10)
+    await accumulator.start()
+
+    await accumulator.add(subdivision_id, 8)
+    messagebus.fail = True
+    # It would exceed the bound, so it waits for a flush, which fails:
+    with pytest.raises(ConnectionError):
+        await accumulator.add(subdivision_id, 5)
+    assert accumulator.unrecorded == 8
+
+    messagebus.fail = False
+    await accumulator.add(subdivision_id, 5)
+    assert messagebus.used[subdivision_id] == 8
+    await accumulator.stop()
+    assert messagebus.used[subdivision_id] == 13
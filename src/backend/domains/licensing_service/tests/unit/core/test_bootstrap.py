@@ -0,0 +1,66 @@
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from backend.core.bootstrap import Bootstrap
+from backend.core.infra import (
+    AbstractCommand,
+    AbstractCommandHandler,
+    AbstractEvent,
+    AbstractEventHandler,
+)
+from backend.core.infra.eventbus import ContextEventBus
+
+
+@dataclass(frozen=True)
+class FakeCommand(AbstractCommand):
+    name: str
+
+
+@dataclass(frozen=True)
+class FakeEvent(AbstractEvent):
+    name: str
+
+
+class FakeCommandHandler(AbstractCommandHandler):
+    async def __call__(self, command: FakeCommand) -> str:
+        await asyncio.sleep(0)
+        self.domain_event_bus.add_event(FakeEvent(name=command.name))
+        await asyncio.sleep(0)
+        return command.name
+
+
+def make_bootstrap(handled_events: list) -> Bootstrap:
+    class FakeEventHandler(AbstractEventHandler):
+        async def __call__(self, event: FakeEvent) -> None:
+            handled_events.append(event.name)
+
+    return Bootstrap(
+        domain_event_bus=ContextEventBus(),
+        infra_event_bus=ContextEventBus(),
+        events_handlers_for_injection={FakeEvent: [FakeEventHandler]},
+        commands_handlers_for_injection={FakeCommand: FakeCommandHandler},
+    )
+
+
+def test_messagebus_is_created_once():
+    bootstrap = make_bootstrap([])
+
+    assert bootstrap.get_messagebus() is bootstrap.get_messagebus()
+
+
+@pytest.mark.asyncio
+async def test_shared_handlers_keep_events_of_concurrent_requests_apart():
+    handled_events = []
+    bootstrap = make_bootstrap(handled_events)
+
+    async def request(name: str) -> str:
+        messagebus = bootstrap.get_messagebus()
+        return await messagebus.handle(FakeCommand(name=name))
+
+    names = [f"request-{number}" for number in range(10)]
+    results = await asyncio.gather(*(asyncio.create_task(request(n)) for n in names))
+
+    assert results == names
+    assert sorted(handled_events) == sorted(names)
@@ -0,0 +1,55 @@
+import pytest
+
+from backend.core.infra.cache import TTLCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = Clock()
+    cache = TTLCache(maxsize=10, ttl=5.0, clock=clock)
+    cache.set("key", "value")
+
+    clock.now = 4.9
+    assert cache.get("key") == "value"
+    clock.now = 5.0
+    assert cache.get("key") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_dropped():
+    cache = TTLCache(maxsize=2, ttl=5.0)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+@pytest.mark.asyncio
+async def test_load_is_not_stored_after_invalidation():
+    cache = TTLCache(maxsize=10, ttl=5.0)
+
+    async def load():
+        # Change is commited and invalidated while the old state is read:
+        cache.invalidate("key")
+        return "old"
+
+    assert await cache.get_or_load("key", load) == "old"
+    assert cache.get("key") is None
+
+    async def load_new():
+        return "new"
+
+    assert await cache.get_or_load("key", load_new) == "new"
+    assert cache.get("key") == "new"
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,66 @@
+import csv
+import io
+import json
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from backend.core.infra.export import csv_chunks, export_chunks, ndjson_chunks
+
+COLUMNS = ["id", "created", "count_requests"]
+
+
+def make_rows(count):
+    return [
+        {"id": uuid4(), "created": datetime(2025, 1, 1, 0, i), "count_requests": i}
+        for i in range(count)
+    ]
+
+
+async def batches(*rows_batches):
+    for rows in rows_batches:
+        yield rows
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_chunk_per_batch():
+    rows = make_rows(3)
+
+    chunks = await collect(ndjson_chunks(batches(rows[:2], rows[2:])))
+
+    assert len(chunks) == 2
+    lines = "".join(chunks).splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {
+            "id": str(row["id"]),
+            "created": row["created"].isoformat(),
+            "count_requests": row["count_requests"],
+        }
+        for row in rows
+    ]
+
+
+@pytest.mark.asyncio
+async def test_csv_has_header_and_rows():
+    rows = make_rows(3)
+
+    chunks = await collect(csv_chunks(batches(rows[:1], rows[1:]), columns=COLUMNS))
+
+    # Header is a chunk of its own:
+    assert len(chunks) == 3
+    read = list(csv.DictReader(io.StringIO("".join(chunks))))
+    assert [item["id"] for item in read] == [str(row["id"]) for row in rows]
+    assert read[0]["created"] == rows[0]["created"].isoformat()
+
+
+@pytest.mark.asyncio
+async def test_empty_export():
+    assert await collect(export_chunks(batches(), "ndjson", columns=COLUMNS)) == []
+    assert await collect(export_chunks(batches(), "csv", columns=COLUMNS)) == [
+        "id,created,count_requests\r\n"
+    ]
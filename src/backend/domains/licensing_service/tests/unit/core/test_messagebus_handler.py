@@ -0,0 +1,268 @@
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from backend.core.background_dispatcher import BackgroundDispatcher
+from backend.core.exceptions import MessageBusMessageError
+from backend.core.infra import (
+    AbstractCommand,
+    AbstractCommandHandler,
+    AbstractEvent,
+    AbstractEventHandler,
+)
+from backend.core.infra.eventbus import ContextEventBus
+from backend.core.messagebus_handler import (
+    GlobalMessageBusHandler,
+    plan_event_handlers,
+)
+
+
+@dataclass(frozen=True)
+class FakeCommand(AbstractCommand):
+    name: str
+
+
+@dataclass(frozen=True)
+class FakeEvent(AbstractEvent):
+    name: str
+
+
+@dataclass(frozen=True)
+class FakeNextEvent(AbstractEvent):
+    name: str
+
+
+class FakeCommandHandler(AbstractCommandHandler):
+    async def __call__(self, command: FakeCommand) -> str:
+        self.domain_event_bus.add_event(FakeEvent(name=command.name))
+        await asyncio.sleep(0)
+        return command.name
+
+
+class FakeEventHandler(AbstractEventHandler):
+    async def __call__(self, event: FakeEvent) -> None:
+        await asyncio.sleep(0)
+        self.infra_event_bus.add_event(FakeNextEvent(name=event.name))
+
+
+def make_messagebus(
+    handled_events: list, background: BackgroundDispatcher = None
+) -> GlobalMessageBusHandler:
+    class FakeNextEventHandler(AbstractEventHandler):
+        async def __call__(self, event: FakeNextEvent) -> None:
+            await asyncio.sleep(0.01)
+            handled_events.append(event.name)
+
+    domain_event_bus, infra_event_bus = ContextEventBus(), ContextEventBus()
+    dependencies = dict(
+        domain_event_bus=domain_event_bus, infra_event_bus=infra_event_bus
+    )
+    return GlobalMessageBusHandler(
+        domain_event_bus=domain_event_bus,
+        infra_event_bus=infra_event_bus,
+        event_handlers={
+            FakeEvent: [FakeEventHandler(**dependencies)],
+            FakeNextEvent: [FakeNextEventHandler(**dependencies)],
+        },
+        command_handlers={FakeCommand: FakeCommandHandler(**dependencies)},
+        background=background,
+    )
+
+
+@pytest.mark.asyncio
+async def test_handle_returns_command_result_and_handles_events():
+    handled_events = []
+    messagebus = make_messagebus(handled_events)
+
+    assert await messagebus.handle(FakeCommand(name="first")) == "first"
+    assert handled_events == ["first"]
+
+
+@pytest.mark.asyncio
+async def test_one_messagebus_serves_concurrent_commands():
+    handled_events = []
+    messagebus = make_messagebus(handled_events)
+    names = [f"command-{number}" for number in range(20)]
+
+    results = await asyncio.gather(
+        *(messagebus.handle(FakeCommand(name=name)) for name in names)
+    )
+
+    assert results == names
+    assert sorted(handled_events) == sorted(names)
+
+
+@pytest.mark.asyncio
+async def test_handle_rejects_unknown_message():
+    messagebus = make_messagebus([])
+
+    with pytest.raises(MessageBusMessageError):
+        await messagebus.handle("not a message")
+
+
+def make_fan_out_messagebus(*handler_classes) -> GlobalMessageBusHandler:
+    domain_event_bus, infra_event_bus = ContextEventBus(), ContextEventBus()
+    dependencies = dict(
+        domain_event_bus=domain_event_bus, infra_event_bus=infra_event_bus
+    )
+    return GlobalMessageBusHandler(
+        domain_event_bus=domain_event_bus,
+        infra_event_bus=infra_event_bus,
+        event_handlers={
+            FakeEvent: [handler(**dependencies) for handler in handler_classes]
+        },
+        command_handlers={},
+    )
+
+
+def test_plan_event_handlers():
+    class First(AbstractEventHandler):
+        async def __call__(self, event): ...
+
+    class SlowIndependent(AbstractEventHandler):
+        independent = True
+
+        async def __call__(self, event): ...
+
+    class FastIndependent(AbstractEventHandler):
+        independent = True
+
+        async def __call__(self, event): ...
+
+    class AfterSlow(AbstractEventHandler):
+        independent = True
+        depends_on = (SlowIndependent,)
+
+        async def __call__(self, event): ...
+
+    dependencies = dict(domain_event_bus=None, infra_event_bus=None)
+    after_slow, first, slow, fast = (
+        handler(**dependencies)
+        for handler in (AfterSlow, First, SlowIndependent, FastIndependent)
+    )
+
+    assert plan_event_handlers([after_slow, first, slow, fast]) == [
+        [first],
+        [slow, fast],
+        [after_slow],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_independent_handlers_run_concurrently_and_isolate_errors():
+    calls = []
+
+    class Slow(AbstractEventHandler):
+        independent = True
+
+        async def __call__(self, event):
+            await asyncio.sleep(0.05)
+            calls.append("slow")
+
+    class Failing(AbstractEventHandler):
+        independent = True
+
+        async def __call__(self, event):
+            raise RuntimeError("broken handler")
+
+    class Hanging(AbstractEventHandler):
+        independent = True
+        timeout = 0.01
+
+        async def __call__(self, event):
+            await asyncio.sleep(10)
+
+    class AfterSlow(AbstractEventHandler):
+        depends_on = (Slow,)
+
+        async def __call__(self, event):
+            calls.append("after slow")
+
+    messagebus = make_fan_out_messagebus(AfterSlow, Slow, Failing, Hanging)
+
+    started = asyncio.get_running_loop().time()
+    await messagebus.handle(FakeEvent(name="event"))
+
+    assert asyncio.get_running_loop().time() - started < 0.5
+    assert calls == ["slow", "after slow"]
+    metrics = messagebus.metrics.snapshot()
+    assert metrics["Slow"]["ok"] == 1
+    assert metrics["Slow"]["max_seconds"] >= 0.05
+    assert metrics["Failing"]["error"] == 1
+    assert metrics["Hanging"]["timeout"] == 1
+
+
+@pytest.mark.asyncio
+async def test_errors_of_sequential_handlers_are_raised():
+    class Failing(AbstractEventHandler):
+        async def __call__(self, event):
+            raise RuntimeError("broken handler")
+
+    messagebus = make_fan_out_messagebus(Failing)
+
+    with pytest.raises(RuntimeError):
+        await messagebus.handle(FakeEvent(name="event"))
+
+
+@pytest.mark.asyncio
+async def test_deferred_mode_handles_infra_events_in_background():
+    handled_events = []
+    messagebus = make_messagebus(
+        handled_events, background=BackgroundDispatcher(workers=2, queue_size=2)
+    )
+    await messagebus.start()
+    names = [f"command-{number}" for number in range(10)]
+
+    results = [await messagebus.handle(FakeCommand(name=name)) for name in names]
+
+    assert results == names
+    # Domain events are handled inline, infra events are still in the queue:
+    assert len(handled_events) < len(names)
+
+    await messagebus.stop()
+    assert sorted(handled_events) == sorted(names)
+    assert not messagebus.background.running
+
+
+@pytest.mark.asyncio
+async def test_deferred_mode_runs_not_deferrable_handlers_inline():
+    inline_events, background_events = [], []
+
+    class InlineHandler(AbstractEventHandler):
+        deferrable = False
+
+        async def __call__(self, event: FakeNextEvent) -> None:
+            inline_events.append(event.name)
+
+    class BackgroundHandler(AbstractEventHandler):
+        async def __call__(self, event: FakeNextEvent) -> None:
+            await asyncio.sleep(0.01)
+            background_events.append(event.name)
+
+    domain_event_bus, infra_event_bus = ContextEventBus(), ContextEventBus()
+    dependencies = dict(
+        domain_event_bus=domain_event_bus, infra_event_bus=infra_event_bus
+    )
+    messagebus = GlobalMessageBusHandler(
+        domain_event_bus=domain_event_bus,
+        infra_event_bus=infra_event_bus,
+        event_handlers={
+            FakeEvent: [FakeEventHandler(**dependencies)],
+            FakeNextEvent: [
+                BackgroundHandler(**dependencies),
+                InlineHandler(**dependencies),
+            ],
+        },
+        command_handlers={FakeCommand: FakeCommandHandler(**dependencies)},
+        background=BackgroundDispatcher(workers=2, queue_size=10),
+    )
+    await messagebus.start()
+
+    assert await messagebus.handle(FakeCommand(name="first")) == "first"
+    assert inline_events == ["first"]
+    assert background_events == []
+
+    await messagebus.stop()
+    assert inline_events == ["first"]
+    assert background_events == ["first"]
@@ -0,0 +1,80 @@
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from backend.core.exceptions import InvalidCursorError, InvalidSortError
+from backend.core.infra.database.pagination import paginate
+from backend.core.infra.pagination import (
+    PageRequest,
+    decode_cursor,
+    encode_cursor,
+    make_page,
+)
+from backend.domains.licensing_service.infra.adapters.orm import lisenses_table
+
+
+@dataclass
+class Item:
+    id: UUID
+    created: datetime
+
+
+SORT_COLUMNS = {"id": lisenses_table.c.id, "created": lisenses_table.c.created}
+
+
+def test_cursor_keeps_typed_values():
+    page_request = PageRequest(limit=2, sort="created")
+    values = [datetime(2025, 1, 2, 3, 4, 5), uuid4()]
+    cursor = encode_cursor(page_request, values)
+
+    next_request = PageRequest(limit=2, cursor=cursor, sort="created")
+    assert decode_cursor(next_request, types=[datetime, UUID]) == values
+
+
+def test_wrong_cursor_is_rejected():
+    cursor = encode_cursor(PageRequest(sort="created"), [datetime.now(), uuid4()])
+    for page_request in (
+        PageRequest(cursor="not a cursor", sort="created"),
+        # Cursor of another sorting or order:
+        PageRequest(cursor=cursor, sort="id"),
+        PageRequest(cursor=cursor, sort="created", descending=True),
+    ):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(page_request, types=[datetime, UUID])
+
+
+def test_make_page_cuts_extra_item_and_points_to_last_item():
+    page_request = PageRequest(limit=2, sort="created")
+    items = [Item(id=uuid4(), created=datetime(2025, 1, day)) for day in (1, 2, 3)]
+
+    page = make_page(items, page_request)
+
+    assert page.items == items[:2]
+    next_request = PageRequest(limit=2, cursor=page.next_cursor, sort="created")
+    assert decode_cursor(next_request, types=[datetime, UUID]) == [
+        items[1].created,
+        items[1].id,
+    ]
+    assert make_page(items[:2], page_request).next_cursor is None
+
+
+def test_paginate_selects_rows_after_cursor():
+    cursor = encode_cursor(PageRequest(sort="created"), [datetime.now(), uuid4()])
+    page_request = PageRequest(limit=10, cursor=cursor, sort="created")
+
+    query = paginate(select(lisenses_table), page_request, SORT_COLUMNS)
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    assert "(lisenses.created, lisenses.id) > (" in sql
+    assert "ORDER BY lisenses.created, lisenses.id" in sql
+    # One extra row tells, that there is the next page:
+    assert 11 in query.compile().params.values()
+
+
+def test_paginate_rejects_unknown_sort():
+    with pytest.raises(InvalidSortError):
+        paginate(select(lisenses_table), PageRequest(sort="status"), SORT_COLUMNS)
@@ -0,0 +1,49 @@
+from datetime import datetime
+
+from backend.core.infra.database.partitions import (
+    add_months,
+    create_monthly_partition_statements,
+    monthly_partition_name,
+    months_to_create,
+    months_to_drop,
+    parse_monthly_partition_name,
+)
+
+
+def test_add_months_across_years():
+    assert add_months(datetime(2025, 11, 17, 10), 2) == datetime(2026, 1, 1)
+    assert add_months(datetime(2025, 1, 1), -1) == datetime(2024, 12, 1)
+
+
+def test_partition_name_round_trip():
+    month = datetime(2025, 3, 1)
+    name = monthly_partition_name("statistic_rows", month)
+
+    assert name == "statistic_rows_p2025_03"
+    assert parse_monthly_partition_name("statistic_rows", name) == month
+    default = "statistic_rows_default"
+    assert parse_monthly_partition_name("statistic_rows", default) is None
+
+
+def test_partition_is_attached_after_rows_moved_from_default():
+    _, move, attach = create_monthly_partition_statements(
+        "statistic_rows", datetime(2025, 12, 1)
+    )
+
+    assert "statistic_rows_default" in move
+    assert attach.endswith("FROM ('2025-12-01') TO ('2026-01-01')")
+
+
+def test_months_to_create_and_drop():
+    now = datetime(2025, 6, 15)
+    existing = [datetime(2025, month, 1) for month in range(1, 7)]
+
+    assert months_to_create(existing, now=now, ahead=2) == [
+        datetime(2025, 7, 1),
+        datetime(2025, 8, 1),
+    ]
+    # Three full months are kept besides the current one:
+    assert months_to_drop(existing, now=now, retention=3) == [
+        datetime(2025, 1, 1),
+        datetime(2025, 2, 1),
+    ]
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.core.infra.scheduling import (
+    CronSchedule,
+    IntervalSchedule,
+    advisory_lock_key,
+    due_run,
+    is_missed,
+)
+
+
+def test_cron_next_run():
+    schedule = CronSchedule("15 2 * * *")
+
+    assert schedule.next_after(datetime(2025, 3, 1, 1)) == datetime(2025, 3, 1, 2, 15)
+    next_day = schedule.next_after(datetime(2025, 3, 1, 2, 15))
+    assert next_day == datetime(2025, 3, 2, 2, 15)
+    next_year = schedule.next_after(datetime(2025, 12, 31, 3))
+    assert next_year == datetime(2026, 1, 1, 2, 15)
+
+
+def test_cron_steps_ranges_and_week_days():
+    every_ten_minutes = CronSchedule("*/10 8-9 * * 1-5")
+    # 2025-03-01 is Saturday:
+    assert every_ten_minutes.next_after(datetime(2025, 3, 1, 8, 0)) == datetime(
+        2025, 3, 3, 8, 0
+    )
+    assert every_ten_minutes.next_after(datetime(2025, 3, 3, 9, 50)) == datetime(
+        2025, 3, 4, 8, 0
+    )
+    # Either day of month or Sunday, as in cron:
+    first_or_sunday = CronSchedule("0 0 1 * 7")
+    assert first_or_sunday.next_after(datetime(2025, 3, 1, 0, 0)) == datetime(
+        2025, 3, 2, 0, 0
+    )
+    assert first_or_sunday.next_after(datetime(2025, 3, 30, 0, 0)) == datetime(
+        2025, 4, 1, 0, 0
+    )
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "0 0 30 2 *"])
+def test_invalid_cron(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression).next_after(datetime(2025, 1, 1))
+
+
+def test_interval_job_without_runs_is_due_at_once():
+    schedule = IntervalSchedule(60)
+    started = datetime(2025, 1, 1, 12, 0)
+
+    assert due_run(schedule, None, started, started) == started
+
+
+def test_cron_job_without_runs_waits_for_first_run():
+    schedule = CronSchedule("0 3 * * *")
+    started = datetime(2025, 1, 1, 12, 0)
+
+    assert due_run(schedule, None, started, datetime(2025, 1, 2, 2, 59)) is None
+    assert due_run(schedule, None, started, datetime(2025, 1, 2, 3, 0)) == datetime(
+        2025, 1, 2, 3, 0
+    )
+
+
+def test_missed_runs_are_coalesced():
+    schedule = CronSchedule("0 3 * * *")
+    last_run = datetime(2025, 1, 1, 3, 0)
+    now = datetime(2025, 1, 5, 12, 0)
+
+    run = due_run(schedule, last_run, last_run, now)
+
+    assert run == datetime(2025, 1, 5, 3, 0)
+    assert is_missed(schedule, run, last_run)
+    assert not is_missed(schedule, schedule.next_after(last_run), last_run)
+
+
+def test_interval_run_is_counted_from_last_run():
+    schedule = IntervalSchedule(60)
+    last_run = datetime(2025, 1, 1, 12, 0)
+
+    soon = last_run + timedelta(seconds=59)
+    assert due_run(schedule, last_run, last_run, soon) is None
+    assert due_run(
+        schedule, last_run, last_run, last_run + timedelta(seconds=150)
+    ) == last_run + timedelta(seconds=120)
+
+
+def test_advisory_lock_key_is_stable_bigint():
+    key = advisory_lock_key("licensing_service.expire_licenses")
+
+    assert key == advisory_lock_key("licensing_service.expire_licenses")
+    assert key != advisory_lock_key("licensing_service.reconcile_license_counters")
+    assert -(2**63) <= key < 2**63
@@ -109,3 +109,20 @@ def test_check_by_time_deactivates_if_expired():
     license.check(count_requests=0)
     assert license.status == LicenseStatus.INACTIVE
     assert license.expirated is not None
+
+
+def test_used_requests_are_counted_and_reset_on_activate():
+    license = License.make(
+        name="Count License",
+        description="Count description",
+        type=LicenseType.BYCOUNT,
+        subdivision_id=uuid4(),
+        count_requests=10,
+    )
+    license.activate()
+    license.add_used_requests(3)
+    license.add_used_requests(4)
+    assert license.used_requests == 7
+
+    license.activate()
+    assert license.used_requests == 0
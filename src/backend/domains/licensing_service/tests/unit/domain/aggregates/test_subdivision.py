@@ -309,3 +309,36 @@ async def test_license_deactivation_when_limit_reached():
     assert isinstance(domain_event_bus.events[-2], LicenseDeactivatedEvent)
     assert isinstance(domain_event_bus.events[-1], StatisticRowAddedEvent)
     assert len(domain_event_bus.events) == 3
+
+
+@pytest.mark.asyncio
+async def test_total_count_requests_uses_license_counter():
+    """
+    Test for Subdivision
+    - add license and activate it
+    - add statistic rows
+    - check counter of active license
+    - reactivate license and check counter is reset
+    """
+    subdivision = Subdivision.make(name="Test", location="Somewhere", tenant_id=uuid4())
+    license = subdivision.add_license(
+        subdivision_id=subdivision.id,
+        name="TestLicense1",
+        description="Test License1 test123",
+        type=LicenseType.BYCOUNT,
+        count_requests=100,
+    )
+    await subdivision.activate_license(license.id, None)
+
+    for count_requests in (10, 20):
+        stat_row = StatisticRow.make(
+            count_requests=count_requests, subdivision_id=subdivision.id
+        )
+        stat_row.id = uuid4()
+        await subdivision.save_day_statistic(stat_row, eventbus=None)
+
+    assert subdivision.total_count_requests == 30
+    assert license.used_requests == 30
+
+    await subdivision.activate_license(license.id, None)
+    assert subdivision.total_count_requests == 0
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from backend.domains.licensing_service.domain.value_objects.license_type import (
+    LicenseType,
+)
+from backend.domains.licensing_service.domain.value_objects.license_usage import (
+    LicenseState,
+)
+from backend.domains.licensing_service.domain.value_objects.work_status import (
+    WorkStatus,
+)
+
+
+def make_state(**kwargs):
+    return LicenseState(
+        subdivision_id=uuid4(),
+        work_status=kwargs.pop("work_status", WorkStatus.ACTIVE),
+        license_id=uuid4(),
+        **kwargs,
+    )
+
+
+def test_license_by_count_state():
+    state = make_state(
+        license_type=LicenseType.BYCOUNT, limit_requests=10, used_requests=4
+    )
+    assert state.licensed
+    assert state.remaining_requests == 6
+
+    state = make_state(
+        license_type=LicenseType.BYCOUNT, limit_requests=10, used_requests=12
+    )
+    assert not state.licensed
+    assert state.remaining_requests == 0
+
+
+def test_license_by_time_expires_without_change_of_state():
+    state = make_state(
+        license_type=LicenseType.BYTIME,
+        expiration=datetime.now() - timedelta(seconds=1),
+    )
+    assert not state.licensed
+    assert state.remaining_requests is None
+
+
+def test_not_licensed_without_active_license_or_inactive_subdivision():
+    state = LicenseState(subdivision_id=uuid4(), work_status=WorkStatus.ACTIVE)
+    assert not state.licensed
+    assert not make_state(
+        work_status=WorkStatus.INACTIVE, license_type=LicenseType.BYTIME
+    ).licensed
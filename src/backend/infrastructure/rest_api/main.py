@@ -6,20 +6,30 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
+from backend.core.config import scheduler_config
 from backend.core.infra.database.connection import DATABASE_URL
 from backend.core.infra.database.metadata import metadata
+from backend.core.infra.database.scheduler import Scheduler
 
 from .config import cors_config
 
 from backend.domains.licensing_service.api.v1.routers import (
     api_router as licensing_service_router
 )
+from backend.domains.licensing_service.api.deps import (
+    bootstrap as licensing_service_bootstrap,
+    scheduled_jobs as licensing_service_scheduled_jobs,
+    usage_accumulator as licensing_service_usage_accumulator,
+)
 
 from backend.domains.licensing_service.infra.adapters.orm import (
     start_mappers as start_tenants_mappers
 )
 from backend.domains.licensing_service.infra.adapters.kafka_adapter import (
-    create_topics
+    create_topics, start_producer, stop_producer
+)
+from backend.domains.licensing_service.infra.adapters.outbox_relay import (
+    OutboxRelay
 )
 
 
@@ -37,10 +47,27 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator:
     start_tenants_mappers()
     # topics=KAFKA_TOPICS, kafka_servers=KAFKA_SERVERS
     create_topics()
+    start_producer()
+    outbox_relay = OutboxRelay()
+    await outbox_relay.start()
+    messagebus = licensing_service_bootstrap.get_messagebus()
+    await messagebus.start()
+    await licensing_service_usage_accumulator.start()
+    # Every worker runs the scheduler, each job run is made by one of them:
+    scheduler = Scheduler(jobs=licensing_service_scheduled_jobs)
+    if scheduler_config.SCHEDULER_ENABLED:
+        await scheduler.start()
 
     yield
 
     # Shutdown events:
+    await scheduler.stop()
+    # Buffered usage is recorded through messagebus, so it goes first:
+    await licensing_service_usage_accumulator.stop()
+    # Background events can still write to outbox, so drain them first:
+    await messagebus.stop()
+    await outbox_relay.stop()
+    stop_producer()
     clear_mappers()
 
 
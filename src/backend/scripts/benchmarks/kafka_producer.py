@@ -0,0 +1,215 @@
+"""
+Benchmark of sending events to Kafka with kafka-python:
+"before" - new KafkaProducer and flush for every event (old ExternalMessageBusSender),
+"after" - one shared producer which batches messages in background.
+
+By default it runs against a local stand-in broker, which speaks the Kafka
+protocol (ApiVersions, Metadata and Produce requests) to the real
+KafkaProducer and emulates network round-trip of every request (--rtt-ms).
+Pass --bootstrap-servers to run it against a real broker.
+
+Usage:
+    python scripts/benchmarks/kafka_producer.py --events 200 --rtt-ms 1
+    python scripts/benchmarks/kafka_producer.py --bootstrap-servers localhost:9091
+"""
+import argparse
+import logging
+import socketserver
+import struct
+import threading
+import time
+from io import BytesIO
+from typing import Optional
+from uuid import uuid4
+
+from kafka import KafkaProducer
+from kafka.protocol.admin import ApiVersionRequest
+from kafka.protocol.metadata import MetadataRequest
+from kafka.protocol.produce import ProduceRequest
+from kafka.protocol.types import Int16, Int32, String
+from kafka.record import MemoryRecords
+
+NODE_ID = 0
+# Requests of the stand-in by api key, with versions of a 0.10.1 broker:
+REQUESTS = {
+    ProduceRequest[0].API_KEY: (ProduceRequest, 2),
+    MetadataRequest[0].API_KEY: (MetadataRequest, 2),
+    ApiVersionRequest[0].API_KEY: (ApiVersionRequest, 0),
+}
+
+
+class StandInBroker(socketserver.ThreadingTCPServer):
+    """
+    Single broker, leader of all partitions of the topic.
+    Every request costs one round-trip, records are counted and dropped.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, topic: str, partitions: int, rtt_ms: float) -> None:
+        super().__init__(("127.0.0.1", 0), StandInConnection)
+        self.topic = topic
+        self.partitions = partitions
+        self.rtt = rtt_ms / 1000
+        self.connections = 0
+        self.requests = 0
+        self.received = 0
+        self.lock = threading.Lock()
+
+    @property
+    def address(self) -> str:
+        host, port = self.server_address
+        return f"{host}:{port}"
+
+    def respond(self, api_key: int, version: int, request):
+        if api_key == ApiVersionRequest[0].API_KEY:
+            return request.RESPONSE_TYPE(
+                error_code=0,
+                api_versions=[
+                    (key, 0, max_version)
+                    for key, (_, max_version) in REQUESTS.items()
+                ],
+            )
+        if api_key == MetadataRequest[0].API_KEY:
+            host, port = self.server_address
+            broker = (NODE_ID, host, port) + (("",) if version >= 1 else ())
+            partitions = [
+                (0, partition, NODE_ID, [NODE_ID], [NODE_ID])
+                for partition in range(self.partitions)
+            ]
+            topic = (0, self.topic) + ((False,) if version >= 1 else ())
+            fields = dict(brokers=[broker], topics=[topic + (partitions,)])
+            if version >= 1:
+                fields["controller_id"] = NODE_ID
+            if version >= 2:
+                fields["cluster_id"] = None
+            return request.RESPONSE_TYPE(**fields)
+        topics = []
+        for topic, partitions in request.topics:
+            for _, messages in partitions:
+                records = MemoryRecords(messages)
+                while records.has_next():
+                    with self.lock:
+                        self.received += len(list(records.next_batch()))
+            topics.append(
+                (topic, [(partition, 0, 0, -1) for partition, _ in partitions])
+            )
+        return request.RESPONSE_TYPE(topics=topics, throttle_time_ms=0)
+
+
+class StandInConnection(socketserver.BaseRequestHandler):
+
+    def handle(self) -> None:
+        broker: StandInBroker = self.server
+        with broker.lock:
+            broker.connections += 1
+        sock = self.request
+        while True:
+            size = self._read(sock, 4)
+            if size is None:
+                return
+            data = BytesIO(self._read(sock, struct.unpack(">i", size)[0]))
+            api_key, version = Int16.decode(data), Int16.decode(data)
+            correlation_id = Int32.decode(data)
+            String("utf-8").decode(data)  # client id
+            request_type, max_version = REQUESTS[api_key]
+            if version > max_version:
+                return
+            request = request_type[version].decode(data)
+            time.sleep(broker.rtt)
+            with broker.lock:
+                broker.requests += 1
+            response = broker.respond(api_key, version, request)
+            if api_key == ProduceRequest[0].API_KEY and request.required_acks == 0:
+                continue
+            message = Int32.encode(correlation_id) + response.encode()
+            sock.sendall(Int32.encode(len(message)) + message)
+
+    @staticmethod
+    def _read(sock, size: int) -> Optional[bytes]:
+        data = b""
+        while len(data) < size:
+            chunk = sock.recv(size - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return data
+
+
+def make_producer(args, servers: str) -> KafkaProducer:
+    # Same settings as backend's start_producer:
+    return KafkaProducer(
+        bootstrap_servers=servers.split(","),
+        linger_ms=args.linger_ms,
+        batch_size=args.batch_size,
+        compression_type=args.compression_type,
+    )
+
+
+def run_before(args, servers: str, payload: bytes) -> float:
+    start = time.perf_counter()
+    for _ in range(args.events):
+        producer = make_producer(args, servers)
+        producer.send(args.topic, key=uuid4().bytes, value=payload)
+        producer.flush()
+        producer.close()
+    return time.perf_counter() - start
+
+
+def run_after(args, servers: str, payload: bytes) -> float:
+    start = time.perf_counter()
+    producer = make_producer(args, servers)
+    for _ in range(args.events):
+        producer.send(args.topic, key=uuid4().bytes, value=payload)
+    producer.flush()
+    producer.close()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--payload-size", type=int, default=200)
+    parser.add_argument("--topic", default="main-topic")
+    parser.add_argument("--partitions", type=int, default=6)
+    parser.add_argument("--rtt-ms", type=float, default=1.0)
+    parser.add_argument("--linger-ms", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=16384)
+    parser.add_argument("--compression-type", default=None)
+    parser.add_argument("--bootstrap-servers", default=None)
+    args = parser.parse_args()
+    # Closed producers log each of their connections:
+    logging.getLogger("kafka").setLevel(logging.ERROR)
+
+    payload = b"x" * args.payload_size
+    results = {}
+    for name, runner in (("before", run_before), ("after", run_after)):
+        broker = None
+        servers = args.bootstrap_servers
+        if servers is None:
+            broker = StandInBroker(args.topic, args.partitions, args.rtt_ms)
+            threading.Thread(target=broker.serve_forever, daemon=True).start()
+            servers = broker.address
+        try:
+            elapsed = runner(args, servers, payload)
+        finally:
+            if broker is not None:
+                broker.shutdown()
+                broker.server_close()
+        results[name] = args.events / elapsed
+        stats = ""
+        if broker is not None:
+            stats = (
+                f", connections: {broker.connections}, "
+                f"requests: {broker.requests}, records: {broker.received}"
+            )
+        print(
+            f"{name:>6}: {args.events} events in {elapsed:.3f}s, "
+            f"{results[name]:.0f} events/sec{stats}"
+        )
+    print(f"speedup: x{results['after'] / results['before']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
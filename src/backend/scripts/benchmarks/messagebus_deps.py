@@ -0,0 +1,107 @@
+"""
+Benchmark of resolving messagebus dependency for one request:
+"before" - new Bootstrap for every request, which inspects signatures
+and creates all command and event handlers (old api.deps),
+"after" - one Bootstrap for the application, requests share its messagebus.
+
+By default it uses handlers of licensing service (needs all its dependencies).
+Pass --synthetic to run it with generated handlers of the same shape.
+
+Usage:
+    python scripts/benchmarks/messagebus_deps.py --requests 20000
+    python scripts/benchmarks/messagebus_deps.py --synthetic --handlers 40
+"""
+import argparse
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Type
+
+from backend.core.bootstrap import Bootstrap
+from backend.core.infra import (
+    AbstractCommand,
+    AbstractCommandHandler,
+    AbstractEvent,
+    AbstractEventHandler,
+)
+from backend.core.infra.eventbus import ContextEventBus
+
+
+def make_synthetic_handlers(count: int) -> Tuple[Dict, Dict]:
+    events_handlers: Dict[Type[AbstractEvent], List[Type[AbstractEventHandler]]] = {}
+    commands_handlers: Dict[Type[AbstractCommand], Type[AbstractCommandHandler]] = {}
+
+    async def call(self, message):
+        return None
+
+    for number in range(count):
+        event = dataclass(frozen=True)(type(f"Event{number}", (AbstractEvent,), {}))
+        command = dataclass(frozen=True)(
+            type(f"Command{number}", (AbstractCommand,), {})
+        )
+        events_handlers[event] = [
+            type(f"Event{number}Handler", (AbstractEventHandler,), {"__call__": call})
+        ]
+        commands_handlers[command] = type(
+            f"Command{number}Handler", (AbstractCommandHandler,), {"__call__": call}
+        )
+    return events_handlers, commands_handlers
+
+
+def load_handlers(args) -> Tuple[Dict, Dict]:
+    if args.synthetic:
+        return make_synthetic_handlers(args.handlers)
+    from backend.domains.licensing_service.infra.handlers import (
+        COMMANDS_HANDLERS_FOR_INJECTION,
+        EVENTS_HANDLERS_FOR_INJECTION,
+    )
+
+    return EVENTS_HANDLERS_FOR_INJECTION, COMMANDS_HANDLERS_FOR_INJECTION
+
+
+def run_before(args, events_handlers: Dict, commands_handlers: Dict) -> float:
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        bootstrap = Bootstrap(
+            domain_event_bus=ContextEventBus(),
+            infra_event_bus=ContextEventBus(),
+            events_handlers_for_injection=events_handlers,
+            commands_handlers_for_injection=commands_handlers,
+        )
+        bootstrap.get_messagebus()
+    return time.perf_counter() - start
+
+
+def run_after(args, events_handlers: Dict, commands_handlers: Dict) -> float:
+    bootstrap = Bootstrap(
+        domain_event_bus=ContextEventBus(),
+        infra_event_bus=ContextEventBus(),
+        events_handlers_for_injection=events_handlers,
+        commands_handlers_for_injection=commands_handlers,
+    )
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        bootstrap.get_messagebus()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--synthetic", action="store_true")
+    parser.add_argument("--handlers", type=int, default=30)
+    args = parser.parse_args()
+
+    events_handlers, commands_handlers = load_handlers(args)
+    results = {}
+    for name, runner in (("before", run_before), ("after", run_after)):
+        elapsed = runner(args, events_handlers, commands_handlers)
+        results[name] = elapsed / args.requests * 1_000_000
+        print(
+            f"{name:>6}: {args.requests} requests in {elapsed:.3f}s, "
+            f"{results[name]:.1f} us/request"
+        )
+    print(f"speedup: x{results['before'] / results['after']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
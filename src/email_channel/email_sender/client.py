@@ -1,8 +1,8 @@
-import smtplib
 from loguru import logger
 from email.mime.text import MIMEText
 
 from settings import main_config
+from .pool import SMTPConnectionPool
 
 
 
@@ -44,6 +44,17 @@ class MailMessage:
         self.sender_email = main_config.MASTER_EMAIL
         self.password = main_config.SMTP_SERVER_PASSWORD
         self.timeout = main_config.SMTP_TIMEOUT
+        self.pool = SMTPConnectionPool(
+            host=self.smtp_server,
+            port=self.port,
+            user=self.sender_email,
+            password=self.password,
+            timeout=self.timeout,
+            starttls=main_config.SMTP_STARTTLS,
+            size=main_config.SMTP_POOL_SIZE,
+            max_idle=main_config.SMTP_POOL_MAX_IDLE,
+            max_messages=main_config.SMTP_MAX_MESSAGES_PER_CONNECTION,
+        )
 
     def create_message(
         self, email: str, subject: str, message: str
@@ -62,35 +73,29 @@ class MailMessage:
 
     def send(
         self, email: str, subject: str, message: str
-    ) -> bool:
+    ) -> None:
         """
-        Sends a message with object parameters
+        Sends a message with object parameters to the recipient
+        and a copy to the sender by one SMTP transaction,
+        using a session of the connection pool.
+        Errors of sending are raised, so the event is sent again
         """
         self.logger.info(f"Try to send to: {email}")
+        recipients = list(dict.fromkeys(
+            address for address in (email, self.sender_email) if address
+        ))
         message = self.create_message(
-            email=email, subject=subject, message=message
+            email=email or self.sender_email, subject=subject, message=message
         )
         try:
-            with smtplib.SMTP(
-                self.smtp_server, self.port, timeout=self.timeout
-            ) as server:
-                server.ehlo_or_helo_if_needed()
-                # server.ehlo()
-                server.starttls()
-                server.login(self.sender_email, self.password)
-                self.logger.info(
-                    f"connected to {self.smtp_server}: {self.port}"
-                )
-                self.logger.info(
-                    f"for {self.sender_email}: {self.password}"
-                )
-                server.sendmail(
-                    self.sender_email,
-                    [email, self.sender_email],
-                    message
-                )
+            self.pool.sendmail(self.sender_email, recipients, message)
         except Exception as e:
             self.logger.error(f"error: {e}")
-            return False
+            raise
         self.logger.info(f"Succesful sent: {email}")
-        return True
+
+    def close(self) -> None:
+        """
+        Closes kept SMTP sessions
+        """
+        self.pool.close()
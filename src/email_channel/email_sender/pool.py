@@ -0,0 +1,137 @@
+import smtplib
+import threading
+import time
+from typing import List, Optional
+
+from loguru import logger
+
+# Errors of a session, which was closed by the server while idle,
+# the message is sent again by a new session:
+STALE_SESSION_ERRORS = (smtplib.SMTPServerDisconnected, OSError)
+# Server closes the session with this code, e.g. on idle timeout:
+SERVICE_CLOSING_CODE = 421
+
+
+class SMTPSession:
+
+    def __init__(self, smtp: smtplib.SMTP) -> None:
+        self.smtp = smtp
+        self.messages = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPConnectionPool:
+    """
+    Keeps authenticated SMTP sessions open between messages,
+    so EHLO, STARTTLS and LOGIN are paid once per session
+    instead of once per message.
+
+    Each thread takes its own session for a message, so sessions are
+    opened on demand, but not more than `size` idle ones are kept.
+    A session is closed after `max_messages` messages or `max_idle`
+    seconds without messages. If a kept session was closed by
+    the server, the message is sent again by a new one.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        timeout: float,
+        starttls: bool = True,
+        size: int = 4,
+        max_idle: float = 60.0,
+        max_messages: int = 100,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.timeout = timeout
+        self.starttls = starttls
+        self.size = size
+        self.max_idle = max_idle
+        self.max_messages = max_messages
+        self._idle: List[SMTPSession] = []
+        self._lock = threading.Lock()
+
+    def sendmail(self, from_addr: str, to_addrs: List[str], message: str) -> None:
+        session = self._take()
+        while True:
+            try:
+                session.smtp.sendmail(from_addr, to_addrs, message)
+                break
+            except Exception as err:
+                self._close(session)
+                if session.messages == 0 or not self._is_stale(err):
+                    raise
+                logger.info(f"SMTP session was closed by server: {err}")
+                session = self._connect()
+        self._give_back(session)
+
+    def close(self) -> None:
+        with self._lock:
+            sessions, self._idle = self._idle, []
+        for session in sessions:
+            self._quit(session)
+
+    @staticmethod
+    def _is_stale(err: Exception) -> bool:
+        if isinstance(err, smtplib.SMTPResponseException):
+            return err.smtp_code == SERVICE_CLOSING_CODE
+        return isinstance(err, STALE_SESSION_ERRORS)
+
+    def _connect(self) -> SMTPSession:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            smtp.ehlo_or_helo_if_needed()
+            if self.starttls:
+                smtp.starttls()
+                smtp.ehlo()
+            if self.password:
+                smtp.login(self.user, self.password)
+        except Exception:
+            smtp.close()
+            raise
+        logger.info(f"connected to {self.host}: {self.port}")
+        return SMTPSession(smtp)
+
+    def _take(self) -> SMTPSession:
+        expired: List[SMTPSession] = []
+        session: Optional[SMTPSession] = None
+        with self._lock:
+            while self._idle:
+                candidate = self._idle.pop()
+                if time.monotonic() - candidate.last_used < self.max_idle:
+                    session = candidate
+                    break
+                expired.append(candidate)
+        for candidate in expired:
+            self._quit(candidate)
+        return session or self._connect()
+
+    def _give_back(self, session: SMTPSession) -> None:
+        session.messages += 1
+        session.last_used = time.monotonic()
+        if session.messages < self.max_messages:
+            with self._lock:
+                if len(self._idle) < self.size:
+                    self._idle.append(session)
+                    return
+        self._quit(session)
+
+    @staticmethod
+    def _quit(session: SMTPSession) -> None:
+        try:
+            session.smtp.quit()
+        except Exception:
+            session.smtp.close()
+
+    @staticmethod
+    def _close(session: SMTPSession) -> None:
+        try:
+            session.smtp.close()
+        except Exception:
+            pass
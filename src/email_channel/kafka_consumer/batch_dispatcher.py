@@ -0,0 +1,149 @@
+import queue
+import threading
+import zlib
+from typing import Any, Callable, Dict, List
+
+from kafka.structs import OffsetAndMetadata, TopicPartition
+from loguru import logger
+
+# kafka-python 2.1 added leader epoch to committed offsets:
+_OFFSET_EXTRA_FIELDS = (-1,) if "leader_epoch" in OffsetAndMetadata._fields else ()
+
+
+class BrokenMessage(Exception):
+    """
+    Message, which can never be handled, e.g. not parsed or rejected
+    by the recipient's server. It is skipped instead of retried.
+    """
+
+
+class InFlightBatch:
+    """
+    Polled batch, which is handled by workers.
+    Its offsets can be committed when all its messages are handled.
+    """
+
+    def __init__(self, batch: Dict[TopicPartition, List[Any]]) -> None:
+        self.messages = [message for messages in batch.values() for message in messages]
+        # Offset to commit is the offset of the next message to consume:
+        self.offsets = {
+            partition: OffsetAndMetadata(
+                messages[-1].offset + 1, "", *_OFFSET_EXTRA_FIELDS
+            )
+            for partition, messages in batch.items()
+        }
+        self._remaining = len(self.messages)
+        self._lock = threading.Lock()
+        self._delivered = threading.Event()
+        if not self._remaining:
+            self._delivered.set()
+
+    def message_done(self) -> None:
+        with self._lock:
+            self._remaining -= 1
+            if not self._remaining:
+                self._delivered.set()
+
+    def is_delivered(self) -> bool:
+        return self._delivered.is_set()
+
+
+class BatchDispatcher:
+    """
+    Bounded pool of worker threads, which handle polled batches.
+
+    Messages with the same key (id of aggregate) are handled by the same
+    worker one after another, so events of a subdivision keep their order.
+    Messages with other keys are handled in parallel, so one slow
+    recipient delays only the workers, which send to it.
+
+    A failed message is retried by its worker with growing delay
+    (`retry_delay` doubled up to `max_retry_delay`), so neither it nor
+    later messages of its key are counted as done, and offsets are not
+    committed past it. After `max_attempts` attempts it is logged with
+    its value and counted as done, so one message can't stop its worker
+    and, by the paused partitions, the whole consumer for good.
+    BrokenMessage is skipped without retries.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        handle: Callable[[bytes], None],
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 60.0,
+        max_attempts: int = 10,
+    ) -> None:
+        self._handle = handle
+        self._retry_delay = retry_delay
+        self._max_retry_delay = max_retry_delay
+        self._max_attempts = max_attempts
+        self._stopping = threading.Event()
+        self._queues: List[queue.Queue] = [queue.Queue() for _ in range(workers)]
+        self._threads = [
+            threading.Thread(target=self._work, args=(worker_queue,), daemon=True)
+            for worker_queue in self._queues
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def dispatch(self, batch: Dict[TopicPartition, List[Any]]) -> InFlightBatch:
+        in_flight = InFlightBatch(batch)
+        for message in in_flight.messages:
+            # Messages without key have no order to keep:
+            key = message.offset if message.key is None else zlib.crc32(message.key)
+            worker = key % len(self._queues)
+            self._queues[worker].put((message, in_flight))
+        return in_flight
+
+    def shutdown(self) -> None:
+        """
+        Waits till dispatched messages are handled.
+        Retries are given up: failed messages stay not done,
+        so they are handled again after restart.
+        """
+        self._stopping.set()
+        for worker_queue in self._queues:
+            worker_queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def _work(self, worker_queue: queue.Queue) -> None:
+        while True:
+            item = worker_queue.get()
+            if item is None:
+                return
+            message, in_flight = item
+            logger.info(f"offset: {message.offset}, message: {message.value}")
+            if not self._handle_with_retries(message):
+                return
+            in_flight.message_done()
+
+    def _handle_with_retries(self, message: Any) -> bool:
+        """
+        Returns False, if retries were given up on shutdown.
+        """
+        delay = self._retry_delay
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                self._handle(message.value)
+                return True
+            except BrokenMessage as err:
+                # Broken event must not stop the partition:
+                logger.error(f"Error: skipped offset {message.offset}: {err}")
+                return True
+            except Exception as err:
+                if attempts >= self._max_attempts:
+                    logger.error(
+                        f"Error: dropped offset {message.offset} after "
+                        f"{attempts} attempts: {err}, message: {message.value}"
+                    )
+                    return True
+                logger.error(
+                    f"Error: offset {message.offset}, retry in {delay}s: {err}"
+                )
+            if self._stopping.wait(delay):
+                return False
+            delay = min(delay * 2, self._max_retry_delay)
@@ -1,6 +1,8 @@
+import smtplib
 import sys
 import six
 import time
+from collections import deque
 from loguru import logger
 
 if sys.version_info >= (3, 12, 0):
@@ -18,6 +20,7 @@ from protobuf_types.LicenseEvents_pb2 import LicenseEvent
 from protobuf_types.StatisticRowEvents_pb2 import StatisticRowEvent
 
 from email_sender.client import MailMessage
+from kafka_consumer.batch_dispatcher import BatchDispatcher, BrokenMessage
 from settings import main_config
 from template_renderer import TemplateRenderer
 
@@ -31,6 +34,16 @@ protobuf_types = {
 }
 
 
+def is_rejected(err: smtplib.SMTPException) -> bool:
+    """
+    5xx replies of SMTP server are permanent, with 4xx ones
+    the email is sent again
+    """
+    if isinstance(err, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in err.recipients.values())
+    return isinstance(err, smtplib.SMTPResponseException) and err.smtp_code >= 500
+
+
 class EmailKafkaConsumer:
 
     def __init__(self):
@@ -38,6 +51,7 @@ class EmailKafkaConsumer:
         self.__email_client = MailMessage()
         self.__servers = main_config.KAFKA_SERVERS
         self.__topic_name = main_config.KAFKA_TOPICS
+        self.__group_id = main_config.KAFKA_GROUP_ID
         self.__consumer = None
 
     def parse_protobuf_event(self, event: bytes) -> dict:
@@ -57,7 +71,7 @@ class EmailKafkaConsumer:
             if "action" not in event_obj_dict:
                 event_obj_dict.update({"action": "CREATED"})
         except Exception as err:
-            self.logger.error(f"Error: {err}")
+            raise BrokenMessage(f"not parsed event: {err}") from err
         return event_obj_dict
 
     def prepare_message(
@@ -87,15 +101,13 @@ class EmailKafkaConsumer:
         text_message: str,
         email: str = ""
     ) -> None:
+        """
+        Sends one email to the recipient of the event, if any,
+        and to MASTER_EMAIL
+        """
         self.logger.info(f"Start sending {subject} {text_message}")
-        if email:
-            self.__email_client.send(
-                email=email,
-                subject=subject,
-                message=text_message
-            )
         self.__email_client.send(
-            email=main_config.MASTER_EMAIL,
+            email=email,
             subject=subject,
             message=text_message
         )
@@ -104,24 +116,71 @@ class EmailKafkaConsumer:
 
     def on_kafka_event(self, event: bytes):
         event_obj = self.parse_protobuf_event(event)
-        subject, message, email = self.prepare_message(event_obj)
-        self.send_email(
-            subject=subject, text_message=message, email=email
-        )
+        try:
+            subject, message, email = self.prepare_message(event_obj)
+        except Exception as err:
+            raise BrokenMessage(f"not rendered event: {err}") from err
+        try:
+            self.send_email(
+                subject=subject, text_message=message, email=email
+            )
+        except smtplib.SMTPException as err:
+            if is_rejected(err):
+                raise BrokenMessage(f"rejected by SMTP server: {err}") from err
+            raise
 
     def subscribe(self):
+        """
+        Polls batches of events and dispatches them to the worker pool,
+        not waiting for them, till KAFKA_MAX_IN_FLIGHT_BATCHES batches
+        are in flight. Then partitions are paused: polling goes on,
+        so the consumer stays in the group, but takes no new events.
+        Offsets of a batch are committed when it and all batches
+        before it are handled, so a restart neither loses events
+        nor replays the handled ones. A failed event is retried,
+        so no offsets are committed past it till it is sent
+        or dropped after NOTIFICATION_MAX_ATTEMPTS attempts.
+        """
         self.logger.info(f"{self.__consumer.subscription()}")
+        dispatcher = BatchDispatcher(
+            workers=main_config.NOTIFICATION_WORKERS,
+            handle=self.on_kafka_event,
+            retry_delay=main_config.NOTIFICATION_RETRY_DELAY,
+            max_retry_delay=main_config.NOTIFICATION_MAX_RETRY_DELAY,
+            max_attempts=main_config.NOTIFICATION_MAX_ATTEMPTS,
+        )
+        in_flight = deque()
         try:
             while True:
-                for message in self.__consumer:
-                    if message is not None:
-                        self.logger.info(
-                            f"offset: {message.offset}, "
-                            f"message: {message.value}"
-                        )
-                        self.on_kafka_event(message.value)
+                if len(in_flight) < main_config.KAFKA_MAX_IN_FLIGHT_BATCHES:
+                    self.__consumer.resume(*self.__consumer.paused())
+                else:
+                    self.__consumer.pause(*self.__consumer.assignment())
+                batch = self.__consumer.poll(
+                    timeout_ms=main_config.KAFKA_POLL_TIMEOUT_MS,
+                    max_records=main_config.KAFKA_MAX_POLL_RECORDS,
+                )
+                if batch:
+                    in_flight.append(dispatcher.dispatch(batch))
+                self.commit_delivered(in_flight)
         finally:
+            dispatcher.shutdown()
+            self.commit_delivered(in_flight)
             self.__consumer.close()
+            self.__email_client.close()
+
+    def commit_delivered(self, in_flight: deque) -> None:
+        offsets = {}
+        while in_flight and in_flight[0].is_delivered():
+            offsets.update(in_flight.popleft().offsets)
+        if not offsets:
+            return
+        try:
+            self.__consumer.commit(offsets=offsets)
+        except KafkaError as err:
+            # Partitions were given to another replica, which handles
+            # not committed events again:
+            self.logger.error(f"Error: commit of {offsets}: {err}")
 
     def get_kafka_consumer(self):
         self.logger.info("start get_kafka_consumer")
@@ -129,7 +188,9 @@ class EmailKafkaConsumer:
         try:
             self.__consumer = KafkaConsumer(
                 self.__topic_name,
-                auto_offset_reset="earliest",
+                group_id=self.__group_id,
+                enable_auto_commit=False,
+                auto_offset_reset=main_config.KAFKA_AUTO_OFFSET_RESET,
                 bootstrap_servers=self.__servers
             )
             # consumer_timeout_ms=10
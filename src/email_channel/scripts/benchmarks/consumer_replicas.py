@@ -0,0 +1,215 @@
+"""
+Benchmark of notification consumers, 1 vs N replicas:
+"before" - consumers without group (old EmailKafkaConsumer and
+TelegramKafkaConsumer), every replica reads every partition from the start,
+"after" - replicas of one consumer group share partitions and commit
+offsets after each handled event.
+
+By default it runs against a local stand-in broker, which emulates
+partitions, group assignment and round-trips of fetch and commit requests,
+sending of a notification is emulated by --send-ms.
+Pass --bootstrap-servers to run "after" against a real broker
+(needs kafka-python and a topic with at least --partitions partitions).
+
+Usage:
+    python scripts/benchmarks/consumer_replicas.py --events 600 --replicas 4
+    python scripts/benchmarks/consumer_replicas.py --bootstrap-servers localhost:9091
+"""
+import argparse
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from uuid import uuid4
+
+
+class StandInBroker:
+    """
+    Topic with partitions and committed offsets of consumer groups.
+    Every fetch and commit costs one round-trip.
+    """
+
+    def __init__(self, partitions: int, rtt_ms: float) -> None:
+        self.rtt = rtt_ms / 1000
+        self.partitions: List[List[Tuple[bytes, bytes]]] = [
+            [] for _ in range(partitions)
+        ]
+        self.committed: Dict[Tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+
+    def produce(self, key: bytes, value: bytes) -> None:
+        partition = zlib.crc32(key) % len(self.partitions)
+        self.partitions[partition].append((key, value))
+
+    def fetch(self, partition: int, offset: int) -> Optional[Tuple[bytes, bytes]]:
+        time.sleep(self.rtt)
+        messages = self.partitions[partition]
+        return messages[offset] if offset < len(messages) else None
+
+    def commit(self, group_id: str, partition: int, offset: int) -> None:
+        time.sleep(self.rtt)
+        with self._lock:
+            self.committed[(group_id, partition)] = offset
+
+    def committed_offset(self, group_id: Optional[str], partition: int) -> int:
+        with self._lock:
+            return self.committed.get((group_id, partition), 0)
+
+
+def assign_partitions(partitions: int, replicas: int, replica: int) -> List[int]:
+    """
+    Range assignment of the group coordinator.
+    """
+    return [number for number in range(partitions) if number % replicas == replica]
+
+
+def consume(
+    broker: StandInBroker,
+    partitions: List[int],
+    group_id: Optional[str],
+    send: float,
+    handled: List[bytes],
+    lock: threading.Lock,
+) -> None:
+    offsets = {
+        partition: broker.committed_offset(group_id, partition)
+        for partition in partitions
+    }
+    active = list(partitions)
+    while active:
+        for partition in list(active):
+            message = broker.fetch(partition, offsets[partition])
+            if message is None:
+                active.remove(partition)
+                continue
+            # Sending of the notification:
+            time.sleep(send)
+            with lock:
+                handled.append(message[1])
+            offsets[partition] += 1
+            if group_id is not None:
+                broker.commit(group_id, partition, offsets[partition])
+
+
+def run_stand_in(args, replicas: int, group_id: Optional[str]) -> Tuple[float, Counter]:
+    broker = StandInBroker(args.partitions, args.rtt_ms)
+    keys = [uuid4().bytes for _ in range(args.aggregates)]
+    for number in range(args.events):
+        broker.produce(keys[number % len(keys)], str(number).encode())
+
+    handled: List[bytes] = []
+    lock = threading.Lock()
+    threads = []
+    for replica in range(replicas):
+        if group_id is None:
+            partitions = list(range(args.partitions))
+        else:
+            partitions = assign_partitions(args.partitions, replicas, replica)
+        threads.append(
+            threading.Thread(
+                target=consume,
+                args=(broker, partitions, group_id, args.send_ms / 1000, handled, lock),
+            )
+        )
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    # Restart of the replicas must not handle anything again:
+    if group_id is not None:
+        replayed: List[bytes] = []
+        consume(
+            broker, list(range(args.partitions)), group_id, 0, replayed, lock
+        )
+        assert not replayed, f"{len(replayed)} events replayed after restart"
+    return elapsed, Counter(handled)
+
+
+def run_kafka(args, replicas: int, group_id: str) -> Tuple[float, Counter]:
+    from kafka import KafkaConsumer, KafkaProducer
+
+    servers = args.bootstrap_servers.split(",")
+    run_id = uuid4().hex
+    producer = KafkaProducer(bootstrap_servers=servers)
+    keys = [uuid4().bytes for _ in range(args.aggregates)]
+    for number in range(args.events):
+        producer.send(
+            args.topic,
+            key=keys[number % len(keys)],
+            value=f"{run_id}:{number}".encode(),
+        )
+    producer.flush()
+    producer.close()
+
+    handled: List[bytes] = []
+    lock = threading.Lock()
+    consumers = [
+        KafkaConsumer(
+            args.topic,
+            bootstrap_servers=servers,
+            group_id=f"{group_id}-{run_id}",
+            enable_auto_commit=False,
+            auto_offset_reset="earliest",
+            consumer_timeout_ms=args.idle_ms,
+        )
+        for _ in range(replicas)
+    ]
+
+    def run(consumer) -> None:
+        for message in consumer:
+            if message.value.startswith(run_id.encode()):
+                time.sleep(args.send_ms / 1000)
+                with lock:
+                    handled.append(message.value)
+            consumer.commit()
+        consumer.close()
+
+    threads = [threading.Thread(target=run, args=(consumer,)) for consumer in consumers]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Consumers stop after being idle, that time is not spent on events:
+    elapsed = time.perf_counter() - start - args.idle_ms / 1000
+    return elapsed, Counter(handled)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=600)
+    parser.add_argument("--replicas", type=int, default=4)
+    parser.add_argument("--partitions", type=int, default=6)
+    parser.add_argument("--aggregates", type=int, default=100)
+    parser.add_argument("--send-ms", type=float, default=5.0)
+    parser.add_argument("--rtt-ms", type=float, default=0.5)
+    parser.add_argument("--topic", default="main-topic")
+    parser.add_argument("--idle-ms", type=int, default=5000)
+    parser.add_argument("--bootstrap-servers", default=None)
+    args = parser.parse_args()
+
+    cases = [("after", 1, "notifications"), ("after", args.replicas, "notifications")]
+    runner = run_kafka
+    if args.bootstrap_servers is None:
+        runner = run_stand_in
+        cases = [("before", 1, None), ("before", args.replicas, None)] + cases
+    results = {}
+    for name, replicas, group_id in cases:
+        elapsed, handled = runner(args, replicas, group_id)
+        duplicates = sum(handled.values()) - len(handled)
+        results[(name, replicas)] = len(handled) / elapsed
+        print(
+            f"{name:>6}, {replicas} replicas: {len(handled)} events "
+            f"in {elapsed:.3f}s, {results[(name, replicas)]:.0f} events/sec, "
+            f"duplicate notifications: {duplicates}"
+        )
+    scale = results[("after", args.replicas)] / results[("after", 1)]
+    print(f"scale-out with {args.replicas} replicas: x{scale:.1f}")
+
+
+if __name__ == "__main__":
+    main()
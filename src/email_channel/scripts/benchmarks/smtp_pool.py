@@ -0,0 +1,161 @@
+"""
+Benchmark of sending notification emails:
+"before" - new SMTP connection with EHLO and LOGIN for every email,
+two emails per event, to the recipient and to MASTER_EMAIL (old MailMessage),
+"after" - MailMessage with pooled sessions, one SMTP transaction per event
+with all recipients.
+
+It runs against a local aiosmtpd stand-in server (needs aiosmtpd),
+which emulates the cost of the connection handshake (--handshake-ms:
+EHLO, STARTTLS, LOGIN) and of round-trips of RCPT and DATA (--rtt-ms).
+STARTTLS itself is off, as the stand-in has no certificate.
+
+Usage:
+    python scripts/benchmarks/smtp_pool.py --events 500 --workers 8
+"""
+import argparse
+import asyncio
+import logging
+import os
+import smtplib
+import socket
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+
+MASTER_EMAIL = "master@example.com"
+RECIPIENT_EMAIL = "tenant@example.com"
+PASSWORD = "password"
+
+
+class StandInHandler:
+    """
+    Counts connections, transactions and delivered copies of messages,
+    emulates latency of the real server.
+    """
+
+    def __init__(self, handshake_ms: float, rtt_ms: float) -> None:
+        self.handshake = handshake_ms / 1000
+        self.rtt = rtt_ms / 1000
+        self.connections = 0
+        self.transactions = 0
+        self.delivered = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.connections += 1
+        await asyncio.sleep(self.handshake)
+        session.host_name = hostname
+        return responses
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        await asyncio.sleep(self.rtt)
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        await asyncio.sleep(self.rtt)
+        self.transactions += 1
+        self.delivered += len(envelope.rcpt_tos)
+        return "250 Message accepted for delivery"
+
+
+def authenticate(server, session, envelope, mechanism, auth_data):
+    return AuthResult(success=auth_data.password.decode() == PASSWORD)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def send_before(port: int, message: str) -> None:
+    for email in (RECIPIENT_EMAIL, MASTER_EMAIL):
+        with smtplib.SMTP("127.0.0.1", port, timeout=10) as server:
+            server.ehlo_or_helo_if_needed()
+            server.login(MASTER_EMAIL, PASSWORD)
+            server.sendmail(MASTER_EMAIL, [email, MASTER_EMAIL], message)
+
+
+def run(args, name: str, port: int, handler: StandInHandler) -> float:
+    from email_sender.client import MailMessage
+
+    mail = MailMessage()
+    subject, body = "SubdivisionEvent-UPDATED", "<p>key: value</p>\n" * 100
+    message = mail.create_message(email=RECIPIENT_EMAIL, subject=subject, message=body)
+    if name == "before":
+
+        def send_event(_):
+            send_before(port, message)
+
+    else:
+
+        def send_event(_):
+            mail.send(email=RECIPIENT_EMAIL, subject=subject, message=body)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        list(executor.map(send_event, range(args.events)))
+    elapsed = time.perf_counter() - start
+    mail.close()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--handshake-ms", type=float, default=20.0)
+    parser.add_argument("--rtt-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    port = free_port()
+    os.environ.update(
+        KAFKA_SERVERS="localhost:9091",
+        KAFKA_TOPICS="main-topic",
+        SMTP_SERVER="127.0.0.1",
+        SMTP_SERVER_PORT=str(port),
+        MASTER_EMAIL=MASTER_EMAIL,
+        SMTP_SERVER_PASSWORD=PASSWORD,
+        SMTP_TIMEOUT="10",
+        SMTP_STARTTLS="false",
+        SMTP_POOL_SIZE=str(args.workers),
+    )
+    # Modules of the service are imported from its root:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from loguru import logger
+
+    logger.remove()
+    # aiosmtpd warns about its own deprecated API on every LOGIN:
+    logging.getLogger("mail.log").setLevel(logging.ERROR)
+
+    results = {}
+    for name in ("before", "after"):
+        handler = StandInHandler(args.handshake_ms, args.rtt_ms)
+        controller = Controller(
+            handler,
+            hostname="127.0.0.1",
+            port=port,
+            authenticator=authenticate,
+            auth_require_tls=False,
+        )
+        controller.start()
+        try:
+            elapsed = run(args, name, port, handler)
+        finally:
+            controller.stop()
+        results[name] = args.events / elapsed
+        print(
+            f"{name:>6}: {args.events} events in {elapsed:.3f}s, "
+            f"{results[name]:.0f} events/sec, connections: {handler.connections}, "
+            f"transactions: {handler.transactions}, delivered: {handler.delivered}"
+        )
+    print(f"speedup: x{results['after'] / results['before']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
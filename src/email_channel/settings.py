@@ -5,11 +5,37 @@ class MainConfig(BaseSettings):
     KAFKA_TEST: str = "kafka-test"
     KAFKA_SERVERS: str
     KAFKA_TOPICS: str
+    # Replicas with the same group share partitions of the topics,
+    # each event is handled by one of them:
+    KAFKA_GROUP_ID: str = "email-channel"
+    # Where a group without committed offsets starts:
+    # "latest" - new events only, "earliest" - all events in the topics:
+    KAFKA_AUTO_OFFSET_RESET: str = "latest"
+    # Events are polled by batches of at most this size:
+    KAFKA_MAX_POLL_RECORDS: int = 100
+    KAFKA_POLL_TIMEOUT_MS: int = 1000
+    # Polled batches, which are handled, but not committed yet, at most:
+    KAFKA_MAX_IN_FLIGHT_BATCHES: int = 4
+    # Threads, which send notifications in parallel:
+    NOTIFICATION_WORKERS: int = 8
+    # Seconds before the first retry of a failed notification,
+    # doubled after every failure up to the max:
+    NOTIFICATION_RETRY_DELAY: float = 1.0
+    NOTIFICATION_MAX_RETRY_DELAY: float = 60.0
+    # Attempts of a notification, after which it is logged and dropped:
+    NOTIFICATION_MAX_ATTEMPTS: int = 10
     SMTP_SERVER: str
     SMTP_SERVER_PORT: int
     MASTER_EMAIL: str
     SMTP_SERVER_PASSWORD: str
     SMTP_TIMEOUT: int
+    SMTP_STARTTLS: bool = True
+    # Authenticated SMTP sessions are kept open between messages:
+    # idle sessions kept at most, closed after seconds without messages
+    # or after number of messages:
+    SMTP_POOL_SIZE: int = 8
+    SMTP_POOL_MAX_IDLE: float = 60.0
+    SMTP_MAX_MESSAGES_PER_CONNECTION: int = 100
 
 
 main_config: MainConfig = MainConfig()
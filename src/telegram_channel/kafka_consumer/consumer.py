@@ -1,6 +1,7 @@
 import sys
 import six
 import time
+from collections import deque
 from loguru import logger
 
 if sys.version_info >= (3, 12, 0):
@@ -9,7 +10,9 @@ if sys.version_info >= (3, 12, 0):
 from kafka import KafkaConsumer
 from kafka.errors import KafkaError
 from google.protobuf.json_format import MessageToDict
+from telebot.apihelper import ApiTelegramException
 
+from kafka_consumer.batch_dispatcher import BatchDispatcher, BrokenMessage
 from telegram.telegram_bot import TelegramBot
 
 from protobuf_types.UserEvents_pb2 import UserEvent
@@ -37,6 +40,7 @@ class TelegramKafkaConsumer:
         self.__tg_bot = tg_bot
         self.__servers = main_config.KAFKA_SERVERS
         self.__topic_name = main_config.KAFKA_TOPICS
+        self.__group_id = main_config.KAFKA_GROUP_ID
         self.__consumer = None
 
     def parse_protobuf_event(self, event: bytes) -> dict:
@@ -59,7 +63,7 @@ class TelegramKafkaConsumer:
                 event_obj_dict.update({"action": "CREATED"})
 
         except Exception as err:
-            self.logger.error(f"Error: {err}")
+            raise BrokenMessage(f"not parsed event: {err}") from err
         return event_obj_dict
 
     def render_text(self, event_obj: dict) -> str:
@@ -68,30 +72,80 @@ class TelegramKafkaConsumer:
 
     def on_kafka_event(self, event: bytes):
         event_obj = self.parse_protobuf_event(event)
-        text = self.render_text(event_obj)
-        self.__tg_bot.send_message(text)
+        try:
+            text = self.render_text(event_obj)
+        except Exception as err:
+            raise BrokenMessage(f"not rendered event: {err}") from err
+        try:
+            self.__tg_bot.send_message(text)
+        except ApiTelegramException as err:
+            # Bad requests (too long message, wrong chat) are permanent,
+            # 429 Too Many Requests is sent again:
+            if 400 <= err.error_code < 500 and err.error_code != 429:
+                raise BrokenMessage(f"rejected by Bot API: {err}") from err
+            raise
 
     def subscribe(self):
+        """
+        Polls batches of events and dispatches them to the worker pool,
+        not waiting for them, till KAFKA_MAX_IN_FLIGHT_BATCHES batches
+        are in flight. Then partitions are paused: polling goes on,
+        so the consumer stays in the group, but takes no new events.
+        Offsets of a batch are committed when it and all batches
+        before it are handled, so a restart neither loses events
+        nor replays the handled ones. A failed event is retried,
+        so no offsets are committed past it till it is sent
+        or dropped after NOTIFICATION_MAX_ATTEMPTS attempts.
+        """
         self.logger.info(f"{self.__consumer.subscription()}")
+        dispatcher = BatchDispatcher(
+            workers=main_config.NOTIFICATION_WORKERS,
+            handle=self.on_kafka_event,
+            retry_delay=main_config.NOTIFICATION_RETRY_DELAY,
+            max_retry_delay=main_config.NOTIFICATION_MAX_RETRY_DELAY,
+            max_attempts=main_config.NOTIFICATION_MAX_ATTEMPTS,
+        )
+        in_flight = deque()
         try:
             while True:
-                for message in self.__consumer:
-                    if message is not None:
-                        self.logger.info(
-                            f"offset: {message.offset}, "
-                            f"message: {message.value}"
-                        )
-                        self.on_kafka_event(message.value)
+                if len(in_flight) < main_config.KAFKA_MAX_IN_FLIGHT_BATCHES:
+                    self.__consumer.resume(*self.__consumer.paused())
+                else:
+                    self.__consumer.pause(*self.__consumer.assignment())
+                batch = self.__consumer.poll(
+                    timeout_ms=main_config.KAFKA_POLL_TIMEOUT_MS,
+                    max_records=main_config.KAFKA_MAX_POLL_RECORDS,
+                )
+                if batch:
+                    in_flight.append(dispatcher.dispatch(batch))
+                self.commit_delivered(in_flight)
         finally:
+            dispatcher.shutdown()
+            self.commit_delivered(in_flight)
             self.__consumer.close()
 
+    def commit_delivered(self, in_flight: deque) -> None:
+        offsets = {}
+        while in_flight and in_flight[0].is_delivered():
+            offsets.update(in_flight.popleft().offsets)
+        if not offsets:
+            return
+        try:
+            self.__consumer.commit(offsets=offsets)
+        except KafkaError as err:
+            # Partitions were given to another replica, which handles
+            # not committed events again:
+            self.logger.error(f"Error: commit of {offsets}: {err}")
+
     def get_kafka_consumer(self):
         self.logger.info("start get_kafka_consumer")
         self.logger.info(f"servers: {self.__servers}")
         try:
             self.__consumer = KafkaConsumer(
                 self.__topic_name,
-                auto_offset_reset="earliest",
+                group_id=self.__group_id,
+                enable_auto_commit=False,
+                auto_offset_reset=main_config.KAFKA_AUTO_OFFSET_RESET,
                 bootstrap_servers=self.__servers
             )
             # consumer_timeout_ms=10
@@ -15,10 +15,13 @@ class TelegramBot:
         self.__bot = telebot.TeleBot(self.telegram_bot_token)
 
     def send_message(self, message: str):
+        """
+        Errors of sending are raised, so the event is sent again
+        """
         try:
             self.__bot.send_message(self.admin_chat_id, message)
         except Exception as e:
             logger.error(
                 f'Error {e} while sending notification {message}'
             )
-        return True
+            raise